@@ -1,13 +1,36 @@
 import csv
+import io
 import json
 import logging
 import os
+import threading
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Write buffer for the long-lived CSV handles (rows are flushed explicitly)
+WRITE_BUFFER_SIZE = 65536
+
+# Delay before client reference changes from events are written, so a burst
+# of joins/updates is saved with a single rewrite of clients_reference.csv
+CLIENTS_FLUSH_DELAY = 0.25
+
+
+@dataclass(slots=True)
+class ClientInfo:
+    """Last known identity of a client, as kept in TS3Bot.client_map."""
+    nickname: str = ''
+    uid: str = ''
+    ip: str = ''
+
+
+# Returned by ReferenceDataManager.get_client_info() for unknown clids - read-only
+_UNKNOWN_CLIENT = ClientInfo('Unknown')
+
 
 class ReferenceDataManager:
     """Manages reference data for clients and channels."""
@@ -22,8 +45,10 @@ class ReferenceDataManager:
         """
         self.clients_csv = clients_csv
         self.channels_csv = channels_csv
-        self.client_map: Dict[str, dict] = {}  # clid -> client info
+        self.client_map: Dict[str, ClientInfo] = {}  # clid -> client info
         self.channel_map: Dict[str, str] = {}  # cid -> channel name
+        self._clients_dirty = False  # client_map changed since the last save_clients()
+        self._save_lock = threading.Lock()  # Serializes rewrites of clients_csv across threads
         
         # Load existing data
         self._load_clients()
@@ -40,11 +65,11 @@ class ReferenceDataManager:
                 for row in reader:
                     clid = row.get('clid', '')
                     if clid:
-                        self.client_map[clid] = {
-                            'nickname': row.get('nickname', ''),
-                            'uid': row.get('uid', ''),
-                            'ip': row.get('ip', '')
-                        }
+                        self.client_map[clid] = ClientInfo(
+                            row.get('nickname', ''),
+                            row.get('uid', ''),
+                            row.get('ip', '')
+                        )
             logger.info(f"Loaded {len(self.client_map)} clients from reference data")
         except Exception as e:
             logger.error(f"Failed to load client reference data: {e}")
@@ -75,35 +100,71 @@ class ReferenceDataManager:
         try:
             # Update in-memory map
             for client in clients:
-                clid = client.get('clid', '')
-                if clid:
-                    self.client_map[clid] = {
-                        'nickname': client.get('client_nickname', ''),
-                        'uid': client.get('client_unique_identifier', ''),
-                        'ip': client.get('connection_client_ip', '')
-                    }
-            
-            # Write to CSV
-            file_exists = os.path.exists(self.clients_csv)
-            with open(self.clients_csv, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp', 'clid', 'nickname', 'uid', 'ip'])
-                
-                timestamp = datetime.now().isoformat()
-                for clid, info in self.client_map.items():
-                    writer.writerow([
-                        timestamp,
-                        clid,
-                        info.get('nickname', ''),
-                        info.get('uid', ''),
-                        info.get('ip', '')
-                    ])
+                self.add_client(client)
             
+            self.save_clients()
             logger.debug(f"Updated {len(clients)} clients in reference data")
             
         except Exception as e:
             logger.error(f"Failed to update client reference data: {e}")
     
+    def add_client(self, client: dict):
+        """
+        Update the in-memory entry for one client.
+        
+        The first change after a save schedules a flush CLIENTS_FLUSH_DELAY
+        seconds later, which also covers every change made in the meantime.
+        
+        Args:
+            client: Client dict from clientlist()
+        """
+        clid = client.get('clid', '')
+        if clid:
+            self.client_map[clid] = ClientInfo(
+                client.get('client_nickname', ''),
+                client.get('client_unique_identifier', ''),
+                client.get('connection_client_ip', '')
+            )
+            if not self._clients_dirty:
+                self._clients_dirty = True
+                timer = threading.Timer(CLIENTS_FLUSH_DELAY, self.flush)
+                timer.daemon = True
+                timer.start()
+    
+    def flush(self):
+        """Save the clients reference CSV if add_client() changed anything since the last save."""
+        if self._clients_dirty:
+            self.save_clients()
+    
+    def save_clients(self):
+        """Rewrite the clients reference CSV from the in-memory map.
+        
+        Called from the flush timer, the reference update and shutdown, so the
+        rewrite runs under a lock to keep writers from interleaving.
+        """
+        try:
+            with self._save_lock:
+                # Clear first: an add_client() racing with the write marks it dirty again
+                self._clients_dirty = False
+                # Snapshot - event handlers may add clients while the file is written
+                items = list(self.client_map.items())
+                with open(self.clients_csv, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['timestamp', 'clid', 'nickname', 'uid', 'ip'])
+                    
+                    timestamp = datetime.now().isoformat()
+                    for clid, info in items:
+                        writer.writerow([
+                            timestamp,
+                            clid,
+                            info.nickname,
+                            info.uid,
+                            info.ip
+                        ])
+            
+        except Exception as e:
+            logger.error(f"Failed to save client reference data: {e}")
+    
     def update_channels(self, channels: list):
         """
         Update channel reference data.
@@ -132,9 +193,9 @@ class ReferenceDataManager:
         except Exception as e:
             logger.error(f"Failed to update channel reference data: {e}")
     
-    def get_client_info(self, clid: str) -> dict:
-        """Get client info by clid."""
-        return self.client_map.get(clid, {'nickname': 'Unknown', 'uid': '', 'ip': ''})
+    def get_client_info(self, clid: str) -> ClientInfo:
+        """Get client info by clid (a shared read-only placeholder if unknown)."""
+        return self.client_map.get(clid, _UNKNOWN_CLIENT)
     
     def get_channel_name(self, cid: str) -> str:
         """Get channel name by cid."""
@@ -144,7 +205,7 @@ class ReferenceDataManager:
         if name:
             return name
         # Log missing channel for debugging
-        logger.debug(f"Channel {cid} not found in reference data")
+        logger.debug("Channel %s not found in reference data", cid)
         return f'Channel {cid}'
 
 
@@ -160,6 +221,9 @@ class UsersSeenTracker:
         """
         self.csv_path = csv_path
         self.seen_users = set()  # Set of (uid, nickname, ip) tuples
+        self._new_users = []  # Seen since the last flush(), not yet on disk
+        self.file_handle = None  # Opened on first append and kept open
+        self.csv_writer = None
         
         # Load existing users
         self._load_existing()
@@ -187,42 +251,108 @@ class UsersSeenTracker:
         Args:
             clients: List of client dicts
         """
+        for client in clients:
+            self.add_user(client)
+        self.flush()
+    
+    def add_user(self, client: dict):
+        """
+        Record one client; new users are buffered until flush().
+        
+        Args:
+            client: Client dict
+        """
+        uid = client.get('client_unique_identifier', '')
+        nickname = client.get('client_nickname', '')
+        ip = client.get('connection_client_ip', '')
+        
+        # Skip if any field is empty
+        if not uid or not nickname or not ip:
+            return
+        
+        user_tuple = (uid, nickname, ip)
+        if user_tuple not in self.seen_users:
+            self.seen_users.add(user_tuple)
+            self._new_users.append(user_tuple)
+    
+    def flush(self):
+        """Append users buffered by add_user() to the CSV."""
+        if not self._new_users:
+            return
         try:
-            new_users = []
+            writer = self._ensure_writer()
+            writer.writerows(self._new_users)
+            self.file_handle.flush()
             
-            for client in clients:
-                uid = client.get('client_unique_identifier', '')
-                nickname = client.get('client_nickname', '')
-                ip = client.get('connection_client_ip', '')
-                
-                # Skip if any field is empty
-                if not uid or not nickname or not ip:
-                    continue
-                
-                user_tuple = (uid, nickname, ip)
-                if user_tuple not in self.seen_users:
-                    self.seen_users.add(user_tuple)
-                    new_users.append(user_tuple)
-            
-            # Append new users to CSV
-            if new_users:
-                file_exists = os.path.exists(self.csv_path)
-                with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    
-                    if not file_exists:
-                        writer.writerow(['UID', 'NICKNAME', 'IP'])
-                    
-                    for uid, nickname, ip in new_users:
-                        writer.writerow([uid, nickname, ip])
-                
-                logger.info(f"Added {len(new_users)} new users to users_seen.csv")
+            logger.info(f"Added {len(self._new_users)} new users to users_seen.csv")
             
         except Exception as e:
             logger.error(f"Failed to add users to users_seen.csv: {e}")
+        finally:
+            self._new_users = []
+    
+    def _ensure_writer(self):
+        """Open users_seen.csv for appending once and reuse the handle."""
+        if self.csv_writer is None:
+            file_exists = os.path.exists(self.csv_path)
+            self.file_handle = open(self.csv_path, 'a', newline='', encoding='utf-8',
+                                    buffering=WRITE_BUFFER_SIZE)
+            self.csv_writer = csv.writer(self.file_handle)
+            
+            if not file_exists:
+                self.csv_writer.writerow(['UID', 'NICKNAME', 'IP'])
+        return self.csv_writer
+    
+    def close(self):
+        """Close the CSV file."""
+        if self.file_handle:
+            try:
+                self.file_handle.close()
+            except Exception as e:
+                logger.error(f"Error closing users_seen.csv: {e}")
+            finally:
+                self.file_handle = None
+                self.csv_writer = None
 
 
-class HumanReadableActivityLogger:
+class _BatchedRowWriter:
+    """Row writing shared by the activity CSV loggers.
+    
+    Subclasses open `file_handle` and call _init_row_writer() in __init__;
+    rows then go straight to the file or through an attached LogBatcher.
+    """
+    
+    def _init_row_writer(self):
+        """Set up the batcher slot and the reusable in-memory row buffer."""
+        self.batcher = None  # Optional LogBatcher; rows are written immediately when unset
+        self._row_buffer = io.StringIO()  # Reused to build each write in memory
+        self._row_writer = csv.writer(self._row_buffer)
+    
+    def _write_row(self, row: list):
+        """Write a row now, or hand it to the batcher if one is attached."""
+        if self.batcher:
+            self.batcher.append(self, row)
+        else:
+            self.write_rows([row])
+    
+    def write_rows(self, rows: list):
+        """
+        Write several formatted rows with a single write() and flush.
+        
+        Args:
+            rows: List of CSV rows (lists of fields)
+        """
+        if not self.file_handle:
+            return
+        # Format every row into the reusable buffer, then hand the file one string
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        self._row_writer.writerows(rows)
+        self.file_handle.write(self._row_buffer.getvalue())
+        self.file_handle.flush()
+
+
+class HumanReadableActivityLogger(_BatchedRowWriter):
     """Logs activities in human-readable format."""
     
     def __init__(self, csv_path: str, reference_manager: ReferenceDataManager):
@@ -238,10 +368,11 @@ class HumanReadableActivityLogger:
         self.file_handle = None
         self.csv_writer = None
         self.last_event_per_uid = {}  # Track last event type per UID to prevent duplicates
+        self._init_row_writer()
         
         try:
             file_exists = os.path.exists(csv_path)
-            self.file_handle = open(csv_path, 'a', newline='', encoding='utf-8')
+            self.file_handle = open(csv_path, 'a', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
             self.csv_writer = csv.writer(self.file_handle)
             
             if not file_exists:
@@ -256,7 +387,7 @@ class HumanReadableActivityLogger:
             self.file_handle = None
             self.csv_writer = None
     
-    def log_event(self, clid: str, event_type: str, event_data: dict):
+    def log_event(self, clid: str, event_type: str, event_data: dict, now: Optional[datetime] = None):
         """
         Log an event in human-readable format.
         
@@ -264,6 +395,7 @@ class HumanReadableActivityLogger:
             clid: Client ID
             event_type: Type of event
             event_data: Event data dict
+            now: Event time, shared with ActivityLogger (defaults to datetime.now())
         """
         if not self.csv_writer:
             return
@@ -271,28 +403,27 @@ class HumanReadableActivityLogger:
         try:
             # Get client info
             client_info = self.reference_manager.get_client_info(clid)
-            uid = client_info.get('uid', '')
-            nickname = client_info.get('nickname', 'Unknown')
+            uid = client_info.uid
+            nickname = client_info.nickname
             
             # Skip duplicate connects without disconnect in between
             if event_type == 'cliententerview':
                 last_event = self.last_event_per_uid.get(uid)
                 if last_event == 'cliententerview':
-                    logger.debug(f"Skipping duplicate connect for {uid} without disconnect")
+                    logger.debug("Skipping duplicate connect for %s without disconnect", uid)
                     return
             
             # Generate human-readable event description
             event_desc = self._format_event(event_type, nickname, event_data)
             
             # Log it
-            timestamp = datetime.now().strftime('%d/%m/%Y-%H:%M:%S')
-            self.csv_writer.writerow([uid, timestamp, event_desc])
-            self.file_handle.flush()
+            timestamp = (now or datetime.now()).strftime('%d/%m/%Y-%H:%M:%S')
+            self._write_row([uid, timestamp, event_desc])
             
             # Track this event type for duplicate prevention
             self.last_event_per_uid[uid] = event_type
             
-            logger.debug(f"Logged: {uid} - {event_desc}")
+            logger.debug("Logged: %s - %s", uid, event_desc)
             
         except Exception as e:
             logger.error(f"Failed to log event: {e}")
@@ -396,7 +527,7 @@ class HumanReadableActivityLogger:
             # Reopen file handle
             if self.file_handle:
                 self.file_handle.close()
-            self.file_handle = open(self.csv_path, 'a', newline='', encoding='utf-8')
+            self.file_handle = open(self.csv_path, 'a', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
             self.csv_writer = csv.writer(self.file_handle)
             
         except Exception as e:
@@ -416,7 +547,7 @@ class HumanReadableActivityLogger:
 
 
 # Keep old classes for backward compatibility
-class ActivityLogger:
+class ActivityLogger(_BatchedRowWriter):
     """Logs TeamSpeak user activities to CSV file."""
 
     def __init__(self, csv_path: str):
@@ -429,11 +560,12 @@ class ActivityLogger:
         self.csv_path = csv_path
         self.file_handle = None
         self.csv_writer = None
+        self._init_row_writer()
         
         try:
             # Create file if it doesn't exist and write header
             file_exists = os.path.exists(csv_path)
-            self.file_handle = open(csv_path, 'a', newline='', encoding='utf-8')
+            self.file_handle = open(csv_path, 'a', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
             self.csv_writer = csv.writer(self.file_handle)
             
             if not file_exists:
@@ -502,40 +634,39 @@ class ActivityLogger:
             # Reopen file handle
             if self.file_handle:
                 self.file_handle.close()
-            self.file_handle = open(self.csv_path, 'a', newline='', encoding='utf-8')
+            self.file_handle = open(self.csv_path, 'a', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
             self.csv_writer = csv.writer(self.file_handle)
             
         except Exception as e:
             logger.error(f"Failed to cleanup old log entries: {e}")
             # Continue operation even if cleanup fails
 
-    def log_event(self, event_type: str, clid: str, client_info: dict, details: dict):
+    def log_event(self, event_type: str, clid: str, client_info: ClientInfo, details: dict, now: Optional[datetime] = None):
         """
         Log a user activity event.
         
         Args:
             event_type: Type of event (e.g., 'cliententerview', 'clientmoved')
             clid: Client ID
-            client_info: Dict with 'nickname', 'uid', 'ip' keys
+            client_info: ClientInfo of the client
             details: Additional event details to store as JSON
+            now: Event time, shared with HumanReadableActivityLogger (defaults to datetime.now())
         """
         if not self.csv_writer:
             logger.warning("Activity logger not initialized, skipping log")
             return
         
         try:
-            timestamp = datetime.now().isoformat()
-            nickname = client_info.get('nickname', '')
-            uid = client_info.get('uid', '')
-            ip = client_info.get('ip', '')
+            timestamp = (now or datetime.now()).isoformat()
+            nickname = client_info.nickname
+            uid = client_info.uid
+            ip = client_info.ip
             details_json = json.dumps(details, ensure_ascii=False)
             
-            self.csv_writer.writerow([
-                timestamp, event_type, clid, nickname, uid, ip, details_json
-            ])
-            self.file_handle.flush()
+            row = [timestamp, event_type, clid, nickname, uid, ip, details_json]
+            self._write_row(row)
             
-            logger.debug(f"Logged event: {event_type} for clid={clid} ({nickname})")
+            logger.debug("Logged event: %s for clid=%s (%s)", event_type, clid, nickname)
             
         except Exception as e:
             logger.error(f"Failed to log event {event_type}: {e}")
@@ -553,6 +684,102 @@ class ActivityLogger:
                 self.csv_writer = None
 
 
+class LogBatcher:
+    """Buffers activity log rows and writes them in batches.
+    
+    Loggers format their rows at event time (so lookups and timestamps are
+    unchanged) and hand them to the batcher, which writes them from a
+    background thread every `flush_interval` seconds or once `max_pending`
+    rows are waiting - one write() per file per batch instead of one per row.
+    """
+    
+    def __init__(self, flush_interval: float = 1.0, max_pending: int = 128):
+        """
+        Initialize log batcher.
+        
+        Args:
+            flush_interval: Seconds between background flushes
+            max_pending: Pending row count that triggers an early flush
+        """
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = deque()  # (target logger, row)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+    
+    def start(self):
+        """Start the background flush thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True, name="log-batcher")
+        self._thread.start()
+    
+    def append(self, target, row: list):
+        """
+        Queue a formatted row for the given logger.
+        
+        Args:
+            target: Logger exposing write_rows(rows)
+            row: CSV row (list of fields)
+        """
+        self._pending.append((target, row))
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+    
+    def flush(self):
+        """Write all pending rows, grouped per target logger."""
+        with self._flush_lock:
+            self._flush_pending()
+    
+    def run_exclusive(self, fn):
+        """
+        Flush pending rows, then run fn while no batch can be written.
+        
+        Used for maintenance that swaps a logger's file handle (e.g.
+        cleanup_old_entries), which must not race a background flush.
+        
+        Args:
+            fn: Callable taking no arguments
+        """
+        with self._flush_lock:
+            self._flush_pending()
+            fn()
+    
+    def _flush_pending(self):
+        """Write pending rows. Caller must hold _flush_lock."""
+        if not self._pending:
+            return
+        batches = {}
+        while self._pending:
+            target, row = self._pending.popleft()
+            batches.setdefault(target, []).append(row)
+        
+        for target, rows in batches.items():
+            try:
+                target.write_rows(rows)
+            except Exception as e:
+                logger.error(f"Failed to write {len(rows)} batched log rows: {e}")
+    
+    def _flush_loop(self):
+        """Background loop flushing pending rows."""
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+    
+    def stop(self):
+        """Stop the flush thread and write anything still pending."""
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+
 class UIDNicknamesTracker:
     """Tracks all nicknames ever used by each UID."""
     
@@ -565,6 +792,9 @@ class UIDNicknamesTracker:
         """
         self.csv_path = csv_path
         self.uid_nicknames = {}  # uid -> set of nicknames
+        self._new_entries = []  # (uid, nickname) seen since the last flush()
+        self.file_handle = None  # Opened on first append and kept open
+        self.csv_writer = None
         
         # Load existing data
         self._load_existing()
@@ -597,41 +827,71 @@ class UIDNicknamesTracker:
         Args:
             clients: List of client dicts with uid and nickname
         """
+        for client in clients:
+            self.add_user(client)
+        self.flush()
+    
+    def add_user(self, client: dict):
+        """
+        Record one client's nickname; new mappings are buffered until flush().
+        
+        Args:
+            client: Client dict with uid and nickname
+        """
+        uid = client.get('client_unique_identifier', '') or client.get('uid', '')
+        nickname = client.get('client_nickname', '') or client.get('nickname', '')
+        
+        # Skip if either field is empty
+        if not uid or not nickname:
+            return
+        
+        # Check if this is a new nickname for this UID
+        nicknames = self.uid_nicknames.get(uid)
+        if nicknames is None:
+            nicknames = self.uid_nicknames[uid] = set()
+        
+        if nickname not in nicknames:
+            nicknames.add(nickname)
+            self._new_entries.append((uid, nickname))
+    
+    def flush(self):
+        """Append mappings buffered by add_user() to the CSV."""
+        if not self._new_entries:
+            return
         try:
-            new_entries = []
+            writer = self._ensure_writer()
+            writer.writerows(self._new_entries)
+            self.file_handle.flush()
             
-            for client in clients:
-                uid = client.get('client_unique_identifier', '') or client.get('uid', '')
-                nickname = client.get('client_nickname', '') or client.get('nickname', '')
-                
-                # Skip if either field is empty
-                if not uid or not nickname:
-                    continue
-                
-                # Check if this is a new nickname for this UID
-                if uid not in self.uid_nicknames:
-                    self.uid_nicknames[uid] = set()
-                
-                if nickname not in self.uid_nicknames[uid]:
-                    self.uid_nicknames[uid].add(nickname)
-                    new_entries.append((uid, nickname))
-            
-            # Append new entries to CSV
-            if new_entries:
-                file_exists = os.path.exists(self.csv_path)
-                with open(self.csv_path, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    
-                    if not file_exists:
-                        writer.writerow(['UID', 'NICKNAME'])
-                    
-                    for uid, nickname in new_entries:
-                        writer.writerow([uid, nickname])
-                
-                logger.info(f"Added {len(new_entries)} new UID-nickname mappings to uid_nicknames.csv")
+            logger.info(f"Added {len(self._new_entries)} new UID-nickname mappings to uid_nicknames.csv")
         
         except Exception as e:
             logger.error(f"Failed to add UID-nickname mappings: {e}")
+        finally:
+            self._new_entries = []
+    
+    def _ensure_writer(self):
+        """Open uid_nicknames.csv for appending once and reuse the handle."""
+        if self.csv_writer is None:
+            file_exists = os.path.exists(self.csv_path)
+            self.file_handle = open(self.csv_path, 'a', newline='', encoding='utf-8',
+                                    buffering=WRITE_BUFFER_SIZE)
+            self.csv_writer = csv.writer(self.file_handle)
+            
+            if not file_exists:
+                self.csv_writer.writerow(['UID', 'NICKNAME'])
+        return self.csv_writer
+    
+    def close(self):
+        """Close the CSV file."""
+        if self.file_handle:
+            try:
+                self.file_handle.close()
+            except Exception as e:
+                logger.error(f"Error closing uid_nicknames.csv: {e}")
+            finally:
+                self.file_handle = None
+                self.csv_writer = None
     
     def get_all_mappings(self):
         """
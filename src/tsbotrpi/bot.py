@@ -1,28 +1,168 @@
 import logging
+import random
+import re
+import selectors
+import socket
+import sys
 import time
 import threading
 import os
 import csv
+import errno
 import ts3
 from datetime import datetime
 from urllib.parse import quote as encodeURIComponent
 import requests
-from queue import Queue
+from requests.adapters import HTTPAdapter
+from queue import Empty, SimpleQueue
+from concurrent.futures import ThreadPoolExecutor, wait
 from collections import deque
 from functools import wraps
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .commands import process_command
 from .activity_logger import (
     ActivityLogger, 
+    ClientInfo,
     ClientListLogger, 
     ReferenceDataManager, 
     UsersSeenTracker,
     UIDNicknamesTracker,
-    HumanReadableActivityLogger
+    HumanReadableActivityLogger,
+    LogBatcher
 )
 
 logger = logging.getLogger(__name__)
 
+# Project root - all CSV/TXT data files live here
+LOG_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ACTIVITY_LOG_PATH = os.path.join(LOG_DIR, 'activities_log.csv')
+CLIENTS_REF_PATH = os.path.join(LOG_DIR, 'clients_reference.csv')
+CHANNELS_REF_PATH = os.path.join(LOG_DIR, 'channels_reference.csv')
+USERS_SEEN_PATH = os.path.join(LOG_DIR, 'users_seen.csv')
+UID_NICKNAMES_PATH = os.path.join(LOG_DIR, 'uid_nicknames.csv')
+HUMAN_LOG_PATH = os.path.join(LOG_DIR, 'activity_log_readable.csv')
+CLIENTS_LOG_PATH = os.path.join(LOG_DIR, 'clients_log.csv')
+EXPS_PATH = os.path.join(LOG_DIR, 'exps.csv')
+EXP_DELTAS_PATH = os.path.join(LOG_DIR, 'exp_deltas.csv')
+REGISTERED_PATH = os.path.join(LOG_DIR, 'registered.txt')
+PKC_LOG_PATH = os.path.join(LOG_DIR, 'pkc.csv')
+
+# Guild exp monitor endpoint polled by _check_guild_exp (query string quoted once)
+GUILD_EXP_GUILD = "ShellPatrocina"
+GUILD_EXP_WORLD = "Auroria"
+GUILD_EXP_URL = (
+    "https://rubinot-guild-monitor.onrender.com/api/guild-exp"
+    f"?guild={encodeURIComponent(GUILD_EXP_GUILD)}&world={encodeURIComponent(GUILD_EXP_WORLD)}&only_online=1"
+)
+
+# One guild exp notification entry per member, filled with str.format_map()
+_MEMBER_TEMPLATE = (
+    "[b][color=#4ECDC4]{name}[/color][/b] [color=#A0A0A0](Lvl {level} {vocation})[/color]\n"
+    "  [color=#00FF00]⬆ +{delta_experience:,} exp[/color]\n\n"
+)
+_MEMBER_DEFAULTS = {'name': 'Unknown', 'level': 0, 'vocation': 'Unknown', 'delta_experience': 0}
+
+# Nickname of the hunted-list bot driven by add_hunted()
+XBOT_NICKNAME = "x3tBot Auroria"
+
+# Text messages from nicknames matching this are ignored (x3tBot and friends).
+# One case-insensitive search instead of lowering the nickname per message.
+_IGNORED_NICK_RE = re.compile(r'x3t', re.IGNORECASE)
+
+# Idempotent queue item types - repeats within one worker batch are collapsed
+COALESCE_TYPES = frozenset({'reference_update', 'send_pokes', 'guild_exp_check', 'move_to_djinns'})
+
+# Shared placeholder for unknown clids - read-only, never stored in client_map
+_EMPTY_CLIENT = ClientInfo()
+
+# Event types the event loop acts on. Anything else (channel edits etc.) is
+# dropped before ts3 parses the frame into dicts.
+_HANDLED_EVENTS = frozenset({
+    b'notifycliententerview',
+    b'notifyclientleftview',
+    b'notifyclientmoved',
+    b'notifyclientupdated',
+    b'notifytextmessage',
+})
+
+# Seconds within which an exact repeat of the previous event frame is dropped.
+# Kept short: a user sending the same command twice produces identical frames.
+DUPLICATE_EVENT_WINDOW = 1.0
+
+# ClientQuery command used as keepalive: always valid on a selected schandler
+KEEPALIVE_COMMAND = "currentschandlerid"
+
+# Upper bound in seconds on joining threads and executors during shutdown
+SHUTDOWN_JOIN_TIMEOUT = 15
+
+# str names of the handled events, so the handler thread never decodes them.
+# Interned, so they are the same objects as the _EVENT_HANDLERS keys and the
+# literals compared against in _dispatch_event (identity hits, no string compare).
+_EVENT_TYPE_NAMES = {name: sys.intern(name.decode('ascii')) for name in _HANDLED_EVENTS}
+
+# notifyclientupdated fields worth logging; updates carrying none of them are skipped
+_LOGGED_UPDATE_KEYS = frozenset({'client_nickname', 'client_input_muted', 'client_output_muted'})
+# Same check on the raw frame, so the reader thread can drop such updates unparsed
+_LOGGED_UPDATE_RE = re.compile(rb' (?:client_nickname|client_input_muted|client_output_muted)=')
+
+# Pre-encoded clientnotifyregister lines for the event connection
+_NOTIFY_REGISTER_LINES = tuple(
+    b"clientnotifyregister schandlerid=1 event=" + event for event in sorted(_HANDLED_EVENTS)
+)
+
+# Substrings that mark a TS3 query connection as dead ('1794' is the ts3
+# client's "not connected" error id). Compiled once so the error path does a
+# single scan instead of one `in` check per substring.
+_CONN_ERR_RE = re.compile(r'broken pipe|errno 32|connection|socket|not connected|1794', re.IGNORECASE)
+
+# Socket errnos meaning the TS client isn't listening / can't be reached (restart it)
+_REFUSED_ERRNOS = frozenset(
+    code for code in (
+        errno.ECONNREFUSED, errno.ENETUNREACH, errno.EHOSTUNREACH, errno.EADDRNOTAVAIL,
+        getattr(errno, 'WSAECONNREFUSED', None),
+    ) if code is not None
+)
+# getaddrinfo failures (socket.gaierror): host unknown / not resolvable right now
+_REFUSED_GAI_ERRNOS = frozenset((socket.EAI_NONAME, socket.EAI_AGAIN))
+
+# Messages meaning the TS client isn't listening / can't be resolved (restart it).
+# Fallback for errors that don't carry a socket errno.
+_REFUSED_RE = re.compile(
+    r'refused|10061|\b111\b|address|network|name or service not known|\[errno -2\]|nodename nor servname',
+    re.IGNORECASE
+)
+
+
+def _is_conn_error(exc):
+    """Return True if the exception means the query connection is broken.
+    
+    Socket-level failures are recognised by type; everything else falls back
+    to matching the error message (e.g. ts3 query errors carrying id 1794).
+    """
+    if isinstance(exc, (ConnectionError, ts3.query.TS3TransportError)):
+        return True
+    return _CONN_ERR_RE.search(str(exc)) is not None
+
+
+def _tune_socket(conn):
+    """Disable Nagle and enable TCP keepalive on a query connection's socket.
+    
+    Query traffic is small request/response lines, so Nagle only adds latency
+    to pipelined bursts (pokes, notify registration).
+    """
+    try:
+        # fromfd() dups the descriptor; options apply to the shared socket
+        with socket.fromfd(conn.fileno(), socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError as e:
+        logger.debug("Could not tune query socket: %s", e)
+
 
 class MemoryLogHandler(logging.Handler):
     """Custom logging handler that stores log records in memory."""
@@ -51,48 +191,146 @@ class MemoryLogHandler(logging.Handler):
         return logs[-count:] if count < len(logs) else logs
 
 
-class WarStatsCollector:
-    """Collects war statistics from API every 3 minutes."""
+class Waker:
+    """Cross-thread wake-up primitive for the main loop and event reader.
+    
+    On Linux this is backed by an eventfd registered in a selector, so a wake
+    is a single 8-byte write and the fd can also be watched next to a TS3
+    socket (see fileno()). Elsewhere it falls back to a threading.Event.
+    """
     
     def __init__(self):
-        self.cache = None
-        self.last_update = None
-        self._running = False
-        self._thread = None
-        self.api_url = "https://check-morte-shellpatrocina.onrender.com/api/stats"
+        self._fd = None
+        self._selector = None
+        self._event = None
+        if hasattr(os, 'eventfd'):
+            self._fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._fd, selectors.EVENT_READ)
+        else:
+            self._event = threading.Event()
+    
+    def set(self):
+        """Wake up the waiting thread."""
+        if self._fd is not None:
+            try:
+                os.eventfd_write(self._fd, 1)
+            except OSError:
+                pass
+        else:
+            self._event.set()
+    
+    def wait(self, timeout=None):
+        """Wait until woken or timeout expires.
+        
+        Returns:
+            bool: True if woken, False on timeout
+        """
+        if self._fd is None:
+            woken = self._event.wait(timeout)
+            self._event.clear()
+            return woken
         
-    def start(self):
-        """Start the collection thread."""
-        if self._thread is not None and self._thread.is_alive():
-            logger.warning("WarStatsCollector thread already running")
+        if not self._selector.select(timeout):
+            return False
+        self.drain()
+        return True
+    
+    def fileno(self):
+        """Return the eventfd for registering in another selector, or None without eventfd."""
+        return self._fd
+    
+    def drain(self):
+        """Reset a pending wake after the fd was seen readable elsewhere."""
+        if self._fd is None:
+            self._event.clear()
             return
+        try:
+            os.eventfd_read(self._fd)
+        except BlockingIOError:
+            pass
+    
+    def close(self):
+        """Release the eventfd and selector."""
+        if self._fd is not None:
+            self._selector.close()
+            os.close(self._fd)
+            self._fd = None
+
+
+class CommandQueue:
+    """FIFO feeding the worker thread: a deque plus a ready Event.
+    
+    deque.append/popleft are atomic in CPython, so producers (event handler,
+    reference loop, command threads) never contend on a lock; the Event only
+    wakes the single consumer. Exposes put() like queue.Queue so callers in
+    commands.py are unchanged.
+    """
+    
+    def __init__(self):
+        self._items = deque()
+        self._ready = threading.Event()
+    
+    def put(self, item):
+        """Append an item and wake the consumer."""
+        self._items.append(item)
+        self._ready.set()
+    
+    def put_front(self, items):
+        """Push items back to the head of the queue, keeping their order.
         
-        self._running = True
-        self._thread = threading.Thread(target=self._collection_loop, daemon=True)
-        self._thread.start()
-        logger.info("WarStatsCollector thread started")
+        Used to requeue drained items the consumer couldn't process yet, so
+        they still run before anything queued after them.
+        """
+        self._items.extendleft(reversed(items))
+        self._ready.set()
     
-    def stop(self):
-        """Stop the collection thread."""
-        self._running = False
-        if self._thread:
-            self._thread.join(timeout=5)
-        logger.info("WarStatsCollector thread stopped")
+    def drain(self, max_items, timeout):
+        """Take up to max_items, waiting up to timeout seconds if empty.
+        
+        Returns:
+            list: Drained items (empty if nothing arrived in time)
+        """
+        if not self._items:
+            self._ready.wait(timeout)
+        # Clear before popping: a put() racing with the pops re-sets the flag
+        self._ready.clear()
+        items = []
+        while self._items and len(items) < max_items:
+            items.append(self._items.popleft())
+        if self._items:
+            self._ready.set()  # Leftovers beyond max_items - don't sleep on them
+        return items
+
+
+class WarStatsCollector:
+    """Collects war statistics from API.
     
-    def _collection_loop(self):
-        """Main loop that collects stats every 3 minutes."""
-        while self._running:
-            try:
-                self._fetch_stats()
-                time.sleep(180)  # 3 minutes
-            except Exception as e:
-                logger.error(f"Error in WarStatsCollector loop: {e}", exc_info=True)
-                time.sleep(60)  # Wait 1 minute on error before retrying
+    Has no thread of its own: TS3Bot's reference data loop schedules collect()
+    every `interval` seconds on its HTTP executor.
+    """
+    
+    interval = 180  # 3 minutes
+    
+    def __init__(self):
+        self.cache = None
+        self.last_update = None
+        self.api_url = "https://check-morte-shellpatrocina.onrender.com/api/stats"
+        # One pooled keep-alive connection, so each fetch can skip the TCP/TLS handshake
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    
+    def collect(self):
+        """Fetch stats once, logging (not raising) any failure."""
+        try:
+            self._fetch_stats()
+        except Exception as e:
+            logger.error(f"Error in WarStatsCollector: {e}", exc_info=True)
     
     def _fetch_stats(self):
         """Fetch stats from API and update cache."""
         try:
-            response = requests.get(self.api_url, timeout=10)
+            response = self._session.get(self.api_url, timeout=10)
             response.raise_for_status()
             self.cache = response.json()
             self.last_update = datetime.now()
@@ -108,8 +346,7 @@ class WarStatsCollector:
     def _log_daily_stats(self, data):
         """Log daily war statistics to exps.csv."""
         try:
-            log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            exps_file = os.path.join(log_dir, 'exps.csv')
+            exps_file = EXPS_PATH
             
             if not data:
                 return
@@ -188,7 +425,7 @@ class WarStatsCollector:
                         'score_shellpatrocina': score_shellpatrocina
                     })
             
-            logger.debug(f"Logged daily stats to exps.csv: Asc={ascendant_exp}, Shell={shellpatrocina_exp}")
+            logger.debug("Logged daily stats to exps.csv: Asc=%s, Shell=%s", ascendant_exp, shellpatrocina_exp)
         except Exception as e:
             logger.error(f"Error logging daily stats: {e}", exc_info=True)
     
@@ -205,11 +442,11 @@ def timed(func):
         try:
             result = func(*args, **kwargs)
             elapsed = (time.perf_counter() - start_time) * 1000
-            logger.debug(f"⏱️ {func.__name__} completed in {elapsed:.2f}ms")
+            logger.debug("⏱️ %s completed in %.2fms", func.__name__, elapsed)
             return result
         except Exception as e:
             elapsed = (time.perf_counter() - start_time) * 1000
-            logger.debug(f"⏱️ {func.__name__} failed after {elapsed:.2f}ms: {e}")
+            logger.debug("⏱️ %s failed after %.2fms: %s", func.__name__, elapsed, e)
             raise
     return wrapper
 
@@ -217,22 +454,58 @@ def timed(func):
 class TS3Bot:
     """Simplified TeamSpeak bot based on AutoanswerScheduler pattern."""
 
+    # Connections kept alive by run(): (attribute, name for logs, read keepalive reply)
+    KEEPALIVE_TARGETS = (
+        ('conn', "Main connection", True),
+        ('event_conn', "Event connection", False),
+        ('worker_conn', "Worker connection", True),
+        ('reference_conn', "Reference connection", True),
+    )
+
     def __init__(self, host: str, api_key: str, server_address: str = "", nickname: str = "Rollabot", process_manager=None):
         self.host = host
         self.api_key = api_key
         self.server_address = server_address
         self.nickname = nickname
+        # Built once - every connection (and reconnect) sends the same connect command
+        self._connect_cmd = f"connect address={server_address} nickname={nickname}"
         self.process_manager = process_manager
         self.conn = None  # Main connection - keepalive and general operations
         self.event_conn = None  # Dedicated connection for event loop only
         self.worker_conn = None  # Dedicated connection for worker thread (command responses)
         self.reference_conn = None  # Dedicated connection for reference data updates
         self._event_thread = None
+        self._event_handler_thread = None
+        self._raw_events = SimpleQueue()  # (event name, raw TS3Event): reader thread -> handler thread
         self._reference_thread = None
         self._worker_thread = None
         self._running = False
-        self.command_queue = Queue()  # FIFO queue for ALL operations (commands, reference updates, pokes)
-        self.client_map = {}  # Maps clid -> {nickname, uid, ip}
+        self._event_ready = Waker()  # Set by run() when a fresh event_conn is ready, and on shutdown
+        self._stop_event = threading.Event()  # Set on shutdown to wake sleeping threads
+        self._reference_nudge = threading.Event()  # Wakes the reference loop early (refresh or shutdown)
+        self._wake = Waker()  # Wakes the main loop early (connection loss, shutdown)
+        # Supervised loop threads: name -> (thread attribute, target)
+        self._supervised = {
+            'event': ('_event_thread', self._event_loop),
+            'handler': ('_event_handler_thread', self._event_handler_loop),
+            'worker': ('_worker_thread', self._worker_loop),
+            'reference': ('_reference_thread', self._reference_data_loop),
+        }
+        # Off-worker lanes for I/O that doesn't touch worker_conn. Single-threaded
+        # each so reference_conn / guild exp state are never used concurrently.
+        self._reference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reference-io")
+        self._http_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="http-io")
+        self._pending_types = set()  # COALESCE_TYPES currently sitting in command_queue
+        self._pending_types_lock = threading.Lock()
+        self.command_queue = CommandQueue()  # FIFO queue for ALL operations (commands, reference updates, pokes)
+        self.client_map: dict[str, ClientInfo] = {}  # Maps clid -> ClientInfo
+        self.clid_by_uid: dict[str, str] = {}  # Online clients only: uid -> clid
+        self._xbot_clid = None  # clid of x3tBot Auroria while it is online (see get_xbot)
+        self._xbot_missed_at = float('-inf')  # monotonic time of the last clientlist scan that didn't find it
+        self._clientlist_cache = (0.0, None)  # (monotonic timestamp, parsed clientlist)
+        self._clientlist_generation = 0  # Bumped on invalidation; stale fetches aren't stored
+        self._poll_events_blocking = False  # Set once the telnet buffers can't be inspected
+        self._channel_clids_cache = (None, {})  # (clientlist it was built from, cid -> clids)
         self.activity_logger = None
         self.clients_logger_initialized = False
         
@@ -241,17 +514,23 @@ class TS3Bot:
         self.users_seen_tracker = None
         self.uid_nicknames_tracker = None
         self.human_readable_logger = None
+        self.log_batcher = LogBatcher()  # Batches activity log writes (both activity CSVs)
         
         # War stats collector
         self.war_stats_collector = WarStatsCollector()
         
-        # Duplicate event prevention
-        self.last_event = None
-        self.last_event_timestamp = 0
+        # Duplicate event prevention, owned by the event reader thread
+        # (raw lines of the last frame, perf_counter() arrival time)
+        self._last_event_frame = None
+        self._last_event_time = float('-inf')
         
         # Guild exp monitoring
         self.last_guild_refresh_ts = None
-        # self.last_friendly_guild_refresh_ts = None  # Commented out - not needed anymore
+        self._registered_cache = (None, {})  # (registered.txt mtime_ns, uid -> min_exp)
+        # Long-lived session so the guild exp API reuses its TCP/TLS connection
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._guild_exp_validators = {}  # Conditional GET headers from the last guild exp response
         
         # Pending pokes queue for reliable delivery
         self.pending_pokes = deque()  # Each item: {'message': str, 'target_uids': set, 'timestamp': float}
@@ -270,6 +549,14 @@ class TS3Bot:
 
         # Consecutive reconnection failure counter - force kill PID after 5
         self._reconnect_fail_count = 0
+        # Attempts against a running TS client before restarting it (restart after 3)
+        self._running_client_attempts = 0
+        
+        # Per-connection reconnect backoff: consecutive failures and earliest next attempt
+        self._reconnect_attempts = {'event': 0, 'worker': 0, 'reference': 0}
+        self._next_reconnect_at = {'conn': 0, 'event': 0, 'worker': 0, 'reference': 0}
+        # No reconnect attempt before this time.time() (TS client booting / retry spacing)
+        self._reconnect_not_before = 0.0
 
     @timed
     def _ensure_server_connection(self, conn=None, conn_name="connection"):
@@ -291,23 +578,56 @@ class TS3Bot:
             
             # Not connected to server, try to connect
             logger.info(f"{conn_name} not connected to server, attempting to connect...")
-            conn.send(f"connect address={self.server_address} nickname={self.nickname}")
+            conn.send(self._connect_cmd)
             logger.info(f"{conn_name} connected to server %s as %s", self.server_address, self.nickname)
             
         except Exception as e:
             # Try to connect anyway
             try:
-                conn.send(f"connect address={self.server_address} nickname={self.nickname}")
+                conn.send(self._connect_cmd)
                 logger.info(f"{conn_name} connected to server %s as %s", self.server_address, self.nickname)
             except Exception as e2:
                 # Ignore "already connected" error (id 1796)
                 if "1796" not in str(e2):
-                    logger.debug(f"{conn_name} server connection check/reconnect failed: {e2}")
+                    logger.debug("%s server connection check/reconnect failed: %s", conn_name, e2)
+
+    def _init_logging(self):
+        """Create the CSV loggers and trackers. Called once from run(), not per reconnect."""
+        try:
+            # Old activity logger (kept for backward compatibility)
+            self.activity_logger = ActivityLogger(ACTIVITY_LOG_PATH)
+            
+            # Reference data manager
+            self.reference_manager = ReferenceDataManager(CLIENTS_REF_PATH, CHANNELS_REF_PATH)
+            
+            # Users seen tracker
+            self.users_seen_tracker = UsersSeenTracker(USERS_SEEN_PATH)
+            
+            # UID nicknames tracker
+            self.uid_nicknames_tracker = UIDNicknamesTracker(UID_NICKNAMES_PATH)
+            
+            # Human-readable activity logger
+            self.human_readable_logger = HumanReadableActivityLogger(
+                HUMAN_LOG_PATH, 
+                self.reference_manager
+            )
+            
+            #self.human_readable_logger.cleanup_old_entries(days=30)
+            
+            # Route per-event rows through the batcher instead of a write+flush each
+            self.activity_logger.batcher = self.log_batcher
+            self.human_readable_logger.batcher = self.log_batcher
+            self.log_batcher.start()
+            
+            logger.info("All logging components initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize logging components: {e}")
 
     @timed
     def setup_connection(self):
         """Setup TS3 ClientQuery connection for commands and operations."""
         conn = ts3.query.TS3ClientConnection(self.host)
+        _tune_socket(conn)
         conn.auth(apikey=self.api_key)
         conn.use()
         
@@ -315,7 +635,7 @@ class TS3Bot:
         if self.server_address:
             try:
                 
-                conn.send(f"connect address={self.server_address} nickname={self.nickname}")
+                conn.send(self._connect_cmd)
                 logger.info("Connected to server %s as %s", self.server_address, self.nickname)
                 time.sleep(10)
                 #logger.info("Connected to server %s as %s", self.server_address, self.nickname)
@@ -330,42 +650,6 @@ class TS3Bot:
         
         #logger.info("Connected to ClientQuery at %s", self.host)
         
-        # Initialize logging components on first successful connection
-        if not self.activity_logger:
-            try:
-                log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                
-                # Old activity logger (kept for backward compatibility)
-                activity_log_path = os.path.join(log_dir, 'activities_log.csv')
-                self.activity_logger = ActivityLogger(activity_log_path)
-                self.activity_logger.cleanup_old_entries(days=30)
-                
-                # Reference data manager
-                clients_ref_path = os.path.join(log_dir, 'clients_reference.csv')
-                channels_ref_path = os.path.join(log_dir, 'channels_reference.csv')
-                self.reference_manager = ReferenceDataManager(clients_ref_path, channels_ref_path)
-                
-                # Users seen tracker
-                users_seen_path = os.path.join(log_dir, 'users_seen.csv')
-                self.users_seen_tracker = UsersSeenTracker(users_seen_path)
-                
-                # UID nicknames tracker
-                uid_nicknames_path = os.path.join(log_dir, 'uid_nicknames.csv')
-                self.uid_nicknames_tracker = UIDNicknamesTracker(uid_nicknames_path)
-                
-                # Human-readable activity logger
-                human_log_path = os.path.join(log_dir, 'activity_log_readable.csv')
-                self.human_readable_logger = HumanReadableActivityLogger(
-                    human_log_path, 
-                    self.reference_manager
-                )
-                
-                #self.human_readable_logger.cleanup_old_entries(days=30)
-                
-                logger.info("All logging components initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize logging components: {e}")
-        
         # Fetch and log current client list on startup
         if not self.clients_logger_initialized:
             self._fetch_and_log_clientlist(conn)
@@ -380,22 +664,22 @@ class TS3Bot:
     def setup_event_connection(self):
         """Setup dedicated TS3 ClientQuery connection for event loop."""
         conn = ts3.query.TS3ClientConnection(self.host)
+        _tune_socket(conn)
         conn.auth(apikey=self.api_key)
         conn.use()
-        # Register only for events the bot actually uses
-        conn.clientnotifyregister(event="notifycliententerview", schandlerid=1)
-        conn.clientnotifyregister(event="notifyclientleftview", schandlerid=1)
-        conn.clientnotifyregister(event="notifyclientmoved", schandlerid=1)
-        conn.clientnotifyregister(event="notifyclientupdated", schandlerid=1)
-        conn.clientnotifyregister(event="notifytextmessage", schandlerid=1)
+        # Register only for events the bot actually uses, in one round-trip
+        for error in self._exec_pipelined(conn, _NOTIFY_REGISTER_LINES):
+            if error is not None:
+                raise error
         
         # Connect to server if address is configured
         if self.server_address:
             try:
-                conn.send(f"connect address={self.server_address} nickname={self.nickname}")
+                conn.send(self._connect_cmd)
             except Exception as e:
-                # Ignore "already connected" error
-                pass
+                # Ignore "already connected" error (id 1796)
+                if "1796" not in str(e):
+                    logger.debug("Connect command failed: %s", e)
         
         return conn
 
@@ -403,16 +687,18 @@ class TS3Bot:
     def setup_worker_connection(self):
         """Setup dedicated TS3 ClientQuery connection for worker thread."""
         conn = ts3.query.TS3ClientConnection(self.host)
+        _tune_socket(conn)
         conn.auth(apikey=self.api_key)
         conn.use()
         
         # Connect to server if address is configured
         if self.server_address:
             try:
-                conn.send(f"connect address={self.server_address} nickname={self.nickname}")
+                conn.send(self._connect_cmd)
             except Exception as e:
-                # Ignore "already connected" error
-                pass
+                # Ignore "already connected" error (id 1796)
+                if "1796" not in str(e):
+                    logger.debug("Connect command failed: %s", e)
         
         return conn
 
@@ -420,40 +706,161 @@ class TS3Bot:
     def setup_reference_connection(self):
         """Setup dedicated TS3 ClientQuery connection for reference data loop."""
         conn = ts3.query.TS3ClientConnection(self.host)
+        _tune_socket(conn)
         conn.auth(apikey=self.api_key)
         conn.use()
         
         # Connect to server if address is configured
         if self.server_address:
             try:
-                conn.send(f"connect address={self.server_address} nickname={self.nickname}")
+                conn.send(self._connect_cmd)
             except Exception as e:
-                # Ignore "already connected" error
-                pass
+                # Ignore "already connected" error (id 1796)
+                if "1796" not in str(e):
+                    logger.debug("Connect command failed: %s", e)
         
         return conn
 
 
 
     def _is_connection_refused(self, exc):
-        """Check if error is connection refused or address not found."""
-        err = str(exc).lower()
-        return (
-            "refused" in err or 
-            "10061" in err or 
-            "111" in err or
-            "connection refused" in err or
-            "address" in err or
-            "network" in err or
-            "name or service not known" in err or
-            "[errno -2]" in err or
-            "nodename nor servname" in err
-        )
+        """Check if error is connection refused or address not found.
+        
+        Decided by the errno of the first OSError in the exception chain; the
+        message is only matched when no socket errno is available.
+        """
+        seen = exc
+        while seen is not None:
+            if isinstance(seen, ConnectionRefusedError):
+                return True
+            if isinstance(seen, OSError) and seen.errno is not None:
+                if isinstance(seen, socket.gaierror):
+                    return seen.errno in _REFUSED_GAI_ERRNOS
+                return seen.errno in _REFUSED_ERRNOS
+            seen = seen.__cause__ or seen.__context__
+        return _REFUSED_RE.search(str(exc)) is not None
+
+    def _drop_connection(self, attr):
+        """Forget a broken connection and wake the main loop to reconnect it.
+        
+        Args:
+            attr: Connection attribute name ('worker_conn', 'event_conn', ...)
+        """
+        setattr(self, attr, None)
+        self._wake.set()
+
+    def _next_main_loop_wakeup(self, last_keepalive_time):
+        """Seconds the main loop may sleep before it has something to do.
+        
+        That is the next keepalive, or the next reconnect attempt for a dropped
+        connection. Worker/event/reference threads wake it early through
+        _drop_connection(); the cap is only a safety net for connections that
+        close without any thread noticing.
+        """
+        next_due = last_keepalive_time + 120
+        for name, attr in (('conn', 'conn'), ('event', 'event_conn'),
+                           ('worker', 'worker_conn'), ('reference', 'reference_conn')):
+            conn = getattr(self, attr)
+            if conn is None or not conn.is_connected():
+                next_due = min(next_due, self._next_reconnect_at[name])
+        return min(max(next_due - time.time(), 0.05), 30)
+
+    def _ensure_alive(self, name):
+        """Start a supervised loop thread if it isn't running.
+        
+        Only called at startup and after its connection is re-established, so
+        liveness is probed when something actually changed.
+        
+        Args:
+            name: Key in `_supervised` ('event', 'handler', 'worker', 'reference')
+        """
+        attr, target = self._supervised[name]
+        thread = getattr(self, attr)
+        if thread is None or not thread.is_alive():
+            if thread is not None:
+                logger.warning("%s loop thread died, restarting...", name.capitalize())
+            thread = threading.Thread(target=target, daemon=True, name=f"{name}-loop")
+            thread.start()
+            setattr(self, attr, thread)
+            logger.info("%s loop thread started", name.capitalize())
+
+    def _send_keepalive(self, conn, wait_for_reply=True):
+        """Keep a query connection alive with a cheap ClientQuery command.
+        
+        ts3's send_keepalive() sends `version`, which TS3ClientConnection's
+        command set rejects, so KEEPALIVE_COMMAND goes through the public
+        exec_() instead. exec_() always waits for the reply, so for the event
+        connection - whose reader thread consumes (and drops) query replies
+        while waiting for events - the same query is only sent, the way ts3
+        2.0's exec_query() does it minus its _wait_for_resp().
+        
+        Args:
+            conn: TS3ClientConnection to keep alive
+            wait_for_reply: Read the reply here. Pass False for the event connection.
+        """
+        if wait_for_reply:
+            conn.exec_(KEEPALIVE_COMMAND)
+            return
+        conn._transport.send_line(conn.query(KEEPALIVE_COMMAND).compile().encode())
+        conn._num_pending_queries += 1
+
+    @staticmethod
+    def _safe_close(name, close_fn):
+        """Run one shutdown step, logging instead of raising on failure.
+        
+        Args:
+            name: Human-readable name of the resource for logs
+            close_fn: Callable performing the close/stop/join (skipped if falsy)
+        """
+        if not close_fn:
+            return
+        try:
+            close_fn()
+        except Exception as e:
+            logger.error(f"Error stopping {name}: {e}")
+
+    def _schedule_reconnect(self, name, attempts):
+        """Schedule the next reconnect attempt for a connection.
+        
+        Uses capped exponential backoff with jitter so the four connections
+        don't retry in lockstep during a server outage.
+        
+        Args:
+            name: Key in `_next_reconnect_at` ('conn', 'event', 'worker', 'reference')
+            attempts: Number of consecutive failed attempts so far
+        
+        Returns:
+            float: Delay in seconds until the next attempt
+        """
+        delay = min(60, 0.5 * (2 ** attempts)) * random.uniform(0.5, 1.5)
+        now = time.time()
+        # Every connection goes through the same TS client, so none retries while it boots
+        delay = max(delay, self._reconnect_not_before - now)
+        self._next_reconnect_at[name] = now + delay
+        return delay
+
+    def _defer_reconnects(self, seconds):
+        """Hold off all reconnect attempts for the given time instead of sleeping.
+        
+        The main loop keeps running (keepalives, wakeups) and the next attempt
+        is scheduled no earlier than this by _schedule_reconnect().
+        
+        Args:
+            seconds: Minimum wait before the next attempt
+        """
+        self._reconnect_not_before = max(self._reconnect_not_before, time.time() + seconds)
 
     def _reconnect(self, error=None):
         """Reconnect and start/restart TS client only if connection refused.
 
-        After 5 consecutive failures, force kills the TS client PID and restarts.
+        Makes a single connection attempt per call. Waits between attempts and
+        for the TS client to boot are recorded with _defer_reconnects() rather
+        than slept, so the main loop keeps servicing keepalives meanwhile and
+        calls this again once the wait is over.
+
+        While the TS client is running it gets 3 attempts 5s apart before it is
+        restarted. After 5 consecutive failures, force kills the TS client PID
+        and restarts.
         """
         self.conn = None
 
@@ -472,17 +879,11 @@ class TS3Bot:
             time.sleep(3)
             self.process_manager.start()
             self._reconnect_fail_count = 0
+            self._running_client_attempts = 0
             # Wait for TS client to boot (box64 takes ~60s)
             logger.info("Waiting 60s for TS client to start after force kill...")
-            time.sleep(60)
-            try:
-                self.conn = self.setup_connection()
-                logger.info("Connected after force kill + restart")
-                return
-            except Exception as e:
-                logger.error("Still cannot connect after force kill: %s", e)
-                self._reconnect_fail_count += 1
-                return
+            self._defer_reconnects(60)
+            return
 
         # Check if TS client process is running
         ts_is_running = False
@@ -494,32 +895,35 @@ class TS3Bot:
 
         # If TS is running, try reconnecting multiple times before restarting
         if ts_is_running:
-            for attempt in range(1, 4):  # 3 attempts
-                try:
-                    logger.info("Reconnection attempt %d/3...", attempt)
-                    self.conn = self.setup_connection()
-                    logger.info("Reconnected successfully on attempt %d", attempt)
-                    self._reconnect_fail_count = 0
-                    return
-                except Exception as e:
-                    logger.error("Reconnection attempt %d failed: %s", attempt, e)
-                    if attempt < 3:
-                        time.sleep(5)
+            self._running_client_attempts += 1
+            attempt = self._running_client_attempts
+            try:
+                logger.info("Reconnection attempt %d/3...", attempt)
+                self.conn = self.setup_connection()
+                logger.info("Reconnected successfully on attempt %d", attempt)
+                self._reconnect_fail_count = 0
+                self._running_client_attempts = 0
+                return
+            except Exception as e:
+                logger.error("Reconnection attempt %d failed: %s", attempt, e)
+            if attempt < 3:
+                self._defer_reconnects(5)
+                return
 
             # All 3 attempts failed
+            self._running_client_attempts = 0
             self._reconnect_fail_count += 1
             logger.warning(
                 "All 3 reconnection attempts failed (consecutive failures: %d/5)",
                 self._reconnect_fail_count
             )
-            if self.process_manager:
-                restarted = self.process_manager.restart()
-                if restarted:
-                    logger.info("TS client restarted, waiting 60s...")
-                    time.sleep(60)
-                else:
-                    logger.warning("TS client restart skipped due to cooldown")
-                    time.sleep(5)
+            restarted = self.process_manager.restart()
+            if restarted:
+                logger.info("TS client restarted, waiting 60s...")
+                self._defer_reconnects(60)
+            else:
+                logger.warning("TS client restart skipped due to cooldown")
+                self._defer_reconnects(5)
             return
 
         # TS not running - try to connect, then start if needed
@@ -540,23 +944,167 @@ class TS3Bot:
                 restarted = self.process_manager.restart()
                 wait_time = 60 if restarted else 5
                 logger.info("Waiting %ds for TS client...", wait_time)
-                time.sleep(wait_time)
+                self._defer_reconnects(wait_time)
 
+    @staticmethod
+    def _exec_pipelined(conn, lines):
+        """Send several queries back-to-back, then read all the replies.
+        
+        ClientQuery answers commands strictly in order, so writing them all
+        first costs one round-trip instead of one per query. The lines go out
+        in a single write (same bytes as one send_line() per query).
+        
+        ts3 has no public API for this, so it mirrors exec_query() from ts3
+        2.0.0b3 (pinned in requirements.txt): the transport's send_line(), the
+        _num_pending_queries counter and _wait_for_resp(). Replies are matched
+        to lines by position only, so any failure other than a TS3QueryError
+        leaves the stream out of step and is raised as a TS3TransportError
+        for the caller to drop the connection.
+        
+        Args:
+            conn: TS3ClientConnection to use
+            lines: Encoded query lines (e.g. conn.query(...).compile().encode())
+        
+        Returns:
+            list: Per line, None on success or the TS3QueryError it returned
+        
+        Raises:
+            TS3TransportError if the batch could not be completed
+        """
+        if not lines:
+            return []
+        results = []
+        try:
+            conn._transport.send_line(b"\n\r".join(lines))
+            conn._num_pending_queries += len(lines)
+            for _ in lines:
                 try:
-                    self.conn = self.setup_connection()
-                    logger.info("Connected after restarting TS client")
-                    self._reconnect_fail_count = 0
-                except Exception as e2:
-                    self._reconnect_fail_count += 1
-                    logger.error("Still cannot connect: %s", e2)
-       
+                    conn._wait_for_resp()
+                    results.append(None)
+                except ts3.query.TS3QueryError as e:
+                    results.append(e)
+        except ts3.query.TS3TransportError:
+            raise
+        except Exception as e:
+            raise ts3.query.TS3TransportError(
+                f"pipelined batch failed after {len(results)}/{len(lines)} replies: {e!r}"
+            ) from e
+        return results
+
+    def _send_text_chunks(self, conn, clid, chunks):
+        """Send a private text message split into chunks, pipelined in one round-trip.
+        
+        Args:
+            conn: Connection to send on
+            clid: Target client ID
+            chunks: Message chunks, in order
+        
+        Raises:
+            The first TS3QueryError a chunk returned, or a transport error
+        """
+        lines = [
+            conn.query("sendtextmessage", targetmode=1, target=clid, msg=chunk).compile().encode()
+            for chunk in chunks
+        ]
+        for error in self._exec_pipelined(conn, lines):
+            if error is not None:
+                raise error
+
+    def _cached_clientlist(self, conn, ttl=2.0):
+        """Return the parsed `clientlist -uid`, reusing a result younger than ttl seconds.
+        
+        Collapses back-to-back lookups (masspoke, x3tBot lookup, startup fetch,
+        pending pokes, PKC warnings) into a single query. Kicks pass ttl=0. UIDs are
+        always requested so every caller can share one result. Join/leave/move
+        events invalidate the cache.
+        
+        Args:
+            conn: Connection to query on a cache miss
+            ttl: Maximum age in seconds of a reusable result (0 forces a fresh query)
+        
+        Returns:
+            list: Parsed client dicts
+        """
+        now = time.monotonic()
+        cached_at, clients = self._clientlist_cache
+        if clients is not None and now - cached_at < ttl:
+            return clients
+        
+        generation = self._clientlist_generation
+        clients = conn.clientlist(uid=True).parsed
+        self._store_clientlist(now, generation, clients)
+        return clients
+
+    def _store_clientlist(self, fetched_at, generation, clients):
+        """Cache a fetched clientlist unless the cache was invalidated meanwhile.
+        
+        A join/leave/move event arriving while the query was in flight bumps the
+        generation; storing the older snapshot would undo that invalidation.
+        
+        Args:
+            fetched_at: time.monotonic() taken before the query was sent
+            generation: `_clientlist_generation` read before the query was sent
+            clients: Parsed client dicts
+        """
+        if generation == self._clientlist_generation:
+            self._clientlist_cache = (fetched_at, clients)
+
+    def _cached_channel_clids(self, conn, ttl=2.0):
+        """Return the clids of real (non-query) clients grouped by channel id.
+        
+        Built in one pass over the cached clientlist and reused until that list
+        is refreshed, so kicks, PKC checks and masspoke read plain clid lists
+        instead of filtering every client dict again.
+        
+        Args:
+            conn: Connection to query on a clientlist cache miss
+            ttl: Passed to _cached_clientlist (0 for a fresh query before kicks)
+        
+        Returns:
+            dict: Channel id string -> list of clid strings
+        """
+        clients = self._cached_clientlist(conn, ttl)
+        source, index = self._channel_clids_cache
+        if source is clients:
+            return index
+        
+        index = {}
+        for client in clients:
+            if client.get('client_type') == '1':  # ServerQuery client (bot)
+                continue
+            clid = client.get('clid')
+            if clid:
+                index.setdefault(client.get('cid', ''), []).append(clid)
+        self._channel_clids_cache = (clients, index)
+        return index
+
+    def _invalidate_clientlist_cache(self):
+        """Drop the cached clientlist after the online set or channels changed."""
+        self._clientlist_generation += 1
+        self._clientlist_cache = (0.0, None)
 
     def get_xbot(self):
-        """Find x3tBot Auroria client."""
-        clients = self.conn.clientlist().parsed
+        """Find x3tBot Auroria client.
+        
+        Served from the clid index kept up to date by enter/leave/update events;
+        only falls back to a clientlist scan when the bot hasn't been seen yet.
+        A scan that misses is trusted for 60s - a join in the meantime sets the
+        index through the enter event anyway.
+        """
+        if self._xbot_clid is not None:
+            info = self.client_map.get(self._xbot_clid)
+            if info is not None:
+                return {'clid': self._xbot_clid, 'client_nickname': info.nickname}
+        
+        if time.monotonic() - self._xbot_missed_at < 60:
+            return None
+        
+        clients = self._cached_clientlist(self.conn)
         for client in clients:
-            if "x3tBot Auroria" in client.get("client_nickname", ""):
+            if XBOT_NICKNAME in client.get("client_nickname", ""):
+                self._xbot_clid = client.get("clid")
                 return client
+        self._xbot_missed_at = time.monotonic()
         return None
 
     def add_hunted(self, target):
@@ -572,14 +1120,17 @@ class TS3Bot:
                 targetmode=1, target=xbot["clid"], msg=chunk
             )
         
-        # Wait for responses
-        for _ in range(10):
+        # Drain responses in short reads under a 2s overall deadline, and stop
+        # as soon as the line has been idle for one read (~200ms)
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
             try:
-                event = self.conn.wait_for_event(timeout=1)
-                if event.parsed:
-                    logger.info("xBot response: %s", event.parsed)
+                event = self.conn.wait_for_event(timeout=0.2)
             except ts3.query.TS3TimeoutError:
                 break
+            # Only the size - a full repr of every reply would be built per event
+            if logger.isEnabledFor(logging.DEBUG) and event.parsed:
+                logger.debug("xBot response (%d items)", len(event.parsed))
         
         return f"Added {target} to hunted list"
 
@@ -657,34 +1208,33 @@ class TS3Bot:
                 remaining_secs = remaining_seconds % 60
                 kick_reason = f"Channel lock for {remaining_minutes}:{remaining_secs:02d} minutes"
             
-            # Get all clients
-            clients = self.worker_conn.clientlist().parsed
+            # Clients in the target channel (the bot itself is already excluded).
+            # Kicks are destructive, so always query a fresh clientlist.
+            targets = self._cached_channel_clids(self.worker_conn, ttl=0).get(str(channel_id), [])
+            
+            # Build every kick up front, then pipeline them in one round-trip
+            # (reasonid=5: kick from server)
+            queries = [
+                self.worker_conn.query("clientkick", reasonid=5, clid=clid, reasonmsg=kick_reason).compile().encode()
+                for clid in targets
+            ]
             
             kicked_count = 0
-            for client in clients:
-                # Skip if not in target channel
-                if str(client.get('cid', '')) != str(channel_id):
-                    continue
-                
-                # Skip bot itself
-                client_type = client.get('client_type', '')
-                if client_type == '1':  # ServerQuery client (bot)
-                    continue
-                
-                clid = client.get('clid', '')
-                if clid:
-                    try:
-                        # Kick from server (reasonid=5)
-                        self.worker_conn.clientkick(reasonid=5, clid=clid, reasonmsg=kick_reason)
-                        kicked_count += 1
-                        logger.debug(f"Kicked client {clid} from channel {channel_id}: {kick_reason}")
-                    except Exception as kick_error:
-                        logger.warning(f"Failed to kick client {clid}: {kick_error}")
+            for clid, kick_error in zip(targets, self._exec_pipelined(self.worker_conn, queries)):
+                if kick_error is not None:
+                    logger.warning(f"Failed to kick client {clid}: {kick_error}")
+                else:
+                    kicked_count += 1
+                    logger.debug("Kicked client %s from channel %s: %s", clid, channel_id, kick_reason)
             
             return {'success': True, 'kicked_count': kicked_count, 'error': None}
             
         except Exception as e:
-            logger.error(f"Error kicking channel users: {e}")
+            if _is_conn_error(e):
+                logger.warning(f"Connection error kicking channel users: {e}")
+                self._drop_connection('worker_conn')
+            else:
+                logger.error(f"Error kicking channel users: {e}")
             return {'success': False, 'kicked_count': 0, 'error': str(e)}
     
     def masspoke(self, msg):
@@ -693,38 +1243,38 @@ class TS3Bot:
             'type': 'masspoke',
             'message': msg
         })
-        logger.debug(f"Queued masspoke with message: {msg[:50]}...")
+        logger.debug("Queued masspoke with message: %s...", msg[:50])
     
     def _do_masspoke(self, msg):
         """Execute masspoke operation (called from worker thread)."""
         try:
-            clients = self.worker_conn.clientlist().parsed
+            channel_clids = self._cached_channel_clids(self.worker_conn)
             msg_chunks = self._split_poke_message(msg)
             
-            poke_count = 0
-            for client in clients:
-                # Skip bot itself
-                client_type = client.get('client_type', '')
-                if client_type == '1':  # ServerQuery client (bot)
-                    continue
-                
-                clid = client.get('clid', '')
-                if clid:
-                    try:
-                        for chunk in msg_chunks:
-                            formatted_msg = chunk if chunk.startswith("\n") else "\n" + chunk
-                            self.worker_conn.clientpoke(msg=formatted_msg, clid=clid)
-                        poke_count += 1
-                    except Exception as poke_error:
-                        logger.warning(f"Failed to poke client {clid}: {poke_error}")
+            formatted_chunks = [chunk if chunk.startswith("\n") else "\n" + chunk for chunk in msg_chunks]
+            
+            # Build every poke up front, then pipeline them in one round-trip
+            targets = []
+            queries = []
+            for clids in channel_clids.values():
+                for clid in clids:
+                    for formatted_msg in formatted_chunks:
+                        targets.append(clid)
+                        queries.append(self.worker_conn.query("clientpoke", msg=formatted_msg, clid=clid).compile().encode())
+            
+            failed_clids = set()
+            for clid, poke_error in zip(targets, self._exec_pipelined(self.worker_conn, queries)):
+                if poke_error is not None and clid not in failed_clids:
+                    failed_clids.add(clid)
+                    logger.warning(f"Failed to poke client {clid}: {poke_error}")
+            poke_count = len(set(targets) - failed_clids)
             
             logger.info(f"Masspoke completed: poked {poke_count} clients with {len(msg_chunks)} chunk(s)")
             
         except Exception as e:
-            error_str = str(e).lower()
-            if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
+            if _is_conn_error(e):
                 logger.warning(f"Connection error during masspoke: {e}")
-                self.worker_conn = None
+                self._drop_connection('worker_conn')
             else:
                 logger.error(f"Error executing masspoke: {e}")
     
@@ -732,24 +1282,22 @@ class TS3Bot:
     def _fetch_and_log_clientlist(self, conn):
         """Fetch current client list and log to CSV, update client_map."""
         try:
-            result = conn.clientlist()
-            if not result.parsed:
+            parsed_clients = self._cached_clientlist(conn)
+            if not parsed_clients:
                 logger.warning("Empty client list returned")
                 return
             
             clients = []
-            for client in result.parsed:
+            for client in parsed_clients:
                 clid = client.get('clid', '')
                 nickname = client.get('client_nickname', '')
                 uid = client.get('client_unique_identifier', '')
                 ip = client.get('connection_client_ip', '')
                 
                 # Update client map
-                self.client_map[clid] = {
-                    'nickname': nickname,
-                    'uid': uid,
-                    'ip': ip
-                }
+                self.client_map[clid] = ClientInfo(nickname, uid, ip)
+                if uid:
+                    self.clid_by_uid[uid] = clid
                 
                 clients.append({
                     'clid': clid,
@@ -759,9 +1307,7 @@ class TS3Bot:
                 })
             
             # Log to clients_log.csv
-            log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            clients_log_path = os.path.join(log_dir, 'clients_log.csv')
-            ClientListLogger.log_clients(clients_log_path, clients)
+            ClientListLogger.log_clients(CLIENTS_LOG_PATH, clients)
             
             logger.info(f"Fetched and logged {len(clients)} clients")
             
@@ -777,15 +1323,7 @@ class TS3Bot:
                 logger.warning("Empty channel list returned")
                 return
             
-            channels = []
-            for channel in result.parsed:
-                cid = channel.get('cid', '')
-                channel_name = channel.get('channel_name', '')
-                
-                channels.append({
-                    'cid': cid,
-                    'channel_name': channel_name
-                })
+            channels = result.parsed
             
             # Update reference manager
             if self.reference_manager:
@@ -800,137 +1338,238 @@ class TS3Bot:
         """Thread that queues reference data tasks every 3 minutes."""
         logger.info("Reference data collection thread started")
         
-        last_reference_update = 0
-        last_guild_exp_check = 0
-        last_channel_move = 0
+        # Monotonic schedule (immune to clock jumps); -inf makes every task due on the first pass
+        last_reference_update = float('-inf')
+        last_guild_exp_check = float('-inf')
+        last_channel_move = float('-inf')
+        last_log_cleanup = float('-inf')
+        last_war_stats = float('-inf')
         while self._running:
+            # One clock read per pass, shared by all the due checks
+            now = time.monotonic()
+            
+            # A nudge (wake_reference_refresh) makes the reference update due now
+            if self._reference_nudge.is_set():
+                self._reference_nudge.clear()
+                last_reference_update = float('-inf')
             
-            if time.time() - last_reference_update > 300:  # Every 5 minutes
-                last_reference_update = time.time()
-                self.command_queue.put({'type': 'reference_update'})
+            if now - last_reference_update > 300:  # Every 5 minutes
+                last_reference_update = now
+                self._enqueue({'type': 'reference_update'})
 
         
             # Always queue guild exp check and poke sending
-            if time.time() - last_guild_exp_check > 90:  # Every 1.5 minutes
-                last_guild_exp_check = time.time()
-                self.command_queue.put({'type': 'guild_exp_check'})
-                self.command_queue.put({'type': 'send_pokes'})
+            if now - last_guild_exp_check > 90:  # Every 1.5 minutes
+                last_guild_exp_check = now
+                self._enqueue({'type': 'guild_exp_check'})
+                self._enqueue({'type': 'send_pokes'})
             
             # Move to Djinns channel every 2 minutes
-            if time.time() - last_channel_move > 120:  # Every 2 minutes
-                last_channel_move = time.time()
-                self.command_queue.put({'type': 'move_to_djinns'})
-            
-            time.sleep(1)
+            if now - last_channel_move > 120:  # Every 2 minutes
+                last_channel_move = now
+                self._enqueue({'type': 'move_to_djinns'})
+            
+            # War stats are plain HTTP - run them on the HTTP executor, no thread of their own
+            if now - last_war_stats > WarStatsCollector.interval:
+                last_war_stats = now
+                self._http_executor.submit(self.war_stats_collector.collect)
+            
+            # Trim the activity log once a day (first pass right after startup)
+            if now - last_log_cleanup > 86400:
+                last_log_cleanup = now
+                self._cleanup_activity_logs()
+            
+            # Sleep until the next task is due; shutdown and nudges both set the
+            # event, so the loop re-checks _running / the nudge flag on wake-up
+            next_due = min(last_reference_update + 300, last_guild_exp_check + 90, last_channel_move + 120,
+                           last_war_stats + WarStatsCollector.interval, last_log_cleanup + 86400)
+            self._reference_nudge.wait(max(0.0, next_due - time.monotonic()) + 0.01)
         
         logger.info("Reference data collection thread stopped")
     
+    def wake_reference_refresh(self):
+        """Ask the reference data loop to queue a reference update right away."""
+        self._reference_nudge.set()
+    
+    def _cleanup_activity_logs(self):
+        """Drop activity log entries older than 30 days.
+        
+        Runs under the log batcher's lock, since cleanup rewrites the file and
+        reopens the logger's handle.
+        """
+        if not self.activity_logger:
+            return
+        try:
+            self.log_batcher.run_exclusive(lambda: self.activity_logger.cleanup_old_entries(days=30))
+        except Exception as e:
+            logger.error(f"Error cleaning up activity logs: {e}")
+    
     @timed
     def _do_reference_update(self):
         """Perform reference data update (called from worker thread with lock)."""
         try:
             # Fetch clientlist with all details
             clientlist_start = time.perf_counter()
+            fetched_at = time.monotonic()
+            generation = self._clientlist_generation
             result = self.reference_conn.clientlist(uid=True, away=True)
             clientlist_time = (time.perf_counter() - clientlist_start) * 1000
-            logger.debug(f"⏱️ Reference clientlist query: {clientlist_time:.2f}ms")
+            logger.debug("⏱️ Reference clientlist query: %.2fms", clientlist_time)
             
             if result.parsed:
-                clients = []
-                for client in result.parsed:
-                    clients.append({
-                        'clid': client.get('clid', ''),
-                        'client_nickname': client.get('client_nickname', ''),
-                        'client_unique_identifier': client.get('client_unique_identifier', ''),
-                        'connection_client_ip': client.get('connection_client_ip', '')
-                    })
+                # Fresh full list - let other clientlist users reuse it
+                self._store_clientlist(fetched_at, generation, result.parsed)
                 
-                # Update reference manager
+                # Every consumer reads the clientlist keys directly, so share the
+                # parsed list instead of copying it into slimmed-down dicts first
+                clients = result.parsed
+                
+                # One pass feeds the reference manager and both trackers; their
+                # CSV writes happen once afterwards
                 update_start = time.perf_counter()
-                if self.reference_manager:
-                    self.reference_manager.update_clients(clients)
+                reference_manager = self.reference_manager
+                users_seen_tracker = self.users_seen_tracker
+                uid_nicknames_tracker = self.uid_nicknames_tracker
+                clid_by_uid = {}
+                for client in clients:
+                    uid = client.get('client_unique_identifier')
+                    if uid:
+                        clid_by_uid[uid] = client.get('clid', '')
+                    if reference_manager:
+                        reference_manager.add_client(client)
+                    if users_seen_tracker:
+                        users_seen_tracker.add_user(client)
+                    if uid_nicknames_tracker:
+                        uid_nicknames_tracker.add_user(client)
                 
-                # Update users seen tracker
-                if self.users_seen_tracker:
-                    self.users_seen_tracker.add_users(clients)
+                # The events keep clid_by_uid current; this is only a correction
+                # pass for anything they missed (e.g. while reconnecting)
+                if clid_by_uid != self.clid_by_uid:
+                    logger.debug("Resynced uid -> clid index (%s -> %s entries)", len(self.clid_by_uid), len(clid_by_uid))
+                    self.clid_by_uid = clid_by_uid
                 
-                # Update UID nicknames tracker
-                if self.uid_nicknames_tracker:
-                    self.uid_nicknames_tracker.add_users(clients)
+                if reference_manager:
+                    reference_manager.save_clients()
+                if users_seen_tracker:
+                    users_seen_tracker.flush()
+                if uid_nicknames_tracker:
+                    uid_nicknames_tracker.flush()
                 
                 update_time = (time.perf_counter() - update_start) * 1000
-                logger.debug(f"⏱️ Update reference managers: {update_time:.2f}ms")
+                logger.debug("⏱️ Update reference managers: %.2fms", update_time)
                 
-                logger.debug(f"Updated reference data with {len(clients)} clients")
+                logger.debug("Updated reference data with %s clients", len(clients))
             
             # Fetch channellist
             channellist_start = time.perf_counter()
             channel_result = self.reference_conn.channellist()
             channellist_time = (time.perf_counter() - channellist_start) * 1000
-            logger.debug(f"⏱️ Reference channellist query: {channellist_time:.2f}ms")
+            logger.debug("⏱️ Reference channellist query: %.2fms", channellist_time)
             if channel_result.parsed:
-                channels = []
-                for channel in channel_result.parsed:
-                    channels.append({
-                        'cid': channel.get('cid', ''),
-                        'channel_name': channel.get('channel_name', '')
-                    })
+                channels = channel_result.parsed
                 
                 # Update reference manager
                 if self.reference_manager:
                     self.reference_manager.update_channels(channels)
                 
-                logger.debug(f"Updated reference data with {len(channels)} channels")
+                logger.debug("Updated reference data with %s channels", len(channels))
                 
         except Exception as e:
-            error_str = str(e).lower()
-            if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
+            if _is_conn_error(e):
                 logger.warning(f"Reference data collection connection error: {e}")
-                self.reference_conn = None
+                self._drop_connection('reference_conn')
             else:
                 logger.error(f"Error in reference data collection: {e}", exc_info=True)
     
-    @timed
-    def _check_guild_exp(self):
-        """Check guild exp API and notify registered users of gains."""
+    def _load_registered_users(self):
+        """Return registered users from registered.txt, re-reading only when it changed.
+        
+        Returns:
+            dict: uid -> min_exp threshold (empty if the file doesn't exist)
+        """
         try:
-            # Configuration
-            only_online = True
-            guild = "ShellPatrocina"  
-            world = "Auroria"
-            base_url = "https://rubinot-guild-monitor.onrender.com/"
-            
-            # Build URL
-            url = f"/api/guild-exp?guild={encodeURIComponent(guild)}&world={encodeURIComponent(world)}&only_online={1 if only_online else 0}"
+            st = os.stat(REGISTERED_PATH)
+        except FileNotFoundError:
+            return {}
+        mtime_ns = st.st_mtime_ns
+        
+        cached_mtime, cached_users = self._registered_cache
+        if cached_mtime == mtime_ns:
+            return cached_users
+        
+        read_start = time.perf_counter()
+        registered_users = {}  # uid -> min_exp threshold
+        # Small file: one raw read instead of a text-mode file object
+        fd = os.open(REGISTERED_PATH, os.O_RDONLY)
+        try:
+            data = os.read(fd, st.st_size + 4096)
+        finally:
+            os.close(fd)
+        for line in data.decode('utf-8').splitlines():
+            line = line.strip()
+            if not line:
+                continue
             
+            # Parse format: "uid" or "uid,min_exp"
+            if ',' in line:
+                parts = line.split(',', 1)
+                registered_users[parts[0]] = int(parts[1])
+            else:
+                # Backward compatibility: no threshold means 0
+                registered_users[line] = 0
+        
+        read_time = (time.perf_counter() - read_start) * 1000
+        logger.debug("⏱️ Read registered.txt: %.2fms", read_time)
+        
+        self._registered_cache = (mtime_ns, registered_users)
+        return registered_users
+    
+    @timed
+    def _check_guild_exp(self):
+        """Check guild exp API and notify registered users of gains."""
+        try:
             # Make request
             api_start = time.perf_counter()
             response = None 
             for attempt in range(1, 7):  # 6 attempts
                 try:
                     timeout = 2 ** attempt  # Exponential: 2, 4, 8, 16, 32, 64 seconds
-                    response = requests.get(base_url + url, timeout=timeout,verify=False)
+                    response = self._http.get(GUILD_EXP_URL, headers=self._guild_exp_validators,
+                                              timeout=timeout, verify=False)
                     if response.status_code == 200:
                         break
+                    elif response.status_code == 304:
+                        # Nothing new since the last fetch - skip download and parsing
+                        logger.debug("Guild exp data not modified")
+                        return
                     elif attempt < 3:
-                        logger.debug(f"Guild exp API returned status {response.status_code}, retrying...")
+                        logger.debug("Guild exp API returned status %s, retrying...", response.status_code)
                     else:
                         logger.warning(f"Guild exp API returned status {response.status_code}")
                         return
                 except requests.RequestException as e:
                     if attempt < 7:
-                        logger.debug(f"Guild exp API request failed (attempt {attempt}/3): {e}")
+                        logger.debug("Guild exp API request failed (attempt %s/3): %s", attempt, e)
                     else:
                         logger.warning(f"Guild exp API request failed after 3 attempts: {e}")
                         return
             
             api_time = (time.perf_counter() - api_start) * 1000
-            logger.debug(f"⏱️ Guild exp API call (with retries): {api_time:.2f}ms")
+            logger.debug("⏱️ Guild exp API call (with retries): %.2fms", api_time)
             
             if response is None:
                 return
             
-            data = response.json()
+            # Remember validators so the next request can be answered with a 304
+            validators = {}
+            if response.headers.get('ETag'):
+                validators['If-None-Match'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                validators['If-Modified-Since'] = response.headers['Last-Modified']
+            self._guild_exp_validators = validators
+            
+            # orjson parses the payload several times faster when it's installed
+            data = orjson.loads(response.content) if orjson else response.json()
             current_refresh_ts = data.get('last_refresh_ts')
             
             # Skip if no refresh or same as last check
@@ -947,7 +1586,7 @@ class TS3Bot:
             
             # Get members with exp gains, sorted by delta_experience (highest first)
             members_with_gains = sorted(
-                [m for m in data.get('members', []) if m.get('delta_experience', 0) > 0],
+                (m for m in data.get('members', ()) if m.get('delta_experience', 0) > 0),
                 key=lambda m: m.get('delta_experience', 0),
                 reverse=True
             )
@@ -960,31 +1599,7 @@ class TS3Bot:
             self._log_exp_deltas(members_with_gains)
             
             # Load registered users with their thresholds
-            log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            registered_file = os.path.join(log_dir, 'registered.txt')
-            
-            if not os.path.exists(registered_file):
-                logger.debug("No registered users for guild exp notifications")
-                return
-            
-            read_start = time.perf_counter()
-            registered_users = {}  # uid -> min_exp threshold
-            with open(registered_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Parse format: "uid" or "uid,min_exp"
-                    if ',' in line:
-                        parts = line.split(',', 1)
-                        registered_users[parts[0]] = int(parts[1])
-                    else:
-                        # Backward compatibility: no threshold means 0
-                        registered_users[line] = 0
-            
-            read_time = (time.perf_counter() - read_start) * 1000
-            logger.debug(f"⏱️ Read registered.txt: {read_time:.2f}ms")
+            registered_users = self._load_registered_users()
             
             if not registered_users:
                 logger.debug("No registered users for guild exp notifications")
@@ -997,31 +1612,38 @@ class TS3Bot:
                     threshold_groups[min_exp] = set()
                 threshold_groups[min_exp].add(uid)
             
+            refresh_time = datetime.fromtimestamp(current_refresh_ts).strftime('%d/%m/%Y %H:%M:%S')
+            header = (
+                "[b][color=#FFD700]═══ Guild Exp Update ═══[/color][/b]\n"
+                f"[color=#A0A0A0]{refresh_time}[/color]\n"
+            )
+            
+            # Each member's block is formatted lazily and at most once. Members are
+            # sorted by gain, so every threshold selects a prefix of the list and
+            # groups selecting the same prefix share one message.
+            member_blocks = []
+            messages_by_count = {}
+            
             # For each threshold group, create appropriate message and queue pokes
             for min_exp, uids_in_group in threshold_groups.items():
-                # Filter members that meet this threshold
-                filtered_members = [m for m in members_with_gains if m.get('delta_experience', 0) > min_exp]
+                # Count members that meet this threshold
+                count = 0
+                for member in members_with_gains:
+                    if member.get('delta_experience', 0) <= min_exp:
+                        break
+                    count += 1
                 
-                if not filtered_members:
-                    logger.debug(f"No members meet threshold {min_exp} for {len(uids_in_group)} users")
+                if not count:
+                    logger.debug("No members meet threshold %s for %s users", min_exp, len(uids_in_group))
                     continue
                 
-                # Format notification message for this threshold
-                refresh_time = datetime.fromtimestamp(current_refresh_ts).strftime('%d/%m/%Y %H:%M:%S')
-                message = f"[b][color=#FFD700]═══ Guild Exp Update ═══[/color][/b]\n"
-                message += f"[color=#A0A0A0]{refresh_time}[/color]\n"
-                
-                for member in filtered_members:
-                    name = member.get('name', 'Unknown')
-                    delta_exp = member.get('delta_experience', 0)
-                    level = member.get('level', 0)
-                    vocation = member.get('vocation', 'Unknown')
-                    
-                    # Format exp with thousands separator
-                    delta_exp_formatted = f"{delta_exp:,}"
-                    
-                    message += f"[b][color=#4ECDC4]{name}[/color][/b] [color=#A0A0A0](Lvl {level} {vocation})[/color]\n"
-                    message += f"  [color=#00FF00]⬆ +{delta_exp_formatted} exp[/color]\n\n"
+                message = messages_by_count.get(count)
+                if message is None:
+                    member_blocks.extend(
+                        _MEMBER_TEMPLATE.format_map({**_MEMBER_DEFAULTS, **member})
+                        for member in members_with_gains[len(member_blocks):count]
+                    )
+                    message = messages_by_count[count] = header + "".join(member_blocks[:count])
                 
                 # Queue poke for this threshold group
                 self.pending_pokes.append({
@@ -1029,7 +1651,7 @@ class TS3Bot:
                     'target_uids': uids_in_group.copy(),
                     'timestamp': time.time()
                 })
-                logger.info(f"Queued guild exp notification for {len(uids_in_group)} users (threshold: {min_exp}, {len(filtered_members)} members)")
+                logger.info(f"Queued guild exp notification for {len(uids_in_group)} users (threshold: {min_exp}, {count} members)")
             
             # Try to send immediately
             self._send_pending_pokes()
@@ -1058,13 +1680,12 @@ class TS3Bot:
                 
                 # Move to target channel
                 self.worker_conn.clientmove(cid=161, clid=clid)
-                logger.debug(f"Moved to channel '{target_channel_name}' (cid=161)")
+                logger.debug("Moved to channel '%s' (cid=161)", target_channel_name)
                 
             except Exception as e:
-                error_str = str(e).lower()
-                if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
+                if _is_conn_error(e):
                     logger.warning(f"Connection error during channel move: {e}")
-                    self.worker_conn = None
+                    self._drop_connection('worker_conn')
                 else:
                     logger.error(f"Error moving to channel: {e}")
                     
@@ -1085,15 +1706,14 @@ class TS3Bot:
             try:
                 for clid in clids:
                     self.worker_conn.clientmove(cid=161, clid=clid)
-                    logger.debug(f"Moved client {clid} to channel '{target_channel_name}' (cid=161)")
+                    logger.debug("Moved client %s to channel '%s' (cid=161)", clid, target_channel_name)
                 
                 return True
                 
             except Exception as e:
-                error_str = str(e).lower()
-                if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
+                if _is_conn_error(e):
                     logger.warning(f"Connection error during channel move: {e}")
-                    self.worker_conn = None
+                    self._drop_connection('worker_conn')
                 else:
                     logger.error(f"Error moving clients to channel: {e}")
                 return False
@@ -1105,8 +1725,7 @@ class TS3Bot:
     def _log_exp_deltas(self, members_with_gains):
         """Log individual exp deltas to exp_deltas.csv."""
         try:
-            log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            exp_deltas_file = os.path.join(log_dir, 'exp_deltas.csv')
+            exp_deltas_file = EXP_DELTAS_PATH
             
             timestamp = datetime.now().strftime('%d/%m/%Y %H:%M')
             
@@ -1131,134 +1750,14 @@ class TS3Bot:
                         'exp': f"+{delta_exp}"
                     })
             
-            logger.debug(f"Logged {len(members_with_gains)} exp deltas to exp_deltas.csv")
+            logger.debug("Logged %s exp deltas to exp_deltas.csv", len(members_with_gains))
         except Exception as e:
             logger.error(f"Error logging exp deltas: {e}", exc_info=True)
     
-    # COMMENTED OUT - Friendly guild exp checking not needed anymore
-    # def _check_friendly_guild_exp(self):
-    #     """Check friendly guild exp API and notify registered users of gains."""
-    #     try:
-    #         # Configuration
-    #         only_online = True
-    #         guild = "Ascended Auroria"
-    #         world = "Auroria"
-    #         base_url = "https://rubinot-guild-monitor.onrender.com/"
-    #         
-    #         # Build URL
-    #         url = f"/api/guild-exp?guild={encodeURIComponent(guild)}&world={encodeURIComponent(world)}&only_online={1 if only_online else 0}"
-    #         
-    #         # Make request
-    #         response = requests.get(base_url + url, timeout=10)
-    #         if response.status_code != 200:
-    #             logger.warning(f"Friendly guild exp API returned status {response.status_code}")
-    #             return
-    #         
-    #         data = response.json()
-    #         current_refresh_ts = data.get('last_refresh_ts')
-    #         
-    #         # Skip if no refresh or same as last check
-    #         if not current_refresh_ts:
-    #             logger.debug("No refresh timestamp in friendly guild exp data")
-    #             return
-    #         
-    #         if self.last_friendly_guild_refresh_ts == current_refresh_ts:
-    #             logger.debug("Friendly guild exp data hasn't been refreshed since last check")
-    #             return
-    #         
-    #         # Update timestamp
-    #         self.last_friendly_guild_refresh_ts = current_refresh_ts
-    #         
-    #         # Get members with exp gains
-    #         members_with_gains = [m for m in data.get('members', []) if m.get('delta_experience', 0) > 0]
-    #         
-    #         if not members_with_gains:
-    #             logger.debug("No friendly guild members with exp gains")
-    #             return
-    #         
-    #         # Format notification message
-    #         refresh_time = datetime.fromtimestamp(current_refresh_ts).strftime('%d/%m/%Y %H:%M:%S')
-    #         message = f"Friendly Guild Exp Update ({refresh_time}):\n"
-    #         message += "=" * 50 + "\n\n"
-    #         
-    #         for member in members_with_gains:
-    #             name = member.get('name', 'Unknown')
-    #             delta_exp = member.get('delta_experience', 0)
-    #             level = member.get('level', 0)
-    #             vocation = member.get('vocation', 'Unknown')
-    #             
-    #             # Format exp with thousands separator
-    #             delta_exp_formatted = f"{delta_exp:,}"
-    #             
-    #             message += f"{name} (Lvl {level} {vocation})\n"
-    #             message += f"  +{delta_exp_formatted} exp\n\n"
-    #         
-    #         logger.info(f"Friendly guild exp gains detected for {len(members_with_gains)} members")
-    #         
-    #         # Load registered users
-    #         log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    #         registered_file = os.path.join(log_dir, 'registered_friendly.txt')
-    #         
-    #         if not os.path.exists(registered_file):
-    #             logger.debug("No registered users for friendly guild exp notifications")
-    #             return
-    #         
-    #         with open(registered_file, 'r', encoding='utf-8') as f:
-    #             registered_uids = set(line.strip() for line in f if line.strip())
-    #         
-    #         if not registered_uids:
-    #             logger.debug("No registered users for friendly guild exp notifications")
-    #             return
-    #         
-    #         # Get current client list to find CLIDs from UIDs
-    #         if not self.conn or not self.conn.is_connected():
-    #             logger.warning("Cannot send friendly guild exp notifications: not connected")
-    #             return
-    #         
-    #         try:
-    #             clients = self.conn.clientlist(uid=True).parsed
-    #             
-    #             # Poke each registered user who is online
-    #             poked_count = 0
-    #             for client in clients:
-    #                 client_uid = client.get('client_unique_identifier', '')
-    #                 if client_uid in registered_uids:
-    #                     clid = client.get('clid')
-    #                     try:
-    #                         self.conn.clientpoke(clid=clid, msg=message)
-    #                         poked_count += 1
-    #                         logger.debug(f"Poked {client.get('client_nickname', 'Unknown')} with friendly guild exp update")
-    #                     except Exception as e:
-    #                         error_str = str(e).lower()
-    #                         if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket']):
-    #                             logger.warning(f"Connection error while poking client {clid}: {e}")
-    #                             self.conn = None
-    #                             break  # Stop trying if connection is broken
-    #                         else:
-    #                             logger.error(f"Failed to poke client {clid}: {e}")
-    #             
-    #             if poked_count > 0:
-    #                 logger.info(f"Notified {poked_count} registered users of friendly guild exp gains")
-    #             else:
-    #                 logger.debug("No registered users currently online for friendly guild")
-    #                 
-    #         except Exception as e:
-    #             error_str = str(e).lower()
-    #             if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket']):
-    #                 logger.warning(f"Connection error sending friendly guild exp notifications: {e}")
-    #                 self.conn = None
-    #             else:
-    #                 logger.error(f"Error sending friendly guild exp notifications: {e}")
-    #             
-    #     except requests.RequestException as e:
-    #         logger.warning(f"Failed to fetch friendly guild exp data: {e}")
-    #     except Exception as e:
-    #         logger.error(f"Error in friendly guild exp check: {e}")
-    
     def _send_pending_pokes(self):
         """Queue pending poke sending."""
         if self.pending_pokes:
-            self.command_queue.put({'type': 'send_pokes'})
+            self._enqueue({'type': 'send_pokes'})
     
     @timed
     def _do_send_pokes(self):
@@ -1266,30 +1765,18 @@ class TS3Bot:
         if not self.pending_pokes:
             return
         
-        # Get current online clients
-        try:
-            clientlist_start = time.perf_counter()
-            clients = self.worker_conn.clientlist(uid=True).parsed
-            clientlist_time = (time.perf_counter() - clientlist_start) * 1000
-            logger.debug(f"⏱️ Clientlist query: {clientlist_time:.2f}ms")
-        except Exception as e:
-            error_str = str(e).lower()
-            if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
-                logger.warning(f"Connection error fetching client list for pokes: {e}")
-                self.worker_conn = None
-            else:
-                logger.error(f"Error fetching client list for pokes: {e}")
-            return
-        
-        # Build UID to CLID mapping for online users
+        # Resolve online targets through the event-maintained uid -> clid index
+        # (one dict lookup per target instead of a clientlist query and scan)
         uid_to_clid = {}
-        for client in clients:
-            client_uid = client.get('client_unique_identifier', '')
-            if client_uid:
-                uid_to_clid[client_uid] = {
-                    'clid': client.get('clid'),
-                    'nickname': client.get('client_nickname', 'Unknown')
-                }
+        for poke_item in self.pending_pokes:
+            for target_uid in poke_item['target_uids']:
+                clid = self.clid_by_uid.get(target_uid)
+                if clid is not None and target_uid not in uid_to_clid:
+                    info = self.client_map.get(clid)
+                    uid_to_clid[target_uid] = {
+                        'clid': clid,
+                        'nickname': info.nickname if info else 'Unknown'
+                    }
         
         # Process each pending poke
         pokes_to_keep = deque()
@@ -1307,7 +1794,7 @@ class TS3Bot:
             if age_minutes > 20:
                 # Drop pokes older than 20 minutes
                 dropped_old += 1
-                logger.debug(f"Dropped old delta exp poke (age: {age_minutes:.1f}m) for {len(target_uids)} users")
+                logger.debug("Dropped old delta exp poke (age: %.1fm) for %s users", age_minutes, len(target_uids))
                 continue
             
             # Split message into chunks if needed
@@ -1317,37 +1804,41 @@ class TS3Bot:
             successfully_poked = set()
             connection_broken = False
             
-            for target_uid in target_uids:
-                if target_uid not in uid_to_clid:
-                    # User not online, keep in queue
-                    continue
-                
-                clid = uid_to_clid[target_uid]['clid']
-                nickname = uid_to_clid[target_uid]['nickname']
-                
-                try:
-                    # Send all chunks to this user
-                    for chunk in message_chunks:
-                        poke_start = time.perf_counter()
-                        msg=chunk if chunk.startswith("\n") else "\n"+chunk
-                        self.worker_conn.clientpoke(clid=clid, msg=msg)
-                        poke_time = (time.perf_counter() - poke_start) * 1000
-                        logger.debug(f"⏱️ Clientpoke: {poke_time:.2f}ms")
-                    
-                    successfully_poked.add(target_uid)
-                    total_sent += 1
-                    logger.debug(f"Poked {nickname} with pending message ({len(message_chunks)} chunk(s))")
-                except Exception as e:
-                    error_str = str(e).lower()
-                    if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
-                        logger.warning(f"Connection error while poking {nickname}: {e}")
-                        self.worker_conn = None
-                        connection_broken = True
-                        break  # Stop trying if connection is broken
+            # Online targets get every chunk, all pipelined in one round-trip
+            online_uids = [uid for uid in target_uids if uid in uid_to_clid]  # Offline users stay queued
+            formatted_chunks = [chunk if chunk.startswith("\n") else "\n" + chunk for chunk in message_chunks]
+            lines = [
+                self.worker_conn.query("clientpoke", clid=uid_to_clid[uid]['clid'], msg=msg).compile().encode()
+                for uid in online_uids
+                for msg in formatted_chunks
+            ]
+            
+            try:
+                poke_start = time.perf_counter()
+                errors = self._exec_pipelined(self.worker_conn, lines) if lines else []
+                poke_time = (time.perf_counter() - poke_start) * 1000
+                logger.debug("⏱️ Clientpoke x%s (pipelined): %.2fms", len(lines), poke_time)
+            except Exception as e:
+                if _is_conn_error(e):
+                    logger.warning(f"Connection error while poking {len(online_uids)} users: {e}")
+                    self._drop_connection('worker_conn')
+                    connection_broken = True
+                else:
+                    logger.error(f"Failed to send pokes: {e}")
+                errors = None
+            
+            if errors is not None:
+                per_target = len(formatted_chunks)
+                for i, target_uid in enumerate(online_uids):
+                    nickname = uid_to_clid[target_uid]['nickname']
+                    error = next((e for e in errors[i * per_target:(i + 1) * per_target] if e is not None), None)
+                    if error is None:
+                        total_sent += 1
+                        logger.debug("Poked %s with pending message (%s chunk(s))", nickname, len(message_chunks))
                     else:
-                        logger.error(f"Failed to poke {nickname}: {e}")
-                        # Still mark as successfully processed to avoid infinite retries
-                        successfully_poked.add(target_uid)
+                        logger.error(f"Failed to poke {nickname}: {error}")
+                    # Failed pokes are still marked processed to avoid infinite retries
+                    successfully_poked.add(target_uid)
             
             # Update target UIDs by removing successfully poked users
             remaining_uids = target_uids - successfully_poked
@@ -1358,10 +1849,10 @@ class TS3Bot:
             if remaining_uids and age_minutes < 20:  # Keep for up to 20 minutes
                 poke_item['target_uids'] = remaining_uids
                 pokes_to_keep.append(poke_item)
-                logger.debug(f"Poke message kept in queue for {len(remaining_uids)} remaining targets")
+                logger.debug("Poke message kept in queue for %s remaining targets", len(remaining_uids))
             elif age_minutes >= 20:
                 dropped_old += 1
-                logger.debug(f"Dropped old delta exp poke (age: {age_minutes:.1f}m) for {len(remaining_uids)} users")
+                logger.debug("Dropped old delta exp poke (age: %.1fm) for %s users", age_minutes, len(remaining_uids))
             
             # If connection broke, keep all remaining pokes and stop processing
             if connection_broken:
@@ -1390,573 +1881,744 @@ class TS3Bot:
     def _update_client_map(self, clid: str, data: dict):
         """Update client map with new data."""
         try:
-            if clid not in self.client_map:
-                self.client_map[clid] = {'nickname': '', 'uid': '', 'ip': ''}
-            
-            # Update available fields
-            if 'client_nickname' in data:
-                self.client_map[clid]['nickname'] = data['client_nickname']
-            if 'client_unique_identifier' in data:
-                self.client_map[clid]['uid'] = data['client_unique_identifier']
-            if 'connection_client_ip' in data:
-                self.client_map[clid]['ip'] = data['connection_client_ip']
-            
-            # Also update reference manager
-            if self.reference_manager:
-                client_data = [{
+            # One lookup on the hot path; only allocate for a new clid
+            info = self.client_map.get(clid)
+            if info is None:
+                info = self.client_map[clid] = ClientInfo()
+            
+            # Update available fields, noting whether anything actually changed
+            changed = False
+            nickname = data.get('client_nickname')
+            if nickname is not None:
+                if nickname != info.nickname:
+                    changed = True
+                    info.nickname = nickname
+                # Keep the x3tBot clid index in sync (joins and renames)
+                if XBOT_NICKNAME in nickname:
+                    self._xbot_clid = clid
+                elif clid == self._xbot_clid:
+                    self._xbot_clid = None
+            uid = data.get('client_unique_identifier')
+            if uid is not None:
+                if uid != info.uid:
+                    changed = True
+                    info.uid = uid
+                if uid:
+                    self.clid_by_uid[uid] = clid
+            ip = data.get('connection_client_ip')
+            if ip is not None and ip != info.ip:
+                changed = True
+                info.ip = ip
+            
+            # Also update reference manager - most clientupdated events only carry
+            # status flags (mute, away...), which don't touch the reference data.
+            # Only the in-memory map is updated here; the CSV rewrite is coalesced
+            # by the manager's short flush timer (and the periodic reference update).
+            if changed and self.reference_manager:
+                self.reference_manager.add_client({
                     'clid': clid,
-                    'client_nickname': self.client_map[clid]['nickname'],
-                    'client_unique_identifier': self.client_map[clid]['uid'],
-                    'connection_client_ip': self.client_map[clid]['ip']
-                }]
-                self.reference_manager.update_clients(client_data)
+                    'client_nickname': info.nickname,
+                    'client_unique_identifier': info.uid,
+                    'connection_client_ip': info.ip
+                })
                 
         except Exception as e:
             logger.error(f"Error updating client map: {e}")
     
-    def _get_client_info(self, clid: str) -> dict:
-        """Get client info from map, return empty dict if not found."""
-        return self.client_map.get(clid, {'nickname': '', 'uid': '', 'ip': ''})
+    def _get_client_info(self, clid: str) -> ClientInfo:
+        """Get client info from map, return an empty ClientInfo if not found."""
+        return self.client_map.get(clid, _EMPTY_CLIENT)
     
     @timed
     def _log_activity(self, event_type: str, clid: str, details: dict):
         """Log activity to CSV."""
         try:
+            # One clock read per event, so both logs carry the same time
+            now = datetime.now()
+            
             # Log to old format (backward compatibility)
             if self.activity_logger:
                 client_info = self._get_client_info(clid)
-                self.activity_logger.log_event(event_type, clid, client_info, details)
+                self.activity_logger.log_event(event_type, clid, client_info, details, now)
             
             # Log to new human-readable format
             if self.human_readable_logger:
-                self.human_readable_logger.log_event(clid, event_type, details)
+                self.human_readable_logger.log_event(clid, event_type, details, now)
             
         except Exception as e:
             logger.error(f"Error logging activity: {e}")
     
+    def _on_client_enter(self, clid: str, event_data: dict):
+        """Client connected."""
+        self._invalidate_clientlist_cache()
+        self._update_client_map(clid, event_data)
+        self._log_activity('cliententerview', clid, event_data)
+        logger.debug("Client entered: %s", event_data.get('client_nickname', 'unknown'))
+    
+    def _on_client_left(self, clid: str, event_data: dict):
+        """Client disconnected."""
+        self._invalidate_clientlist_cache()
+        if clid == self._xbot_clid:
+            self._xbot_clid = None
+        info = self.client_map.get(clid)
+        if info is not None and self.clid_by_uid.get(info.uid) == clid:
+            self.clid_by_uid.pop(info.uid, None)
+        self._log_activity('clientleftview', clid, event_data)
+        logger.debug("Client left: clid=%s", clid)
+        # Don't remove from map - keep for historical reference
+    
+    def _on_client_moved(self, clid: str, event_data: dict):
+        """Client moved channels."""
+        self._invalidate_clientlist_cache()
+        self._log_activity('clientmoved', clid, event_data)
+        logger.debug("Client moved: clid=%s from %s to %s", clid, event_data.get('cfid'), event_data.get('ctid'))
+        
+        source_channel = str(event_data.get('cfid', ''))
+        target_channel = str(event_data.get('ctid', ''))
+        
+        # Queue check if moved FROM a monitored PKC channel (cancel pending kick)
+        self.command_queue.put({
+            'type': 'pkc_check_cancel_kick',
+            'clid': clid,
+            'source_channel': source_channel
+        })
+        
+        # Queue check if moved TO a monitored PKC channel (warn user)
+        self.command_queue.put({
+            'type': 'pkc_check_warn_user',
+            'clid': clid,
+            'target_channel': target_channel
+        })
+    
+    def _on_client_updated(self, clid: str, event_data: dict):
+        """Client updated - only log if nickname or mute status changed."""
+        if not _LOGGED_UPDATE_KEYS.isdisjoint(event_data):
+            old_info = self.client_map.get(clid)
+            old_nickname = old_info.nickname if old_info else ''
+            self._update_client_map(clid, event_data)
+            
+            # Add old nickname to details for comparison
+            if 'client_nickname' in event_data:
+                event_data['old_nickname'] = old_nickname
+            
+            self._log_activity('clientupdated', clid, event_data)
+            logger.debug("Client updated: clid=%s", clid)
+    
+    # Event type -> handler. Anything not listed (channel edits etc.) is ignored.
+    _EVENT_HANDLERS = {
+        'notifycliententerview': _on_client_enter,
+        'notifyclientleftview': _on_client_left,
+        'notifyclientmoved': _on_client_moved,
+        'notifyclientupdated': _on_client_updated,
+    }
+    
     @timed
     def _handle_event(self, event_type: str, event_data: dict):
         """Route events to appropriate handlers."""
+        handler = self._EVENT_HANDLERS.get(event_type)
+        if handler is None:
+            return
         try:
-            # Extract clid from event data
-            clid = event_data.get('clid', '')
-            
-            # Handle different event types
-            if event_type == 'notifycliententerview':
-                # Client connected
-                self._update_client_map(clid, event_data)
-                self._log_activity('cliententerview', clid, event_data)
-                logger.debug(f"Client entered: {event_data.get('client_nickname', 'unknown')}")
-                
-            elif event_type == 'notifyclientleftview':
-                # Client disconnected
-                self._log_activity('clientleftview', clid, event_data)
-                logger.debug(f"Client left: clid={clid}")
-                # Don't remove from map - keep for historical reference
-                
-            elif event_type == 'notifyclientmoved':
-                # Client moved channels
-                self._log_activity('clientmoved', clid, event_data)
-                logger.debug(f"Client moved: clid={clid} from {event_data.get('cfid')} to {event_data.get('ctid')}")
-                
-                source_channel = str(event_data.get('cfid', ''))
-                target_channel = str(event_data.get('ctid', ''))
-                
-                # Queue check if moved FROM a monitored PKC channel (cancel pending kick)
-                self.command_queue.put({
-                    'type': 'pkc_check_cancel_kick',
-                    'clid': clid,
-                    'source_channel': source_channel
-                })
-                
-                # Queue check if moved TO a monitored PKC channel (warn user)
-                self.command_queue.put({
-                    'type': 'pkc_check_warn_user',
-                    'clid': clid,
-                    'target_channel': target_channel
-                })
-                
-            elif event_type == 'notifyclientupdated':
-                # Client updated - only log if nickname or mute status changed
-                if any(key in event_data for key in ['client_nickname', 'client_input_muted', 'client_output_muted']):
-                    old_nickname = self.client_map.get(clid, {}).get('nickname', '')
-                    self._update_client_map(clid, event_data)
-                    
-                    # Add old nickname to details for comparison
-                    if 'client_nickname' in event_data:
-                        event_data['old_nickname'] = old_nickname
-                    
-                    self._log_activity('clientupdated', clid, event_data)
-                    logger.debug(f"Client updated: clid={clid}")
-                
-            # Ignore channel edits and other events
-            elif event_type in ['notifychanneledited', 'notifychanneldescriptionchanged']:
-                pass  # Explicitly ignore
-                
+            handler(self, event_data.get('clid', ''), event_data)
         except Exception as e:
             logger.error(f"Error handling event {event_type}: {e}")
 
+    def _has_buffered_input(self, conn):
+        """Check if the ts3/telnet layers already hold received data for conn.
+        
+        Such data won't make the socket readable again, so it must be consumed
+        before waiting on the selector. Neither layer exposes this publicly:
+        this reads ts3's _event_queue and the telnetlib.Telnet buffers behind
+        TS3TelnetTransport, as laid out in ts3 2.0.0b3 (pinned in
+        requirements.txt). If that layout is missing, the reader falls back
+        to polling with the blocking wait_for_event(timeout=...) for the rest
+        of the run.
+        """
+        if self._poll_events_blocking:
+            return True
+        try:
+            if conn._event_queue:
+                return True
+            telnet = conn._transport._conn
+            return bool(telnet.cookedq) or len(telnet.rawq) > telnet.irawq
+        except AttributeError as e:
+            logger.warning(f"Can't inspect ts3 receive buffers ({e}), polling events with wait_for_event instead")
+            self._poll_events_blocking = True
+            return True
 
+    def _dispatch_event(self, event_name, event):
+        """Parse a raw event frame and route each entry to its handler.
+        
+        Runs on the event handler thread, so parsing, CSV logging and queueing
+        never hold up the reader thread.
+        
+        Args:
+            event_name: Event name bytes already peeked by the reader thread
+            event: TS3Event taken off `_raw_events`
+        """
+        if event.parsed:
+            parse_start = time.perf_counter()
+            # The name only prefixes the first pipe-separated entry but applies to all
+            event_type = _EVENT_TYPE_NAMES[event_name]
 
+            for event_data in event.parsed:
+                # Only process commands for text messages
+                if event_type == "notifytextmessage":
+                    msg = event_data.get("msg", "")
+                    clid = event_data.get("invokerid")
+                    nickname = event_data.get("invokername", "")
 
+                    # Ignore messages from x3tBot and from the bot itself
+                    if _IGNORED_NICK_RE.search(nickname) or self.nickname in nickname:
+                        logger.debug("Ignoring message from %s", nickname)
+                    else:
+                        # Enqueue command for worker thread to process
+                        try:
+                            self.command_queue.put((msg, clid, nickname))
+                            logger.debug("Enqueued command from %s: %.20s...", nickname, msg)
+                        except Exception as e:
+                            logger.error("Error enqueueing command: %s", e)
+                else:
+                    # Route all other events to activity logger (errors are logged there)
+                    self._handle_event(event_type, event_data)
 
+            parse_time = (time.perf_counter() - parse_start) * 1000
+            logger.debug("⏱️ Event parsing: %.2fms", parse_time)
+
+    def _event_handler_loop(self):
+        """Event handler thread - drains raw events queued by the reader thread."""
+        logger.info("Event handler thread started")
+        
+        while self._running:
+            try:
+                event_name, event = self._raw_events.get(timeout=1)
+            except Empty:
+                continue
+            
+            try:
+                self._dispatch_event(event_name, event)
+            except Exception as e:
+                logger.error(f"Error dispatching event: {e}", exc_info=True)
+        
+        logger.info("Event handler thread stopped")
 
     def _event_loop(self):
-        """Event handler thread - listens for all events without timeout."""
+        """Event reader thread - waits on the event socket and queues raw events.
+        
+        The thread lives for the whole bot lifetime. When the event connection
+        drops it parks on `_event_ready` until run() installs a new one, instead
+        of exiting and being respawned. Socket readiness is waited on through a
+        selector that also watches `_event_ready`, so shutdown and connection
+        swaps wake the thread directly and an idle server costs no periodic
+        wakeups. Without eventfd it falls back to a short select timeout.
+        """
         logger.info("Event loop thread started")
         
+        selector = selectors.DefaultSelector()
+        selected_conn = None
+        park_timeout = 1.0
+        wake_fd = self._event_ready.fileno()
+        # The timeout is only a safety net when the wake fd is watched too
+        select_timeout = 30.0 if wake_fd is not None else 1.0
         
         while self._running:
             if not self.event_conn or not self.event_conn.is_connected():
-                time.sleep(1)
-                #logger.debug("No event connection, sleeping...")
+                # Park until run() signals a re-established event connection. run()
+                # and shutdown both set the event, so the timeout is only a fallback
+                # check and can back off during long outages.
+                self._event_ready.wait(timeout=park_timeout)
+                park_timeout = min(park_timeout * 2, 30.0)
                 continue
+            park_timeout = 1.0
             
             try:
-                # Wait for events (no timeout - blocking call)
+                conn = self.event_conn
+                if conn is not selected_conn:
+                    # New connection - fresh selector, the old fd may be closed or reused
+                    selector.close()
+                    selector = selectors.DefaultSelector()
+                    selector.register(conn.fileno(), selectors.EVENT_READ)
+                    if wake_fd is not None:
+                        selector.register(wake_fd, selectors.EVENT_READ)
+                    selected_conn = conn
+                
+                if not self._has_buffered_input(conn):
+                    ready = selector.select(timeout=select_timeout)
+                    if not ready:
+                        continue
+                    if any(key.fd == wake_fd for key, _ in ready):
+                        # Woken for shutdown or a new connection - re-check the loop state
+                        self._event_ready.drain()
+                        continue
+                
+                # Data is ready - read it (timeout only guards against a reply with no event)
                 wait_start = time.perf_counter()
-                event = self.event_conn.wait_for_event()
-                wait_time = (time.perf_counter() - wait_start) * 1000
-                logger.debug(f"⏱️ Event wait time: {wait_time:.2f}ms")
+                event = conn.wait_for_event(timeout=1)
+                # Arrival time of the frame, also used by the duplicate check below
+                received_at = time.perf_counter()
+                logger.debug("⏱️ Event wait time: %.2fms", (received_at - wait_start) * 1000)
 
                     
-                if event and event.parsed and event._data and len(event._data) > 0:
-                    parse_start = time.perf_counter()
-                    # Flatten event data by splitting on pipe delimiter
-                    split_data = event._data[0].split(b'|')
-                    
-                    for i in range(len(event.parsed)):
-                        try:
-                            event_type = split_data[i].decode("utf-8").split()[0]
-                        except (AttributeError, IndexError, UnicodeDecodeError) as e:
-                            logger.error(f"Failed to extract event type: {e}, event data: {event._data}")
-                            continue
-                        
-                        event_data = event.parsed[i] if event.parsed else {}
-                        
-                        # Check for duplicate events within 1 second
-                        current_time = time.time()
-                        event_signature = (event_type, str(event_data))
-                        
-                        if (self.last_event == event_signature and 
-                            current_time - self.last_event_timestamp < 1.0):
-                            logger.debug(f"Ignoring duplicate event: {event_type}")
-                            continue
-                        
-                        # Update last event tracking
-                        self.last_event = event_signature
-                        self.last_event_timestamp = current_time
-                        
-                        # Only process commands for text messages
-                        if event_type == "notifytextmessage":
-                            msg = event_data.get("msg", "")
-                            clid = event_data.get("invokerid")
-                            nickname = event_data.get("invokername", "")
-                            
-                            # Ignore messages from x3tBot and from the bot itself
-                            if "x3tBot" in nickname or "x3t" in nickname.lower() or self.nickname in nickname :
-                                logger.debug("Ignoring message from %s", nickname)
-                            else:
-                                # Enqueue command for worker thread to process
-                                try:
-                                    enqueue_start = time.perf_counter()
-                                    self.command_queue.put((msg, clid, nickname))
-                                    enqueue_time = (time.perf_counter() - enqueue_start) * 1000
-                                    logger.debug(f"⏱️ Queue enqueue: {enqueue_time:.2f}ms")
-                                    logger.debug(f"Enqueued command from {nickname}: {msg[:20]}...")
-                                except Exception as e:
-                                    logger.error("Error enqueueing command: %s", e)
-                        else:
-                            # Route all other events to activity logger
-                            try:
-                                self._handle_event(event_type, event_data)
-                            except Exception as e:
-                                logger.error(f"Error handling event {event_type}: {e}")
-                    
-                    parse_time = (time.perf_counter() - parse_start) * 1000
-                    logger.debug(f"⏱️ Event parsing: {parse_time:.2f}ms")
+                if not event or not event._data:
+                    continue
+                
+                # Peek at the event name - event.parsed is built lazily, so
+                # ignored events never get parsed at all
+                event_name = event._data[0].partition(b' ')[0]
+                if event_name not in _HANDLED_EVENTS:
+                    continue
+                # Status-only client updates (away, idle...) would be parsed just to be
+                # discarded by _on_client_updated; drop them here
+                if (event_name == b'notifyclientupdated'
+                        and not any(map(_LOGGED_UPDATE_RE.search, event._data))):
+                    continue
+                
+                # Drop an exact repeat of the previous frame within DUPLICATE_EVENT_WINDOW.
+                # The raw lines are compared as bytes, before any parsing or handoff.
+                if (event._data == self._last_event_frame
+                        and received_at - self._last_event_time < DUPLICATE_EVENT_WINDOW):
+                    logger.debug("Ignoring duplicate event: %s", event_name)
+                    continue
+                self._last_event_frame = event._data
+                self._last_event_time = received_at
+                
+                # Hand the raw frame to the handler thread; parsing and logging happen there
+                self._raw_events.put((event_name, event))
             
             except ts3.query.TS3TimeoutError:
-                # Should not happen without timeout, but handle anyway
+                # Only query replies (e.g. keepalive) were pending, no event
                 pass
             
             except Exception as e:
                 if self._running:  # Only log if we're supposed to be running
-                    error_str = str(e).lower()
                     # Check for connection errors
-                    if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
+                    if _is_conn_error(e):
                         logger.warning(f"Event connection error: {e}")
                         # Mark connection as broken so it gets reconnected
-                        self.event_conn = None
-                        time.sleep(2)
+                        self._drop_connection('event_conn')
+                        self._stop_event.wait(2)
                     else:
                         logger.error(f"Error in event loop: {e}", exc_info=True)
-                        time.sleep(1)
+                        self._stop_event.wait(1)
         
+        selector.close()
         logger.info("Event loop thread stopped")
 
-    def _worker_loop(self):
-        """Worker thread - processes ALL operations from queue using main connection."""
-        logger.info("Worker loop thread started")
+    def _enqueue(self, item):
+        """Put an item on the command queue, skipping idempotent requests already pending.
         
-        while self._running:
+        Args:
+            item: Queue item (command tuple or {'type': ...} dict)
+        
+        Returns:
+            bool: True if the item was queued, False if an identical request was pending
+        """
+        item_type = item.get('type') if isinstance(item, dict) else None
+        if item_type in COALESCE_TYPES:
+            with self._pending_types_lock:
+                if item_type in self._pending_types:
+                    logger.debug("Skipping %s - already pending in queue", item_type)
+                    return False
+                self._pending_types.add(item_type)
+        self.command_queue.put(item)
+        return True
+
+    def _drain_queue(self, max_items=32, timeout=1):
+        """Take a batch of items off the command queue.
+        
+        Blocks for the first item, then grabs whatever else is already queued
+        (up to max_items) without waiting, so bursts are handled in one pass.
+        
+        Args:
+            max_items: Maximum number of items to take in one batch
+            timeout: Seconds to wait for the first item
+        
+        Returns:
+            list: Drained items (empty if the queue stayed empty)
+        """
+        return self.command_queue.drain(max_items, timeout)
+
+    @staticmethod
+    def _coalesce_items(items):
+        """Drop repeated idempotent requests (e.g. several reference_update) from a batch."""
+        coalesced = []
+        seen_types = set()
+        for item in items:
+            if isinstance(item, dict):
+                item_type = item.get('type')
+                if item_type in COALESCE_TYPES:
+                    if item_type in seen_types:
+                        continue
+                    seen_types.add(item_type)
+            coalesced.append(item)
+        return coalesced
+
+    def _process_queue_item(self, item):
+        """Dispatch a single command queue item on the worker connection.
+        
+        The worker loop has already checked worker_conn right before calling
+        this, so handlers don't probe the connection again.
+        """
+        if isinstance(item, dict) and item.get('type') in COALESCE_TYPES:
+            # Processing has started - allow producers to queue this type again
+            with self._pending_types_lock:
+                self._pending_types.discard(item['type'])
+        
+        # Only read the clock when the timing will actually be logged
+        debug_timing = logger.isEnabledFor(logging.DEBUG)
+        if debug_timing:
+            process_start = time.perf_counter()
+        
+        if isinstance(item, tuple) and len(item) == 3:
+            # Command from user: (msg, clid, nickname)
+            msg, clid, nickname = item
+            logger.debug("Processing command from %s: %s...", nickname, msg[:20])
+            
+            # Track command in history (except !history itself)
+            if msg.startswith('!') and not msg.startswith('!history'):
+                timestamp = datetime.now().strftime('%d/%m/%Y %H:%M')
+                self.command_history.append((timestamp, nickname, msg))
+            
+            cmd_start = time.perf_counter()
+            response = process_command(self, msg, nickname, clid)
+            cmd_time = (time.perf_counter() - cmd_start) * 1000
+            logger.debug("⏱️ Command processing: %.2fms", cmd_time)
+            
             try:
-                # Get item from queue (blocking with timeout)
+                send_start = time.perf_counter()
+                # Split response if longer than 4096 characters
+                response_chunks = self._split_poke_message(response, max_length=4096)
+                self._send_text_chunks(self.worker_conn, clid, response_chunks)
+                send_time = (time.perf_counter() - send_start) * 1000
+                logger.debug("⏱️ Send response: %.2fms", send_time)
+                logger.debug("Sent response to %s (%s chunk(s))", nickname, len(response_chunks))
+            except Exception as send_error:
+                if _is_conn_error(send_error):
+                    logger.warning(f"Connection error sending response: {send_error}")
+                    self._drop_connection('worker_conn')
+                else:
+                    logger.error(f"Error sending message: {send_error}")
+        
+        elif isinstance(item, dict) and item.get('type') == 'reference_update':
+            # Reference data update request
+            if not self.reference_conn or not self.reference_conn.is_connected():
+                logger.warning("Reference connection not available, skipping reference update")
+            else:
+                # Runs on its own connection, so don't hold up worker_conn items
+                logger.debug("Processing reference data update")
+                self._reference_executor.submit(self._do_reference_update)
+        
+        elif isinstance(item, dict) and item.get('type') == 'send_pokes':
+            # Send pending pokes request
+            logger.debug("Processing pending pokes")
+            self._do_send_pokes()
+        
+        elif isinstance(item, dict) and item.get('type') == 'guild_exp_check':
+            # Guild exp check - fire and forget (don't block worker loop)
+            logger.debug("Processing guild exp check (fire-and-forget)")
+            self._http_executor.submit(self._check_guild_exp)
+        
+        elif isinstance(item, dict) and item.get('type') == 'move_to_djinns':
+            # Move to Djinns channel request
+            logger.debug("Processing channel move to Djinns")
+            self._do_move_to_djinns()
+        
+        elif isinstance(item, dict) and item.get('type') == 'send_message':
+            # Send a delayed message
+            clid = item.get('clid')
+            message = item.get('message')
+            if clid and message:
                 try:
-                    item = self.command_queue.get()
-       
-                except:
-                    # Timeout - no item in queue
-                    continue
-                
-                # Check if main connection is available
-                if not self.worker_conn or not self.worker_conn.is_connected():
-                    logger.warning("Worker connection not available, requeueing item")
-                    self.command_queue.put(item)  # Requeue for later
-                    self.command_queue.task_done()
-                    time.sleep(1)
-                    continue
-                
-                # Process different types of queue items
+                    # Split message if longer than 4096 characters
+                    message_chunks = self._split_poke_message(message, max_length=4096)
+                    self._send_text_chunks(self.worker_conn, clid, [
+                        chunk if chunk.startswith("\n") else "\n" + chunk for chunk in message_chunks
+                    ])
+                    logger.debug("Sent delayed message to client %s (%s chunk(s))", clid, len(message_chunks))
+                except Exception as send_error:
+                    if _is_conn_error(send_error):
+                        logger.warning(f"Connection error sending delayed message: {send_error}")
+                        self._drop_connection('worker_conn')
+                    else:
+                        logger.error(f"Error sending delayed message: {send_error}")
+        
+        elif isinstance(item, dict) and item.get('type') == 'pkc_warn_user':
+            # Warn user they will be kicked if they stay in the channel
+            clid = item.get('clid')
+            channel_id = item.get('channel_id')
+            
+            if clid and channel_id:
                 try:
-                    process_start = time.perf_counter()
-                    
-                    if isinstance(item, tuple) and len(item) == 3:
-                        # Command from user: (msg, clid, nickname)
-                        msg, clid, nickname = item
-                        logger.debug(f"Processing command from {nickname}: {msg[:20]}...")
-                        
-                        # Track command in history (except !history itself)
-                        if msg.startswith('!') and not msg.startswith('!history'):
-                            timestamp = datetime.now().strftime('%d/%m/%Y %H:%M')
-                            self.command_history.append((timestamp, nickname, msg))
-                        
-                        cmd_start = time.perf_counter()
-                        response = process_command(self, msg, nickname, clid)
-                        cmd_time = (time.perf_counter() - cmd_start) * 1000
-                        logger.debug(f"⏱️ Command processing: {cmd_time:.2f}ms")
-                        
-                        try:
-                            send_start = time.perf_counter()
-                            # Split response if longer than 4096 characters
-                            response_chunks = self._split_poke_message(response, max_length=4096)
-                            for chunk in response_chunks:
-                                self.worker_conn.sendtextmessage(targetmode=1, target=clid, msg=chunk)
-                            send_time = (time.perf_counter() - send_start) * 1000
-                            logger.debug(f"⏱️ Send response: {send_time:.2f}ms")
-                            logger.debug(f"Sent response to {nickname} ({len(response_chunks)} chunk(s))")
-                        except Exception as send_error:
-                            error_str = str(send_error).lower()
-                            if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
-                                logger.warning(f"Connection error sending response: {send_error}")
-                                self.worker_conn = None
-                            else:
-                                logger.error(f"Error sending message: {send_error}")
+                    # Calculate kick time (30 seconds from now)
+                    kick_time = time.time() + 30
+                    kick_datetime = datetime.fromtimestamp(kick_time).strftime('%H:%M')
                     
-                    elif isinstance(item, dict) and item.get('type') == 'reference_update':
-                        # Reference data update request
-                        if not self.reference_conn or not self.reference_conn.is_connected():
-                            logger.warning("Reference connection not available, skipping reference update")
-                        else:
-                            logger.debug("Processing reference data update")
-                            self._do_reference_update()
+                    # Store in pending kicks (no lock needed - only worker thread modifies this)
+                    self.pending_pkc_kicks[clid] = {
+                        'channel_id': channel_id,
+                        'scheduled_time': kick_time
+                    }
                     
-                    elif isinstance(item, dict) and item.get('type') == 'send_pokes':
-                        # Send pending pokes request
-                        if not self.worker_conn or not self.worker_conn.is_connected():
-                            logger.warning("Worker connection not available, requeueing poke sending")
-                            self.command_queue.put(item)  # Requeue for later
-                        else:
-                            logger.debug("Processing pending pokes")
-                            self._do_send_pokes()
+                    # Get nickname from client_map
+                    info = self.client_map.get(clid)
+                    nickname = info.nickname if info else 'Unknown'
                     
-                    elif isinstance(item, dict) and item.get('type') == 'guild_exp_check':
-                        # Guild exp check - fire and forget (don't block worker loop)
-                        logger.debug("Processing guild exp check (fire-and-forget)")
-                        threading.Thread(target=self._check_guild_exp, daemon=True).start()
+                    # Poke user with warning
+                    warning_msg = f"\n[b][color=#FF4500]⚠️ WARNING ⚠️[/color][/b]\n[color=#FFD700]You will be kicked from server in 30s (at {kick_datetime}) if you stay in this channel[/color]"
+                    self.worker_conn.clientpoke(clid=clid, msg=warning_msg)
+                    logger.info(f"PKC: Warned client {clid} ({nickname}) in channel {channel_id}, kick scheduled at {kick_datetime}")
                     
-                    elif isinstance(item, dict) and item.get('type') == 'move_to_djinns':
-                        # Move to Djinns channel request
-                        if not self.worker_conn or not self.worker_conn.is_connected():
-                            logger.warning("Worker connection not available, skipping channel move")
-                        else:
-                            logger.debug("Processing channel move to Djinns")
-                            self._do_move_to_djinns()
-                    
-                    elif isinstance(item, dict) and item.get('type') == 'send_message':
-                        # Send a delayed message
-                        clid = item.get('clid')
-                        message = item.get('message')
-                        if clid and message:
-                            try:
-                                # Split message if longer than 4096 characters
-                                message_chunks = self._split_poke_message(message, max_length=4096)
-                                for chunk in message_chunks:
-                                    self.worker_conn.sendtextmessage(targetmode=1, target=clid, msg="\n" + chunk if not chunk.startswith("\n") else chunk)
-                                logger.debug(f"Sent delayed message to client {clid} ({len(message_chunks)} chunk(s))")
-                            except Exception as send_error:
-                                error_str = str(send_error).lower()
-                                if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
-                                    logger.warning(f"Connection error sending delayed message: {send_error}")
-                                    self.worker_conn = None
-                                else:
-                                    logger.error(f"Error sending delayed message: {send_error}")
+                    # Immediately queue the kick check (no timer thread needed)
+                    self.command_queue.put({
+                        'type': 'pkc_check_and_kick',
+                        'clid': clid,
+                        'channel_id': channel_id
+                    })
                     
-                    elif isinstance(item, dict) and item.get('type') == 'pkc_warn_user':
-                        # Warn user they will be kicked if they stay in the channel
-                        clid = item.get('clid')
-                        channel_id = item.get('channel_id')
+                except Exception as warn_error:
+                    if _is_conn_error(warn_error):
+                        logger.warning(f"Connection error warning client: {warn_error}")
+                        self._drop_connection('worker_conn')
+                    else:
+                        logger.error(f"Error warning client {clid}: {warn_error}")
+        
+        elif isinstance(item, dict) and item.get('type') == 'pkc_check_and_kick':
+            # Check if 30s has passed, if not requeue, if yes check and kick
+            clid = item.get('clid')
+            channel_id = item.get('channel_id')
+            
+            if clid and channel_id:
+                try:
+                    # Check if still in pending kicks (not cancelled)
+                    if clid not in self.pending_pkc_kicks:
+                        logger.debug("PKC: Kick cancelled for client %s (no longer pending)", clid)
+                    elif self.pending_pkc_kicks[clid]['channel_id'] != channel_id:
+                        logger.debug("PKC: Kick cancelled for client %s (channel mismatch)", clid)
+                    else:
+                        # Check if 30 seconds has passed
+                        scheduled_time = self.pending_pkc_kicks[clid]['scheduled_time']
+                        current_time = time.time()
                         
-                        if clid and channel_id:
-                            try:
-                                # Calculate kick time (30 seconds from now)
-                                kick_time = time.time() + 30
-                                kick_datetime = datetime.fromtimestamp(kick_time).strftime('%H:%M')
-                                
-                                # Store in pending kicks (no lock needed - only worker thread modifies this)
-                                self.pending_pkc_kicks[clid] = {
-                                    'channel_id': channel_id,
-                                    'scheduled_time': kick_time
-                                }
-                                
-                                # Get nickname from client_map
-                                nickname = self.client_map.get(clid, {}).get('nickname', 'Unknown')
-                                
-                                # Poke user with warning
-                                warning_msg = f"\n[b][color=#FF4500]⚠️ WARNING ⚠️[/color][/b]\n[color=#FFD700]You will be kicked from server in 30s (at {kick_datetime}) if you stay in this channel[/color]"
-                                self.worker_conn.clientpoke(clid=clid, msg=warning_msg)
-                                logger.info(f"PKC: Warned client {clid} ({nickname}) in channel {channel_id}, kick scheduled at {kick_datetime}")
-                                
-                                # Immediately queue the kick check (no timer thread needed)
-                                self.command_queue.put({
-                                    'type': 'pkc_check_and_kick',
-                                    'clid': clid,
-                                    'channel_id': channel_id
-                                })
+                        if current_time < scheduled_time:
+                            # Not time yet, requeue for later check
+                            time_remaining = scheduled_time - current_time
+                            logger.debug("PKC: Not time yet for client %s, requeuing (remaining: %.1fs)", clid, time_remaining)
+                            # Requeue without sleep to avoid blocking worker thread
+                            self.command_queue.put({
+                                'type': 'pkc_check_and_kick',
+                                'clid': clid,
+                                'channel_id': channel_id
+                            })
+                        else:
+                            # Time has passed, verify PKC is still active before kicking
+                            if channel_id not in self.active_pkc_channels:
+                                logger.debug("PKC: Kick cancelled for client %s - PKC no longer active for channel %s", clid, channel_id)
+                                # Remove from pending kicks
+                                if clid in self.pending_pkc_kicks:
+                                    del self.pending_pkc_kicks[clid]
+                            else:
+                                # PKC still active, check if user still in channel and kick
+                                # Query a fresh clientlist (never the cache) to verify the user
+                                # is still in the channel - a stale one would kick them elsewhere
+                                channel_clids = self._cached_channel_clids(self.worker_conn, ttl=0)
+                                user_in_channel = str(clid) in channel_clids.get(str(channel_id), ())
                                 
-                            except Exception as warn_error:
-                                error_str = str(warn_error).lower()
-                                if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
-                                    logger.warning(f"Connection error warning client: {warn_error}")
-                                    self.worker_conn = None
-                                else:
-                                    logger.error(f"Error warning client {clid}: {warn_error}")
-                    
-                    elif isinstance(item, dict) and item.get('type') == 'pkc_check_and_kick':
-                        # Check if 30s has passed, if not requeue, if yes check and kick
-                        clid = item.get('clid')
-                        channel_id = item.get('channel_id')
-                        
-                        if clid and channel_id:
-                            try:
-                                # Check if still in pending kicks (not cancelled)
-                                if clid not in self.pending_pkc_kicks:
-                                    logger.debug(f"PKC: Kick cancelled for client {clid} (no longer pending)")
-                                elif self.pending_pkc_kicks[clid]['channel_id'] != channel_id:
-                                    logger.debug(f"PKC: Kick cancelled for client {clid} (channel mismatch)")
-                                else:
-                                    # Check if 30 seconds has passed
-                                    scheduled_time = self.pending_pkc_kicks[clid]['scheduled_time']
-                                    current_time = time.time()
+                                if user_in_channel:
+                                    # User is still in the channel, kick them
+                                    info = self.client_map.get(clid)
+                                    nickname = info.nickname if info else 'Unknown'
                                     
-                                    if current_time < scheduled_time:
-                                        # Not time yet, requeue for later check
-                                        time_remaining = scheduled_time - current_time
-                                        logger.debug(f"PKC: Not time yet for client {clid}, requeuing (remaining: {time_remaining:.1f}s)")
-                                        # Requeue without sleep to avoid blocking worker thread
-                                        self.command_queue.put({
-                                            'type': 'pkc_check_and_kick',
-                                            'clid': clid,
-                                            'channel_id': channel_id
-                                        })
-                                    else:
-                                        # Time has passed, verify PKC is still active before kicking
-                                        if channel_id not in self.active_pkc_channels:
-                                            logger.debug(f"PKC: Kick cancelled for client {clid} - PKC no longer active for channel {channel_id}")
-                                            # Remove from pending kicks
-                                            if clid in self.pending_pkc_kicks:
-                                                del self.pending_pkc_kicks[clid]
-                                        else:
-                                            # PKC still active, check if user still in channel and kick
-                                            # Get current clientlist to verify user is still in the channel
-                                            clients = self.worker_conn.clientlist().parsed
-                                            user_in_channel = False
-                                            
-                                            for client in clients:
-                                                if str(client.get('clid', '')) == str(clid):
-                                                    if str(client.get('cid', '')) == str(channel_id):
-                                                        user_in_channel = True
-                                                        break
+                                    # Calculate remaining time for kick reason
+                                    end_time = self.active_pkc_channels[channel_id]['end_time']
+                                    remaining_seconds = max(0, int(end_time - time.time()))
+                                    remaining_minutes = remaining_seconds // 60
+                                    remaining_secs = remaining_seconds % 60
+                                    kick_reason = f"Channel lock for {remaining_minutes}:{remaining_secs:02d} minutes"
+                                    
+                                    # Kick the user
+                                    self.worker_conn.clientkick(reasonid=5, clid=clid, reasonmsg=kick_reason)
+                                    logger.info(f"PKC: Kicked client {clid} ({nickname}) from channel {channel_id}: {kick_reason}")
+                                    
+                                    # Log to pkc.csv
+                                    try:
+                                        pkc_log_path = PKC_LOG_PATH
+                                        
+                                        file_exists = os.path.exists(pkc_log_path)
+                                        
+                                        with open(pkc_log_path, 'a', newline='', encoding='utf-8') as f:
+                                            fieldnames = ['datetime', 'channel_id', 'clid', 'nickname']
+                                            writer = csv.DictWriter(f, fieldnames=fieldnames)
                                             
-                                            if user_in_channel:
-                                                # User is still in the channel, kick them
-                                                nickname = self.client_map.get(clid, {}).get('nickname', 'Unknown')
-                                                
-                                                # Calculate remaining time for kick reason
-                                                end_time = self.active_pkc_channels[channel_id]['end_time']
-                                                remaining_seconds = max(0, int(end_time - time.time()))
-                                                remaining_minutes = remaining_seconds // 60
-                                                remaining_secs = remaining_seconds % 60
-                                                kick_reason = f"Channel lock for {remaining_minutes}:{remaining_secs:02d} minutes"
-                                                
-                                                # Kick the user
-                                                self.worker_conn.clientkick(reasonid=5, clid=clid, reasonmsg=kick_reason)
-                                                logger.info(f"PKC: Kicked client {clid} ({nickname}) from channel {channel_id}: {kick_reason}")
-                                                
-                                                # Log to pkc.csv
-                                                try:
-                                                    log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                                                    pkc_log_path = os.path.join(log_dir, 'pkc.csv')
-                                                    
-                                                    file_exists = os.path.exists(pkc_log_path)
-                                                    
-                                                    with open(pkc_log_path, 'a', newline='', encoding='utf-8') as f:
-                                                        fieldnames = ['datetime', 'channel_id', 'clid', 'nickname']
-                                                        writer = csv.DictWriter(f, fieldnames=fieldnames)
-                                                        
-                                                        if not file_exists:
-                                                            writer.writeheader()
-                                                        
-                                                        writer.writerow({
-                                                            'datetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                                            'channel_id': channel_id,
-                                                            'clid': clid,
-                                                            'nickname': nickname
-                                                        })
-                                                    
-                                                    logger.debug(f"PKC: Logged event kick to pkc.csv")
-                                                except Exception as log_error:
-                                                    logger.error(f"Error logging PKC kick to CSV: {log_error}")
-                                            else:
-                                                logger.debug(f"PKC: Client {clid} no longer in channel {channel_id}, kick cancelled")
+                                            if not file_exists:
+                                                writer.writeheader()
                                             
-                                            # Remove from pending kicks
-                                            if clid in self.pending_pkc_kicks:
-                                                del self.pending_pkc_kicks[clid]
-                                
-                            except Exception as kick_error:
-                                error_str = str(kick_error).lower()
-                                if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
-                                    logger.warning(f"Connection error checking/kicking client: {kick_error}")
-                                    self.worker_conn = None
+                                            writer.writerow({
+                                                'datetime': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                                'channel_id': channel_id,
+                                                'clid': clid,
+                                                'nickname': nickname
+                                            })
+                                        
+                                        logger.debug("PKC: Logged event kick to pkc.csv")
+                                    except Exception as log_error:
+                                        logger.error(f"Error logging PKC kick to CSV: {log_error}")
                                 else:
-                                    logger.error(f"Error checking/kicking client {clid}: {kick_error}")
-                    
-                    elif isinstance(item, dict) and item.get('type') == 'pkc_check_cancel_kick':
-                        # Check if source channel is monitored and cancel pending kick
-                        clid = item.get('clid')
-                        source_channel = item.get('source_channel')
-                        
-                        if clid and source_channel:
-                            # Check if source channel is monitored (no lock needed - only worker thread accesses this)
-                            if source_channel in self.active_pkc_channels:
-                                # User left a monitored channel, cancel pending kick
+                                    logger.debug("PKC: Client %s no longer in channel %s, kick cancelled", clid, channel_id)
+                                
+                                # Remove from pending kicks
                                 if clid in self.pending_pkc_kicks:
-                                    channel_id = self.pending_pkc_kicks[clid]['channel_id']
                                     del self.pending_pkc_kicks[clid]
-                                    logger.debug(f"PKC: Cancelled pending kick for client {clid} leaving monitored channel {channel_id}")
                     
-                    elif isinstance(item, dict) and item.get('type') == 'pkc_check_warn_user':
-                        # Check if target channel is monitored and warn user
-                        clid = item.get('clid')
-                        target_channel = item.get('target_channel')
-                        
-                        if clid and target_channel:
-                            # Check if target channel is monitored (no lock needed - only worker thread accesses this)
-                            if target_channel in self.active_pkc_channels:
-                                # User entered a monitored channel, warn them
-                                self.command_queue.put({
-                                    'type': 'pkc_warn_user',
-                                    'clid': clid,
-                                    'channel_id': target_channel
-                                })
-                                logger.debug(f"PKC: Queued warning for client {clid} entering monitored channel {target_channel}")
-                    
-                    elif isinstance(item, dict) and item.get('type') == 'pkc_warn_initial_users':
-                        # Get all users in a channel and warn them
-                        channel_id = item.get('channel_id')
-                        
-                        if channel_id:
-                            try:
-                                # Get all clients in the channel
-                                clients = self.worker_conn.clientlist().parsed
-                                users_in_channel = []
-                                
-                                for client in clients:
-                                    # Check if client is in the target channel
-                                    if str(client.get('cid', '')) != str(channel_id):
-                                        continue
-                                    
-                                    # Skip bot itself (ServerQuery client)
-                                    client_type = client.get('client_type', '')
-                                    if client_type == '1':
-                                        continue
-                                    
-                                    clid = client.get('clid', '')
-                                    if clid:
-                                        users_in_channel.append(clid)
-                                
-                                # Queue warnings for all users in the channel
-                                if users_in_channel:
-                                    logger.info(f"PKC: Warning {len(users_in_channel)} users currently in channel {channel_id}")
-                                    for clid in users_in_channel:
-                                        self.command_queue.put({
-                                            'type': 'pkc_warn_user',
-                                            'clid': clid,
-                                            'channel_id': channel_id
-                                        })
-                                else:
-                                    logger.info(f"PKC: No users in channel {channel_id} at start")
-                                    
-                            except Exception as e:
-                                logger.error(f"PKC: Error warning initial users in channel {channel_id}: {e}")
-                    
-                    elif isinstance(item, dict) and item.get('type') == 'pkc_cleanup_channel':
-                        # Remove channel from active monitoring
-                        channel_id = item.get('channel_id')
-                        thread_id = item.get('thread_id')
-                        
-                        if channel_id:
-                            # Remove channel (no lock needed - only worker thread accesses this)
-                            if channel_id in self.active_pkc_channels:
-                                del self.active_pkc_channels[channel_id]
-                                logger.debug(f"PKC {thread_id}: Channel {channel_id} removed from active monitoring")
-                    
-                    elif isinstance(item, dict) and item.get('type') == 'pkc_cancel_all':
-                        # Cancel all active PKC channels
-                        if self.active_pkc_channels:
-                            cancelled_channels = list(self.active_pkc_channels.keys())
-                            cancelled_count = len(cancelled_channels)
-                            
-                            # Clear all active channels (threads will stop when they check active_pkc_channels)
-                            self.active_pkc_channels.clear()
-                            
-                            channels_str = ", ".join(cancelled_channels)
-                            logger.info(f"PKC: Cancelled {cancelled_count} channel lock(s): {channels_str}")
-                    
-                    elif isinstance(item, dict) and item.get('type') == 'masspoke':
-                        # Execute masspoke operation
-                        message = item.get('message')
-                        if message:
-                            if not self.worker_conn or not self.worker_conn.is_connected():
-                                logger.warning("Worker connection not available, requeueing masspoke")
-                                self.command_queue.put(item)  # Requeue for later
-                            else:
-                                logger.debug("Processing masspoke operation")
-                                self._do_masspoke(message)
+                except Exception as kick_error:
+                    if _is_conn_error(kick_error):
+                        logger.warning(f"Connection error checking/kicking client: {kick_error}")
+                        self._drop_connection('worker_conn')
+                    else:
+                        logger.error(f"Error checking/kicking client {clid}: {kick_error}")
+        
+        elif isinstance(item, dict) and item.get('type') == 'pkc_check_cancel_kick':
+            # Check if source channel is monitored and cancel pending kick
+            clid = item.get('clid')
+            source_channel = item.get('source_channel')
+            
+            if clid and source_channel:
+                # Check if source channel is monitored (no lock needed - only worker thread accesses this)
+                if source_channel in self.active_pkc_channels:
+                    # User left a monitored channel, cancel pending kick
+                    if clid in self.pending_pkc_kicks:
+                        channel_id = self.pending_pkc_kicks[clid]['channel_id']
+                        del self.pending_pkc_kicks[clid]
+                        logger.debug("PKC: Cancelled pending kick for client %s leaving monitored channel %s", clid, channel_id)
+        
+        elif isinstance(item, dict) and item.get('type') == 'pkc_check_warn_user':
+            # Check if target channel is monitored and warn user
+            clid = item.get('clid')
+            target_channel = item.get('target_channel')
+            
+            if clid and target_channel:
+                # Check if target channel is monitored (no lock needed - only worker thread accesses this)
+                if target_channel in self.active_pkc_channels:
+                    # User entered a monitored channel, warn them
+                    self.command_queue.put({
+                        'type': 'pkc_warn_user',
+                        'clid': clid,
+                        'channel_id': target_channel
+                    })
+                    logger.debug("PKC: Queued warning for client %s entering monitored channel %s", clid, target_channel)
+        
+        elif isinstance(item, dict) and item.get('type') == 'pkc_warn_initial_users':
+            # Get all users in a channel and warn them
+            channel_id = item.get('channel_id')
+            
+            if channel_id:
+                try:
+                    # Clients in the channel (the bot itself is already excluded)
+                    users_in_channel = self._cached_channel_clids(self.worker_conn).get(str(channel_id), [])
                     
-                    process_time = (time.perf_counter() - process_start) * 1000
-                    logger.debug(f"⏱️ Total item processing: {process_time:.2f}ms")
+                    # Queue warnings for all users in the channel
+                    if users_in_channel:
+                        logger.info(f"PKC: Warning {len(users_in_channel)} users currently in channel {channel_id}")
+                        for clid in users_in_channel:
+                            self.command_queue.put({
+                                'type': 'pkc_warn_user',
+                                'clid': clid,
+                                'channel_id': channel_id
+                            })
+                    else:
+                        logger.info(f"PKC: No users in channel {channel_id} at start")
                         
                 except Exception as e:
-                    logger.error(f"Error processing queue item: {e}", exc_info=True)
-                finally:
-                    self.command_queue.task_done()
+                    logger.error(f"PKC: Error warning initial users in channel {channel_id}: {e}")
+        
+        elif isinstance(item, dict) and item.get('type') == 'pkc_cleanup_channel':
+            # Remove channel from active monitoring
+            channel_id = item.get('channel_id')
+            thread_id = item.get('thread_id')
+            
+            if channel_id:
+                # Remove channel (no lock needed - only worker thread accesses this)
+                if channel_id in self.active_pkc_channels:
+                    del self.active_pkc_channels[channel_id]
+                    logger.debug("PKC %s: Channel %s removed from active monitoring", thread_id, channel_id)
+        
+        elif isinstance(item, dict) and item.get('type') == 'pkc_cancel_all':
+            # Cancel all active PKC channels
+            if self.active_pkc_channels:
+                cancelled_channels = list(self.active_pkc_channels.keys())
+                cancelled_count = len(cancelled_channels)
+                
+                # Clear all active channels (threads will stop when they check active_pkc_channels)
+                self.active_pkc_channels.clear()
+                
+                channels_str = ", ".join(cancelled_channels)
+                logger.info(f"PKC: Cancelled {cancelled_count} channel lock(s): {channels_str}")
+        
+        elif isinstance(item, dict) and item.get('type') == 'masspoke':
+            # Execute masspoke operation
+            message = item.get('message')
+            if message:
+                logger.debug("Processing masspoke operation")
+                self._do_masspoke(message)
+        
+        if debug_timing:
+            process_time = (time.perf_counter() - process_start) * 1000
+            logger.debug("⏱️ Total item processing: %.2fms", process_time)
+
+    def _worker_loop(self):
+        """Worker thread - processes ALL operations from queue using main connection."""
+        logger.info("Worker loop thread started")
+        
+        # Loop-level failure tracking: back off exponentially and log one summary per minute
+        error_count = 0
+        suppressed_errors = 0
+        last_error_log = 0
+        
+        while self._running:
+            try:
+                # Get a batch of items from the queue (blocking with timeout for the first)
+                items = self._drain_queue()
+                if not items:
+                    continue
+                
+                # Check if main connection is available
+                if not self.worker_conn or not self.worker_conn.is_connected():
+                    logger.warning("Worker connection not available, requeueing %d item(s)", len(items))
+                    self.command_queue.put_front(items)  # Requeue ahead of newer items
+                    if self.worker_conn is not None:
+                        # Closed underneath us - let the main loop reconnect it now
+                        self._drop_connection('worker_conn')
+                    self._stop_event.wait(1)
+                    continue
+                
+                # Process different types of queue items
+                batch = self._coalesce_items(items)
+                for index, item in enumerate(batch):
+                    # Single connection check per item; handlers rely on it
+                    if not self.worker_conn or not self.worker_conn.is_connected():
+                        # Connection dropped mid-batch - requeue the rest, in order, for after reconnect
+                        self.command_queue.put_front(batch[index:])
+                        break
+                    try:
+                        self._process_queue_item(item)
+                    except Exception as e:
+                        logger.error(f"Error processing queue item: {e}", exc_info=True)
+                error_count = 0
                     
             except Exception as e:
+                error_count += 1
                 if self._running:
-                    logger.error(f"Error in worker loop: {e}", exc_info=True)
-                time.sleep(1)
+                    now = time.monotonic()
+                    if now - last_error_log > 60:
+                        if suppressed_errors:
+                            logger.error("Error in worker loop (%d more in the last minute): %s",
+                                         suppressed_errors, e, exc_info=True)
+                        else:
+                            logger.error(f"Error in worker loop: {e}", exc_info=True)
+                        suppressed_errors = 0
+                        last_error_log = now
+                    else:
+                        suppressed_errors += 1
+                self._stop_event.wait(min(30, 0.5 * 2 ** min(error_count, 6)))
         
         logger.info("Worker loop thread stopped")
 
@@ -1964,56 +2626,44 @@ class TS3Bot:
         """Main event loop."""
         logger.info("Starting bot...")
         self._running = True
+        self._init_logging()
         
-        # Create main connection for all operations (through worker queue)
+        # The main connection goes first: it sends the server `connect` and
+        # waits for it, so the others only ever get "already connected"
+        main_conn_error = None
         try:
             self.conn = self.setup_connection()
             logger.info("Main connection established")
         except Exception as e:
             logger.error("Failed to establish main connection: %s", e)
-            self._reconnect(e)
+            main_conn_error = e
         
-        # Create dedicated connection for event loop
-        try:
-            self.event_conn = self.setup_event_connection()
-            logger.info("Event connection established")
-        except Exception as e:
-            logger.error("Failed to establish event connection: %s", e)
+        # Main connection drives the TS client restart logic, so retry it the usual way
+        if main_conn_error is not None:
+            self._reconnect(main_conn_error)
+            if self.conn is None:
+                # Let the main loop retry once any TS client boot wait is over
+                self._schedule_reconnect('conn', self._reconnect_fail_count)
         
-        # Create dedicated connection for worker thread
-        try:
-            self.worker_conn = self.setup_worker_connection()
-            logger.info("Worker connection established")
-        except Exception as e:
-            logger.error("Failed to establish worker connection: %s", e)
-        
-        # Create dedicated connection for reference data loop
-        try:
-            self.reference_conn = self.setup_reference_connection()
-            logger.info("Reference connection established")
-        except Exception as e:
-            logger.error("Failed to establish reference connection: %s", e)
-        
-        logger.info("Setting up event loop thread...")
-        self._event_thread = threading.Thread(target=self._event_loop, daemon=True)
-        self._event_thread.start()
-        logger.info("Event thread started")
-        
-        logger.info("Setting up worker thread...")
-        self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-        self._worker_thread.start()
-        logger.info("Worker thread started")
-        
-        # Start reference data collection thread
-        logger.info("Setting up reference data collection thread...")
-        self._reference_thread = threading.Thread(target=self._reference_data_loop, daemon=True)
-        self._reference_thread.start()
-        logger.info("Reference data collection thread started")
+        # Then open the other three query connections in parallel, so startup
+        # costs the slowest of their handshakes rather than the sum
+        connection_setups = [
+            ('event_conn', "Event", self.setup_event_connection),
+            ('worker_conn', "Worker", self.setup_worker_connection),
+            ('reference_conn', "Reference", self.setup_reference_connection),
+        ]
+        with ThreadPoolExecutor(max_workers=len(connection_setups)) as executor:
+            futures = [(attr, label, executor.submit(setup)) for attr, label, setup in connection_setups]
+            for attr, label, future in futures:
+                try:
+                    setattr(self, attr, future.result())
+                    logger.info("%s connection established", label)
+                except Exception as e:
+                    logger.error("Failed to establish %s connection: %s", label.lower(), e)
         
-        # Start war stats collector thread
-        logger.info("Starting war stats collector...")
-        self.war_stats_collector.start()
-        logger.info("War stats collector started")
+        # Start event, worker and reference data collection threads
+        for name in self._supervised:
+            self._ensure_alive(name)
 
 
 
@@ -2022,11 +2672,6 @@ class TS3Bot:
 
 
 
-        last_conn_reconnect_time = 0
-        last_conn_event_reconnect_time = 0
-        self.last_worker_conn_reconnect_time = 0
-        self.last_reference_conn_reconnect_time = 0
-
         last_keepalive_time = 0
 
 
@@ -2034,96 +2679,120 @@ class TS3Bot:
 
         try:
             while self._running:
+                now = time.time()
+                reconnect_failed = False
+                
                 # Reconnect main connection if needed
-                # Exp backoff: 2,4,8,16,32s based on consecutive failures
-                reconnect_interval = min(2 ** (self._reconnect_fail_count + 1), 32) if self._reconnect_fail_count > 0 else 10
-                if  time.time() - last_conn_reconnect_time > reconnect_interval:
+                # Exp backoff with jitter: ~2,4,8,16,32s based on consecutive failures
+                if now >= self._next_reconnect_at['conn']:
                     if self.conn is None or not self.conn.is_connected() :
                         try:
-                            last_conn_reconnect_time = time.time()
-                            logger.info("Main connection not available (failures: %d/5), reconnecting in %ds...",
-                                       self._reconnect_fail_count, reconnect_interval)
+                            logger.info("Main connection not available (failures: %d/5), reconnecting...",
+                                       self._reconnect_fail_count)
                             self._reconnect()
                             if self.conn and self.conn.is_connected():
                                 logger.info("Main connection re-established")
                                 # Queue pending pokes for sending after reconnection
                                 if self.pending_pokes:
-                                    self.command_queue.put({'type': 'send_pokes'})
+                                    self._enqueue({'type': 'send_pokes'})
+                            else:
+                                reconnect_failed = True
                         except Exception as e:
                             logger.error(f"Failed to reconnect main connection: {e}")
-                            last_conn_reconnect_time = time.time()
-                            continue
+                            reconnect_failed = True
+                        if reconnect_failed:
+                            self._schedule_reconnect('conn', self._reconnect_fail_count + 1)
                     
                 # Reconnect event connection if needed
-                if time.time() - last_conn_event_reconnect_time > 10:
+                if now >= self._next_reconnect_at['event']:
                     if self.event_conn is None or not self.event_conn.is_connected() :
                         try:
-                            last_conn_event_reconnect_time = time.time()
                             logger.info("Event connection not available, attempting to reconnect...")
                             self.event_conn = self.setup_event_connection()
+                            self._reconnect_attempts['event'] = 0
                             logger.info("Event connection re-established")
                             
-                            # Restart event thread if not running
-                            if not self._event_thread or not self._event_thread.is_alive():
-                                logger.info("Restarting event loop thread...")
-                                self._event_thread = threading.Thread(target=self._event_loop, daemon=True)
-                                self._event_thread.start()
+                            # Wake the parked event thread with the new connection
+                            self._event_ready.set()
+                            self._ensure_alive('event')
+                            self._ensure_alive('handler')
                         except Exception as e:
-                            logger.error("Failed to reconnect event connection: %s", e)
-                            last_conn_event_reconnect_time = time.time()
-                            continue
+                            self._reconnect_attempts['event'] += 1
+                            delay = self._schedule_reconnect('event', self._reconnect_attempts['event'])
+                            logger.error("Failed to reconnect event connection: %s (retry in %.1fs)", e, delay)
+                            reconnect_failed = True
                 
                 # Reconnect worker connection if needed
-                if time.time() - self.last_worker_conn_reconnect_time > 10:
+                if now >= self._next_reconnect_at['worker']:
                     if self.worker_conn is None or not self.worker_conn.is_connected():
                         try:
                             logger.info("Worker connection not available, attempting to reconnect...")
                             self.worker_conn = self.setup_worker_connection()
+                            self._reconnect_attempts['worker'] = 0
                             logger.info("Worker connection re-established")
+                            self._ensure_alive('worker')
                         except Exception as e:
-                            logger.error("Failed to reconnect worker connection: %s", e)
-                            time.sleep(2)
-                            continue
+                            self._reconnect_attempts['worker'] += 1
+                            delay = self._schedule_reconnect('worker', self._reconnect_attempts['worker'])
+                            logger.error("Failed to reconnect worker connection: %s (retry in %.1fs)", e, delay)
+                            reconnect_failed = True
                     
                 # Reconnect reference connection if needed
-                if time.time() - self.last_reference_conn_reconnect_time > 10:
+                if now >= self._next_reconnect_at['reference']:
                     if self.reference_conn is None or not self.reference_conn.is_connected():
                         try:
                             logger.info("Reference connection not available, attempting to reconnect...")
                             self.reference_conn = self.setup_reference_connection()
+                            self._reconnect_attempts['reference'] = 0
                             logger.info("Reference connection re-established")
+                            self._ensure_alive('reference')
+                            # Data may have gone stale while disconnected - refresh now
+                            self.wake_reference_refresh()
                         except Exception as e:
-                            logger.error("Failed to reconnect reference connection: %s", e)
-                            time.sleep(2)
-                            continue
+                            self._reconnect_attempts['reference'] += 1
+                            delay = self._schedule_reconnect('reference', self._reconnect_attempts['reference'])
+                            logger.error("Failed to reconnect reference connection: %s (retry in %.1fs)", e, delay)
+                            reconnect_failed = True
+                
+                if reconnect_failed:
+                    # Skip keepalive until the connections are back; the backoff gates retries
+                    self._wake.wait(self._next_main_loop_wakeup(last_keepalive_time))
+                    continue
                 
                 # Send keepalive and check connection health
                 if time.time() - last_keepalive_time > 120:
                     last_keepalive_time = time.time()
-                    try:
+                    debug_timing = logger.isEnabledFor(logging.DEBUG)
+                    if debug_timing:
                         keepalive_start = time.perf_counter()
-                        self.conn.send_keepalive()
-                        self.event_conn.send_keepalive()
-                        self.worker_conn.send_keepalive()
-                        self.reference_conn.send_keepalive()
-                        # Ensure connections are still connected to the server
-                        self._ensure_server_connection(self.conn, "Main connection")
-                        self._ensure_server_connection(self.event_conn, "Event connection")
-                        self._ensure_server_connection(self.worker_conn, "Worker connection")
-                        self._ensure_server_connection(self.reference_conn, "Reference connection")
+                    # The server connection belongs to the TS client, not to a query
+                    # connection, so one whoami check covers all of them. It runs on
+                    # the first healthy connection whose replies are read here
+                    # (never the event connection, whose replies the reader consumes).
+                    server_checked = False
+                    for attr, conn_name, wait_for_reply in self.KEEPALIVE_TARGETS:
+                        conn = getattr(self, attr)
+                        if conn is None:
+                            continue
+                        try:
+                            self._send_keepalive(conn, wait_for_reply=wait_for_reply)
+                            if wait_for_reply and not server_checked:
+                                server_checked = True
+                                self._ensure_server_connection(conn, conn_name)
+                        except Exception as e:
+                            if _is_conn_error(e):
+                                logger.warning(f"{conn_name} keepalive error: {e}")
+                            else:
+                                logger.error(f"{conn_name} keepalive failed: {e}")
+                            # Mark only the failing connection as broken so it gets reconnected
+                            setattr(self, attr, None)
+                    if debug_timing:
                         keepalive_time = (time.perf_counter() - keepalive_start) * 1000
-                        logger.debug(f"⏱️ Keepalive + connection checks: {keepalive_time:.2f}ms")
-                    except Exception as e:
-                        error_str = str(e).lower()
-                        if any(err in error_str for err in ['broken pipe', 'errno 32', 'connection', 'socket', 'not connected', '1794']):
-                            logger.warning(f"Keepalive connection error: {e}")
-                            # Mark connections as broken
-                            self.conn = None
-                            self.event_conn = None
-                        else:
-                            logger.error(f"Keepalive failed: {e}")
-                            self.conn = None
-                time.sleep(1)
+                        logger.debug("⏱️ Keepalive + connection checks: %.2fms", keepalive_time)
+                
+                # Sleep until the next keepalive/reconnect is due, or earlier if
+                # another thread reports a dropped connection
+                self._wake.wait(self._next_main_loop_wakeup(last_keepalive_time))
         
         except KeyboardInterrupt:
             logger.info("Bot shutdown requested")
@@ -2135,46 +2804,47 @@ class TS3Bot:
         finally:
             # Cleanup
             self._running = False
-            if self._event_thread:
-                self._event_thread.join(timeout=5)
-            if self._worker_thread:
-                self._worker_thread.join(timeout=5)
-            if self._reference_thread:
-                self._reference_thread.join(timeout=5)
-            if self.war_stats_collector:
-                try:
-                    self.war_stats_collector.stop()
-                except Exception as e:
-                    logger.error(f"Error stopping war stats collector: {e}")
-            if self.event_conn:
-                try:
-                    self.event_conn.close()
-                except Exception as e:
-                    logger.error(f"Error closing event connection: {e}")
-            if self.worker_conn:
-                try:
-                    self.worker_conn.close()
-                except Exception as e:
-                    logger.error(f"Error closing worker connection: {e}")
-            if self.reference_conn:
-                try:
-                    self.reference_conn.close()
-                except Exception as e:
-                    logger.error(f"Error closing reference connection: {e}")
-            if self.conn:
-                try:
-                    self.conn.close()
-                except Exception as e:
-                    logger.error(f"Error closing main connection: {e}")
-            if self.activity_logger:
-                try:
-                    self.activity_logger.close()
-                except Exception as e:
-                    logger.error(f"Error closing activity logger: {e}")
-            if self.human_readable_logger:
-                try:
-                    self.human_readable_logger.close()
-                except Exception as e:
-                    logger.error(f"Error closing human-readable logger: {e}")
+            self._stop_event.set()  # Wake threads sleeping between tasks
+            self._event_ready.set()  # Release the event thread if it is parked
+            self._reference_nudge.set()  # Wake the reference loop so it sees _running=False
+            
+            # Join threads and executors first, then close connections, so no
+            # thread (or running reference update / HTTP task) is still using a
+            # connection or log file while it is torn down. Each phase runs its
+            # steps in parallel, so it takes the slowest step rather than the sum.
+            # Queued executor tasks are cancelled; running ones are waited for.
+            join_steps = [
+                ("event thread", self._event_thread and (lambda: self._event_thread.join(timeout=5))),
+                ("event handler thread", self._event_handler_thread and (lambda: self._event_handler_thread.join(timeout=5))),
+                ("worker thread", self._worker_thread and (lambda: self._worker_thread.join(timeout=5))),
+                ("reference thread", self._reference_thread and (lambda: self._reference_thread.join(timeout=5))),
+                ("reference executor", lambda: self._reference_executor.shutdown(wait=True, cancel_futures=True)),
+                ("HTTP executor", lambda: self._http_executor.shutdown(wait=True, cancel_futures=True)),
+            ]
+            close_steps = [
+                ("event connection", self.event_conn and self.event_conn.close),
+                ("worker connection", self.worker_conn and self.worker_conn.close),
+                ("reference connection", self.reference_conn and self.reference_conn.close),
+                ("main connection", self.conn and self.conn.close),
+            ]
+            for steps, timeout in ((join_steps, SHUTDOWN_JOIN_TIMEOUT), (close_steps, None)):
+                executor = ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="shutdown")
+                futures = [executor.submit(self._safe_close, name, step) for name, step in steps if step]
+                # Executor shutdowns have no timeout of their own - bound the whole phase
+                _, pending = wait(futures, timeout=timeout)
+                if pending:
+                    logger.warning("%d shutdown step(s) still running after %ss, continuing", len(pending), timeout)
+                executor.shutdown(wait=False)
+            
+            # Loggers last, once nothing else can write to them
+            self._safe_close("HTTP session", self._http.close)
+            self._safe_close("log batcher", self.log_batcher.stop)
+            self._safe_close("reference manager", self.reference_manager and self.reference_manager.flush)
+            self._safe_close("activity logger", self.activity_logger and self.activity_logger.close)
+            self._safe_close("human-readable logger", self.human_readable_logger and self.human_readable_logger.close)
+            self._safe_close("users seen tracker", self.users_seen_tracker and self.users_seen_tracker.close)
+            self._safe_close("UID nicknames tracker", self.uid_nicknames_tracker and self.uid_nicknames_tracker.close)
+            self._wake.close()
+            self._event_ready.close()
             logger.info("Bot stopped")
             
\ No newline at end of file
@@ -4,14 +4,32 @@ Edit this file to add/modify bot commands.
 """
 import logging
 import csv
+import mmap
 import os
+import re
 import time
 import threading
+from collections import deque
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Project root - all CSV/TXT data files live here (same layout as bot.py)
+LOG_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+EXPS_PATH = os.path.join(LOG_DIR, 'exps.csv')
+EXP_DELTAS_PATH = os.path.join(LOG_DIR, 'exp_deltas.csv')
+REGISTERED_PATH = os.path.join(LOG_DIR, 'registered.txt')
+HUMAN_LOG_PATH = os.path.join(LOG_DIR, 'activity_log_readable.csv')
+USERS_SEEN_PATH = os.path.join(LOG_DIR, 'users_seen.csv')
+CLIENTS_REF_PATH = os.path.join(LOG_DIR, 'clients_reference.csv')
+UID_NICKNAMES_PATH = os.path.join(LOG_DIR, 'uid_nicknames.csv')
+CHANNELS_REF_PATH = os.path.join(LOG_DIR, 'channels_reference.csv')
+PKC_LOG_PATH = os.path.join(LOG_DIR, 'pkc.csv')
+
+_SEPARATOR = "=" * 50 + "\n\n"
+
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
 def get_war_exp_log(days: int = 30) -> str:
@@ -25,8 +43,7 @@ def get_war_exp_log(days: int = 30) -> str:
         str: Formatted war exp log
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        exps_file = os.path.join(log_dir, 'exps.csv')
+        exps_file = EXPS_PATH
         
         if not os.path.exists(exps_file):
             return "[color=#FF6B6B]Nenhum log de exp de guerra encontrado.[/color]"
@@ -97,8 +114,7 @@ def get_exp_log(minutes: int = None, entries: int = 100) -> str:
         str: Formatted exp deltas log
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        exp_deltas_file = os.path.join(log_dir, 'exp_deltas.csv')
+        exp_deltas_file = EXP_DELTAS_PATH
         
         if not os.path.exists(exp_deltas_file):
             return "[color=#FF6B6B]No exp deltas log found.[/color]"
@@ -167,15 +183,14 @@ def register_exp_user(uid: str, min_exp: int = 0) -> str:
         str: Success or error message
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        registered_file = os.path.join(log_dir, 'registered.txt')
-        logger.debug(f"Registering UID: {uid} with min_exp: {min_exp} in file: {registered_file}")
+        registered_file = REGISTERED_PATH
+        logger.debug("Registering UID: %s with min_exp: %s in file: %s", uid, min_exp, registered_file)
         
         # Load existing registrations
         registered_users = {}  # uid -> min_exp
         if os.path.exists(registered_file):
             with open(registered_file, 'r', encoding='utf-8') as f:
-                logger.debug(f"Reading existing registered users from {registered_file}")
+                logger.debug("Reading existing registered users from %s", registered_file)
                 for line in f:
                     line = line.strip()
                     if not line:
@@ -222,8 +237,7 @@ def unregister_exp_user(uid: str) -> str:
         str: Success or error message
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        registered_file = os.path.join(log_dir, 'registered.txt')
+        registered_file = REGISTERED_PATH
         
         if not os.path.exists(registered_file):
             return "[color=#FFD700]Você não está registrado para notificações de exp da guilda.[/color]"
@@ -424,13 +438,28 @@ def format_war_stats(data, last_update):
         return f"[color=#FF0000]Erro ao formatar estatísticas de guerra: {str(e)}[/color]"
 
 
+# get_txt() keeps one connection to the API and reuses its answer for a minute,
+# so a burst of unknown commands costs at most one (short-timeout) request
+_TXT_SESSION = requests.Session()
+_TXT_SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+_TXT_TTL = 60
+_txt_cache = (float('-inf'), None)  # (monotonic fetch time, xingamento or None)
+
+
 def get_txt():
+    global _txt_cache
+    fetched_at, value = _txt_cache
+    if time.monotonic() - fetched_at < _TXT_TTL:
+        return value
+    
     api_url="https://xinga-me.appspot.com/api"
     try:
-        response=requests.get(api_url,verify=False)
-        return response.json()['xingamento']
+        response=_TXT_SESSION.get(api_url,verify=False,timeout=(1.0, 2.0))
+        value = response.json()['xingamento']
     except Exception as e:
-        return None
+        value = None
+    _txt_cache = (time.monotonic(), value)
+    return value
 
 
 def format_snapshot(clients_data):
@@ -447,7 +476,7 @@ def format_snapshot(clients_data):
         return "No clients connected."
     
     result = f"Connected Clients ({len(clients_data)}):\n"
-    result += "=" * 50 + "\n\n"
+    result += _SEPARATOR
     
     for i, client in enumerate(clients_data, 1):
         nickname = client.get('client_nickname', 'Unknown')
@@ -481,10 +510,9 @@ def get_recent_logs(minutes: int, max_results: int = 100):
     """
     try:
         # Get log file paths
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        readable_log_path = os.path.join(log_dir, 'activity_log_readable.csv')
-        users_seen_path = os.path.join(log_dir, 'users_seen.csv')
-        clients_ref_path = os.path.join(log_dir, 'clients_reference.csv')
+        readable_log_path = HUMAN_LOG_PATH
+        users_seen_path = USERS_SEEN_PATH
+        clients_ref_path = CLIENTS_REF_PATH
         
         if not os.path.exists(readable_log_path):
             return "[color=#FF6B6B]Activity log not found. No events have been logged yet.[/color]"
@@ -577,10 +605,9 @@ def get_registered_count():
         str: Formatted list of registered users or error
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        registered_file = os.path.join(log_dir, 'registered.txt')
-        clients_ref_path = os.path.join(log_dir, 'clients_reference.csv')
-        uid_nicknames_path = os.path.join(log_dir, 'uid_nicknames.csv')
+        registered_file = REGISTERED_PATH
+        clients_ref_path = CLIENTS_REF_PATH
+        uid_nicknames_path = UID_NICKNAMES_PATH
         
         if not os.path.exists(registered_file):
             return "[color=#FF6B6B]📋 Nenhum usuário registrado para notificações de exp.[/color]"
@@ -677,8 +704,7 @@ def get_users_list(plus_mode=False):
         str: Formatted list of UIDs and nicknames
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        uid_nicknames_path = os.path.join(log_dir, 'uid_nicknames.csv')
+        uid_nicknames_path = UID_NICKNAMES_PATH
         
         # Dictionary to store uid -> set of nicknames
         uid_nicknames = {}
@@ -737,8 +763,7 @@ def get_channel_list():
         str: Formatted list of channel IDs and names
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        channels_ref_path = os.path.join(log_dir, 'channels_reference.csv')
+        channels_ref_path = CHANNELS_REF_PATH
         
         # Dictionary to store cid -> channel name
         channels = {}
@@ -783,8 +808,7 @@ def get_pkc_logs(search_term=None, max_results=50):
         str: Formatted PKC logs
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        pkc_log_path = os.path.join(log_dir, 'pkc.csv')
+        pkc_log_path = PKC_LOG_PATH
         
         if not os.path.exists(pkc_log_path):
             return "[color=#FF6B6B]Nenhum log PKC encontrado.[/color]"
@@ -911,15 +935,15 @@ def calculate_user_statistics(uid: str) -> dict:
         dict: Statistics including time monitored, mute times, and channel times
     """
     try:
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        readable_log_path = os.path.join(log_dir, 'activity_log_readable.csv')
+        readable_log_path = HUMAN_LOG_PATH
         
-        if not os.path.exists(readable_log_path):
-            return {}
-        
-        # Read all events for this user
+        # Read all events for this user (a missing log means no statistics)
         user_events = []
-        with open(readable_log_path, 'r', newline='', encoding='utf-8') as f:
+        try:
+            f = open(readable_log_path, 'r', newline='', encoding='utf-8')
+        except FileNotFoundError:
+            return {}
+        with f:
             reader = csv.DictReader(f)
             for row in reader:
                 if row.get('UID', '').strip() == uid:
@@ -1030,6 +1054,94 @@ def format_time(seconds: float) -> str:
         return f"{minutes}m"
 
 
+_user_rows_cache = (None, [])  # ((clients_ref mtime_ns, users_seen mtime_ns), rows)
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _load_user_rows(clients_ref_path, users_seen_path):
+    """
+    Load (uid, nickname, ip) rows from clients_reference.csv and users_seen.csv.
+    
+    Rows carry lowercased copies of each field for the case-insensitive
+    passes, and are re-read only when one of the files changes.
+    
+    Returns:
+        list: (uid, nickname, ip, uid_lower, nickname_lower, ip_lower) tuples
+    """
+    global _user_rows_cache
+    key = (_mtime_ns(clients_ref_path), _mtime_ns(users_seen_path))
+    cached_key, cached_rows = _user_rows_cache
+    if cached_key == key:
+        return cached_rows
+    
+    rows = []
+    # clients_reference.csv first (more up-to-date), then users_seen.csv for history
+    for path, uid_key, nickname_key, ip_key in (
+        (clients_ref_path, 'uid', 'nickname', 'ip'),
+        (users_seen_path, 'UID', 'NICKNAME', 'IP'),
+    ):
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                uid = row.get(uid_key, '')
+                nickname = row.get(nickname_key, '')
+                ip = row.get(ip_key, '')
+                rows.append((uid, nickname, ip, uid.lower(), nickname.lower(), ip.lower()))
+    
+    _user_rows_cache = (key, rows)
+    return rows
+
+
+def _iter_log_rows_for_uids(path, uids):
+    """
+    Yield the rows of a CSV log whose UID column is one of uids.
+    
+    The file is memory-mapped and scanned as bytes for the UIDs; only lines
+    containing one are decoded and split by csv, so unrelated rows cost no
+    per-row parsing. The first yielded item is the header row.
+    
+    Args:
+        path: CSV file to scan
+        uids: Set of UIDs to match exactly against the UID column
+    
+    Yields:
+        list: Header row first, then every matching row
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield []
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b'\n') + 1 or len(mm)
+            header = next(csv.reader([mm[:header_end].decode('utf-8').rstrip('\r\n')]), [])
+            yield header
+            uid_col = header.index('UID') if 'UID' in header else 0
+            
+            needles = [re.escape(uid.encode('utf-8')) for uid in uids if uid]
+            if not needles:
+                return
+            pattern = re.compile(b'|'.join(needles))
+            
+            pos = header_end
+            while (match := pattern.search(mm, pos)):
+                start = mm.rfind(b'\n', 0, match.start()) + 1
+                end = mm.find(b'\n', match.end())
+                if end == -1:
+                    end = len(mm)
+                pos = end + 1
+                line = mm[start:end].decode('utf-8', errors='replace').rstrip('\r')
+                row = next(csv.reader([line]), [])
+                if len(row) > uid_col and row[uid_col] in uids:
+                    yield row
+
+
 def search_activity_log(search_term: str, max_results: int = 50):
     """
     Search human-readable activity log for entries matching uid, nickname, or ip.
@@ -1044,91 +1156,65 @@ def search_activity_log(search_term: str, max_results: int = 50):
     """
     try:
         # Get log file paths (in project root)
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        readable_log_path = os.path.join(log_dir, 'activity_log_readable.csv')
-        users_seen_path = os.path.join(log_dir, 'users_seen.csv')
-        clients_ref_path = os.path.join(log_dir, 'clients_reference.csv')
-        
-        if not os.path.exists(readable_log_path):
-            return "[color=#FF6B6B]Activity log not found. No events have been logged yet.[/color]"
+        readable_log_path = HUMAN_LOG_PATH
+        users_seen_path = USERS_SEEN_PATH
+        clients_ref_path = CLIENTS_REF_PATH
         
         # First, try to find UID from nickname or IP in both reference sources
         # Priority: exact match > case-insensitive match > partial match
         target_uids = set()
         matched_user_info = {}  # uid -> (nickname, ip)
         
-        # Collect all rows from both sources first
-        all_rows = []
-        
-        # Check clients_reference.csv first (more up-to-date)
-        if os.path.exists(clients_ref_path):
-            with open(clients_ref_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    uid = row.get('uid', '')
-                    nickname = row.get('nickname', '')
-                    ip = row.get('ip', '')
-                    all_rows.append(('clients_ref', uid, nickname, ip))
-        
-        # Also check users_seen.csv for historical data
-        if os.path.exists(users_seen_path):
-            with open(users_seen_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    uid = row.get('UID', '')
-                    nickname = row.get('NICKNAME', '')
-                    ip = row.get('IP', '')
-                    all_rows.append(('users_seen', uid, nickname, ip))
+        # Rows from both sources, cached until either file changes
+        all_rows = _load_user_rows(clients_ref_path, users_seen_path)
         
         # Pass 1: Exact case-sensitive match
-        for source, uid, nickname, ip in all_rows:
+        for uid, nickname, ip, uid_lower, nickname_lower, ip_lower in all_rows:
             if search_term == uid or search_term == nickname or search_term == ip:
                 target_uids.add(uid)
                 matched_user_info[uid] = (nickname, ip)
         
         # Pass 2: Case-insensitive exact match (only if no exact match found)
+        term_lower = search_term.lower()
         if not target_uids:
-            for source, uid, nickname, ip in all_rows:
-                if (search_term.lower() == uid.lower() or 
-                    search_term.lower() == nickname.lower() or 
-                    search_term.lower() == ip.lower()):
+            for uid, nickname, ip, uid_lower, nickname_lower, ip_lower in all_rows:
+                if term_lower == uid_lower or term_lower == nickname_lower or term_lower == ip_lower:
                     target_uids.add(uid)
                     matched_user_info[uid] = (nickname, ip)
         
         # Pass 3: Partial substring match (only if no exact match found)
         if not target_uids:
-            for source, uid, nickname, ip in all_rows:
-                if (search_term.lower() in uid.lower() or
-                    search_term.lower() in nickname.lower() or
-                    search_term in ip):
+            for uid, nickname, ip, uid_lower, nickname_lower, ip_lower in all_rows:
+                if term_lower in uid_lower or term_lower in nickname_lower or search_term in ip:
                     target_uids.add(uid)
                     matched_user_info[uid] = (nickname, ip)
         
         if not target_uids:
             # Last resort: assume search_term is a UID directly
             target_uids.add(search_term)
-            logger.debug(f"No match found in reference files, using search term as UID: {search_term}")
-        
-        # Now search the readable activity log for these UIDs - collect ALL matches
-        all_matches = []
-        with open(readable_log_path, 'r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            for row in reader:
-                uid = row.get('UID', '')
-                if uid in target_uids:
-                    all_matches.append(row)
+            logger.debug("No match found in reference files, using search term as UID: %s", search_term)
+        
+        # Now search the readable activity log for these UIDs. Only lines that
+        # contain one are parsed, and only the LAST max_results are kept while
+        # counting all of them (or all if max_results is None or -1)
+        show_all = max_results is None or max_results == -1
+        matches = deque(maxlen=None if show_all or max_results <= 0 else max_results)
+        total_found = 0
+        rows = _iter_log_rows_for_uids(readable_log_path, target_uids)
+        try:
+            header = next(rows)
+        except FileNotFoundError:
+            # Opening is the existence check - no separate stat per search
+            return "[color=#FF6B6B]Activity log not found. No events have been logged yet.[/color]"
+        ts_col = header.index('TIMESTAMP') if 'TIMESTAMP' in header else 1
+        event_col = header.index('EVENT') if 'EVENT' in header else 2
+        for row in rows:
+            total_found += 1
+            matches.append(row)
         
-        if not all_matches:
+        if not total_found:
             return f"\n[color=#FF6B6B]Nenhuma atividade encontrada para: {search_term}[/color]"
         
-        # Take only the LAST max_results entries (or all if max_results is None or -1)
-        if max_results is None or max_results == -1:
-            matches = all_matches
-        else:
-            matches = all_matches[-max_results:]
-        total_found = len(all_matches)
-        
         # Format results
         user_display = search_term
         if len(target_uids) == 1:
@@ -1140,8 +1226,8 @@ def search_activity_log(search_term: str, max_results: int = 50):
         showing_text = "mostrando todas" if (max_results is None or max_results == -1) else f"mostrando últimas {len(matches)}"
         result = f"[b][color=#4ECDC4]🔍 Encontradas {total_found} atividades para '[/color][color=#FFD700]{user_display}[/color][color=#4ECDC4]'[/color][/b] [color=#A0A0A0]({showing_text})[/color]\n\n"
         for i, match in enumerate(matches, 1):
-            timestamp = match.get('TIMESTAMP', '')
-            event = match.get('EVENT', 'unknown event')
+            timestamp = match[ts_col] if len(match) > ts_col else ''
+            event = match[event_col] if len(match) > event_col else 'unknown event'
             
             result += f"[color=#FFD700]{i}.[/color] [color=#90EE90][{timestamp}][/color] {event}\n"
         
@@ -1223,8 +1309,7 @@ def search_exp_log(search_term: str, max_results: int = 50):
     """
     try:
         # Get log file path (in project root)
-        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        exp_deltas_file = os.path.join(log_dir, 'exp_deltas.csv')
+        exp_deltas_file = EXP_DELTAS_PATH
         
         if not os.path.exists(exp_deltas_file):
             return "[color=#FF6B6B]No exp deltas log found.[/color]"
@@ -1340,7 +1425,7 @@ def bdsm_text_async(nickname, bot, clid):
         })
     
     # Start the thread
-    thread = threading.Thread(target=_fetch_and_send, daemon=True)
+    thread = threading.Thread(target=_fetch_and_send, daemon=True, name="bdsm-fetch")
     thread.start()
 
 
@@ -1362,6 +1447,132 @@ def bdsm_text_async(nickname, bot, clid):
 
 
 
+
+# Detailed help texts, built once at import (HELP_LOGGER is also the !logger usage reply)
+HELP_WAREXP = (
+    "\n"
+    "[b][color=#9932CC]═══════════════════════════════════════════════[/color][/b]\n"
+    "[b][color=#FF69B4]📊 Ajuda Detalhada - Comandos de Guerra[/color][/b]\n"
+    "[b][color=#9932CC]═══════════════════════════════════════════════[/color][/b]\n\n"
+    "[b][color=#9932CC]!warexp[/color][/b]\n"
+    "[color=#A0A0A0]Mostra as estatísticas atuais da guerra entre Shell e Ascendant.[/color]\n"
+    "[color=#90EE90]Exemplo:[/color] !warexp\n\n"
+    "[b][color=#FF1493]!warexplog[/color][/b] [color=#A0A0A0][dias][/color]\n"
+    "[color=#A0A0A0]Mostra o histórico de exp de guerra dos últimos N dias (padrão: 30).[/color]\n"
+    "[color=#A0A0A0]Exibe data, exp e score de cada guilda por dia.[/color]\n"
+    "[color=#90EE90]Exemplos:[/color]\n"
+    "  !warexplog       (últimos 30 dias)\n"
+    "  !warexplog 7     (últimos 7 dias)\n"
+    "  !warexplog 90    (últimos 90 dias, máx: 365)\n\n"
+    "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !warexplog para ver tendências e !warexp para dados em tempo real.[/color]\n"
+    "[b][color=#9932CC]═══════════════════════════════════════════════[/color][/b]"
+)
+
+HELP_LOGGER = (
+    "\n"
+    "[b][color=#FFD700]═══════════════════════════════════════════════[/color][/b]\n"
+    "[b][color=#FF69B4]📝 Ajuda Detalhada - Comandos de Log[/color][/b]\n"
+    "[b][color=#FFD700]═══════════════════════════════════════════════[/color][/b]\n\n"
+    "[b][color=#FFD700]!logger[/color][/b] [color=#A0A0A0]<uid/nickname/ip> [all][/color]\n"
+    "[color=#A0A0A0]Busca no registro de atividades por UID, nickname ou IP.[/color]\n"
+    "[color=#A0A0A0]Por padrão mostra últimas 50 entradas. Use 'all' para ver todas.[/color]\n"
+    "[color=#90EE90]Exemplos:[/color]\n"
+    "  !logger john           (últimas 50 entradas)\n"
+    "  !logger john all       (todas as entradas)\n"
+    "  !logger 192.168.1.1    (busca por IP)\n\n"
+    "[b][color=#9ACD32]!lastminuteslogs[/color][/b] [color=#A0A0A0]<minutos>[/color]\n"
+    "[color=#A0A0A0]Mostra atividades dos últimos N minutos (máx: 1440 = 24h).[/color]\n"
+    "[color=#90EE90]Exemplos:[/color]\n"
+    "  !lastminuteslogs 5     (últimos 5 minutos)\n"
+    "  !lastminuteslogs 60    (última hora)\n\n"
+    "[b][color=#FF8C00]!showlogs[/color][/b]\n"
+    "[color=#A0A0A0]Mostra os últimos 100 avisos/erros do bot.[/color]\n"
+    "[color=#A0A0A0]Útil para diagnosticar problemas.[/color]\n"
+    "[color=#90EE90]Exemplo:[/color] !showlogs\n\n"
+    "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !logger para rastrear jogadores específicos e !lastminuteslogs para ver atividade recente geral.[/color]\n"
+    "[b][color=#FFD700]═══════════════════════════════════════════════[/color][/b]"
+)
+
+HELP_EXP = (
+    "\n"
+    "[b][color=#4169E1]═══════════════════════════════════════════════[/color][/b]\n"
+    "[b][color=#FF69B4]🔔 Ajuda Detalhada - Sistema de Notificações de EXP[/color][/b]\n"
+    "[b][color=#4169E1]═══════════════════════════════════════════════[/color][/b]\n\n"
+    "[b][color=#4169E1]!registerexp[/color][/b] [color=#A0A0A0][min_exp][/color]\n"
+    "[color=#A0A0A0]Registra você para receber notificações quando a guilda ganhar exp.[/color]\n"
+    "[color=#A0A0A0]Opcionalmente defina um exp mínimo para ser notificado.[/color]\n"
+    "[color=#90EE90]Exemplos:[/color]\n"
+    "  !registerexp           (notifica qualquer ganho)\n"
+    "  !registerexp 100000    (notifica ganhos ≥ 100k)\n"
+    "  !registerexp 500000    (notifica ganhos ≥ 500k)\n\n"
+    "[b][color=#8A2BE2]!unregisterexp[/color][/b]\n"
+    "[color=#A0A0A0]Remove você das notificações de exp da guilda.[/color]\n"
+    "[color=#90EE90]Exemplo:[/color] !unregisterexp\n\n"
+    "[b][color=#00CED1]!registered[/color][/b]\n"
+    "[color=#A0A0A0]Mostra quantos usuários estão registrados para notificações.[/color]\n"
+    "[color=#90EE90]Exemplo:[/color] !registered\n\n"
+    "[b][color=#FF4500]!explog[/color][/b] [color=#A0A0A0][minutos][/color]\n"
+    "[color=#A0A0A0]Mostra ganhos recentes de exp (padrão: últimas 100 entradas).[/color]\n"
+    "[color=#A0A0A0]Use parâmetro de minutos para filtrar por tempo (máx: 1440).[/color]\n"
+    "[color=#90EE90]Exemplos:[/color]\n"
+    "  !explog         (últimas 100 entradas)\n"
+    "  !explog 30      (últimos 30 minutos)\n\n"
+    "[b][color=#FF6347]!explogger[/color][/b] [color=#A0A0A0]<nome> [all][/color]\n"
+    "[color=#A0A0A0]Busca ganhos de exp por nome de jogador.[/color]\n"
+    "[color=#A0A0A0]Por padrão mostra últimas 50 entradas. Use 'all' para ver todas.[/color]\n"
+    "[color=#90EE90]Exemplos:[/color]\n"
+    "  !explogger john      (últimas 50)\n"
+    "  !explogger john all  (todas)\n\n"
+    "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Configure um min_exp alto para evitar spam de notificações pequenas![/color]\n"
+    "[b][color=#4169E1]═══════════════════════════════════════════════[/color][/b]"
+)
+
+HELP_PKC = (
+    "\n"
+    "[b][color=#DC143C]═══════════════════════════════════════════════[/color][/b]\n"
+    "[b][color=#FF69B4]🔒 Ajuda Detalhada - Sistema de Bloqueio de Canal (PKC)[/color][/b]\n"
+    "[b][color=#DC143C]═══════════════════════════════════════════════[/color][/b]\n\n"
+    "[b][color=#DC143C]!pkc[/color][/b] [color=#A0A0A0]<channel_id> <minutos> <senha>[/color]\n"
+    "[color=#A0A0A0]Bloqueia um canal por tempo determinado. Qualquer pessoa que entrar[/color]\n"
+    "[color=#A0A0A0]no canal será kickada automaticamente até o tempo expirar.[/color]\n"
+    "[color=#A0A0A0]Máximo de 3 canais ativos simultaneamente.[/color]\n"
+    "[color=#A0A0A0]Duração máxima: 180 minutos (3 horas).[/color]\n"
+    "[color=#90EE90]Exemplo:[/color]\n"
+    "  !pkc 5 30 \"senha\"    (bloqueia canal 5 por 30 min)\n\n"
+    "[b][color=#8B0000]!cancelpkc[/color][/b]\n"
+    "[color=#A0A0A0]Cancela todos os bloqueios de canal ativos imediatamente.[/color]\n"
+    "[color=#90EE90]Exemplo:[/color] !cancelpkc\n\n"
+    "[b][color=#CD5C5C]!pkclogs[/color][/b] [color=#A0A0A0][nickname/clid][/color]\n"
+    "[color=#A0A0A0]Visualiza logs de kicks do sistema PKC.[/color]\n"
+    "[color=#A0A0A0]Opcionalmente filtre por nickname ou client ID.[/color]\n"
+    "[color=#90EE90]Exemplos:[/color]\n"
+    "  !pkclogs           (todos os logs)\n"
+    "  !pkclogs john      (logs do jogador john)\n\n"
+    "[color=#FF6B6B]⚠️ Importante:[/color]\n"
+    "[color=#A0A0A0]• Senha necessária para ativar PKC (peça ao administrador)[/color]\n"
+    "[color=#A0A0A0]• Limite de 3 canais simultaneamente[/color]\n"
+    "[color=#A0A0A0]• Use !channelids para ver IDs dos canais[/color]\n\n"
+    "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !pkclogs para ver quem tentou entrar nos canais bloqueados![/color]\n"
+    "[b][color=#DC143C]═══════════════════════════════════════════════[/color][/b]"
+)
+
+
+# Fixed part of the reply to anything that isn't a known command
+_UNKNOWN_COMMAND_PREFIX = "\n[color=#A0A0A0]Esse não é o x3tbot. Digite[/color] [b][color=#4ECDC4]!help[/color][/b] [color=#A0A0A0]para ver os comandos disponíveis[/color] "
+
+
+def unknown_command_response():
+    """
+    Build the reply for messages that aren't a known command.
+    
+    Returns:
+        str: Default response, with a random xingamento appended when available
+    """
+    t=get_txt()
+    if isinstance(t, str) and t.strip():
+        return f"{_UNKNOWN_COMMAND_PREFIX}\n[color=#FF6B6B]{t.strip()}[/color]"
+    return _UNKNOWN_COMMAND_PREFIX
+
 
 def process_command(bot, msg, nickname, clid=None):
     """
@@ -1376,197 +1587,94 @@ def process_command(bot, msg, nickname, clid=None):
     Returns:
         str: Response to send back to user
     """
-    # Define help texts as constants for reuse
-    HELP_WAREXP = (
-        "\n"
-        "[b][color=#9932CC]═══════════════════════════════════════════════[/color][/b]\n"
-        "[b][color=#FF69B4]📊 Ajuda Detalhada - Comandos de Guerra[/color][/b]\n"
-        "[b][color=#9932CC]═══════════════════════════════════════════════[/color][/b]\n\n"
-        "[b][color=#9932CC]!warexp[/color][/b]\n"
-        "[color=#A0A0A0]Mostra as estatísticas atuais da guerra entre Shell e Ascendant.[/color]\n"
-        "[color=#90EE90]Exemplo:[/color] !warexp\n\n"
-        "[b][color=#FF1493]!warexplog[/color][/b] [color=#A0A0A0][dias][/color]\n"
-        "[color=#A0A0A0]Mostra o histórico de exp de guerra dos últimos N dias (padrão: 30).[/color]\n"
-        "[color=#A0A0A0]Exibe data, exp e score de cada guilda por dia.[/color]\n"
-        "[color=#90EE90]Exemplos:[/color]\n"
-        "  !warexplog       (últimos 30 dias)\n"
-        "  !warexplog 7     (últimos 7 dias)\n"
-        "  !warexplog 90    (últimos 90 dias, máx: 365)\n\n"
-        "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !warexplog para ver tendências e !warexp para dados em tempo real.[/color]\n"
-        "[b][color=#9932CC]═══════════════════════════════════════════════[/color][/b]"
-    )
-    
-    HELP_LOGGER = (
-        "\n"
-        "[b][color=#FFD700]═══════════════════════════════════════════════[/color][/b]\n"
-        "[b][color=#FF69B4]📝 Ajuda Detalhada - Comandos de Log[/color][/b]\n"
-        "[b][color=#FFD700]═══════════════════════════════════════════════[/color][/b]\n\n"
-        "[b][color=#FFD700]!logger[/color][/b] [color=#A0A0A0]<uid/nickname/ip> [all][/color]\n"
-        "[color=#A0A0A0]Busca no registro de atividades por UID, nickname ou IP.[/color]\n"
-        "[color=#A0A0A0]Por padrão mostra últimas 50 entradas. Use 'all' para ver todas.[/color]\n"
-        "[color=#90EE90]Exemplos:[/color]\n"
-        "  !logger john           (últimas 50 entradas)\n"
-        "  !logger john all       (todas as entradas)\n"
-        "  !logger 192.168.1.1    (busca por IP)\n\n"
-        "[b][color=#9ACD32]!lastminuteslogs[/color][/b] [color=#A0A0A0]<minutos>[/color]\n"
-        "[color=#A0A0A0]Mostra atividades dos últimos N minutos (máx: 1440 = 24h).[/color]\n"
-        "[color=#90EE90]Exemplos:[/color]\n"
-        "  !lastminuteslogs 5     (últimos 5 minutos)\n"
-        "  !lastminuteslogs 60    (última hora)\n\n"
-        "[b][color=#FF8C00]!showlogs[/color][/b]\n"
-        "[color=#A0A0A0]Mostra os últimos 100 avisos/erros do bot.[/color]\n"
-        "[color=#A0A0A0]Útil para diagnosticar problemas.[/color]\n"
-        "[color=#90EE90]Exemplo:[/color] !showlogs\n\n"
-        "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !logger para rastrear jogadores específicos e !lastminuteslogs para ver atividade recente geral.[/color]\n"
-        "[b][color=#FFD700]═══════════════════════════════════════════════[/color][/b]"
-    )
-    
-    HELP_EXP = (
-        "\n"
-        "[b][color=#4169E1]═══════════════════════════════════════════════[/color][/b]\n"
-        "[b][color=#FF69B4]🔔 Ajuda Detalhada - Sistema de Notificações de EXP[/color][/b]\n"
-        "[b][color=#4169E1]═══════════════════════════════════════════════[/color][/b]\n\n"
-        "[b][color=#4169E1]!registerexp[/color][/b] [color=#A0A0A0][min_exp][/color]\n"
-        "[color=#A0A0A0]Registra você para receber notificações quando a guilda ganhar exp.[/color]\n"
-        "[color=#A0A0A0]Opcionalmente defina um exp mínimo para ser notificado.[/color]\n"
-        "[color=#90EE90]Exemplos:[/color]\n"
-        "  !registerexp           (notifica qualquer ganho)\n"
-        "  !registerexp 100000    (notifica ganhos ≥ 100k)\n"
-        "  !registerexp 500000    (notifica ganhos ≥ 500k)\n\n"
-        "[b][color=#8A2BE2]!unregisterexp[/color][/b]\n"
-        "[color=#A0A0A0]Remove você das notificações de exp da guilda.[/color]\n"
-        "[color=#90EE90]Exemplo:[/color] !unregisterexp\n\n"
-        "[b][color=#00CED1]!registered[/color][/b]\n"
-        "[color=#A0A0A0]Mostra quantos usuários estão registrados para notificações.[/color]\n"
-        "[color=#90EE90]Exemplo:[/color] !registered\n\n"
-        "[b][color=#FF4500]!explog[/color][/b] [color=#A0A0A0][minutos][/color]\n"
-        "[color=#A0A0A0]Mostra ganhos recentes de exp (padrão: últimas 100 entradas).[/color]\n"
-        "[color=#A0A0A0]Use parâmetro de minutos para filtrar por tempo (máx: 1440).[/color]\n"
-        "[color=#90EE90]Exemplos:[/color]\n"
-        "  !explog         (últimas 100 entradas)\n"
-        "  !explog 30      (últimos 30 minutos)\n\n"
-        "[b][color=#FF6347]!explogger[/color][/b] [color=#A0A0A0]<nome> [all][/color]\n"
-        "[color=#A0A0A0]Busca ganhos de exp por nome de jogador.[/color]\n"
-        "[color=#A0A0A0]Por padrão mostra últimas 50 entradas. Use 'all' para ver todas.[/color]\n"
-        "[color=#90EE90]Exemplos:[/color]\n"
-        "  !explogger john      (últimas 50)\n"
-        "  !explogger john all  (todas)\n\n"
-        "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Configure um min_exp alto para evitar spam de notificações pequenas![/color]\n"
-        "[b][color=#4169E1]═══════════════════════════════════════════════[/color][/b]"
-    )
-    
-    HELP_PKC = (
-        "\n"
-        "[b][color=#DC143C]═══════════════════════════════════════════════[/color][/b]\n"
-        "[b][color=#FF69B4]🔒 Ajuda Detalhada - Sistema de Bloqueio de Canal (PKC)[/color][/b]\n"
-        "[b][color=#DC143C]═══════════════════════════════════════════════[/color][/b]\n\n"
-        "[b][color=#DC143C]!pkc[/color][/b] [color=#A0A0A0]<channel_id> <minutos> <senha>[/color]\n"
-        "[color=#A0A0A0]Bloqueia um canal por tempo determinado. Qualquer pessoa que entrar[/color]\n"
-        "[color=#A0A0A0]no canal será kickada automaticamente até o tempo expirar.[/color]\n"
-        "[color=#A0A0A0]Máximo de 3 canais ativos simultaneamente.[/color]\n"
-        "[color=#A0A0A0]Duração máxima: 180 minutos (3 horas).[/color]\n"
-        "[color=#90EE90]Exemplo:[/color]\n"
-        "  !pkc 5 30 \"senha\"    (bloqueia canal 5 por 30 min)\n\n"
-        "[b][color=#8B0000]!cancelpkc[/color][/b]\n"
-        "[color=#A0A0A0]Cancela todos os bloqueios de canal ativos imediatamente.[/color]\n"
-        "[color=#90EE90]Exemplo:[/color] !cancelpkc\n\n"
-        "[b][color=#CD5C5C]!pkclogs[/color][/b] [color=#A0A0A0][nickname/clid][/color]\n"
-        "[color=#A0A0A0]Visualiza logs de kicks do sistema PKC.[/color]\n"
-        "[color=#A0A0A0]Opcionalmente filtre por nickname ou client ID.[/color]\n"
-        "[color=#90EE90]Exemplos:[/color]\n"
-        "  !pkclogs           (todos os logs)\n"
-        "  !pkclogs john      (logs do jogador john)\n\n"
-        "[color=#FF6B6B]⚠️ Importante:[/color]\n"
-        "[color=#A0A0A0]• Senha necessária para ativar PKC (peça ao administrador)[/color]\n"
-        "[color=#A0A0A0]• Limite de 3 canais simultaneamente[/color]\n"
-        "[color=#A0A0A0]• Use !channelids para ver IDs dos canais[/color]\n\n"
-        "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !pkclogs para ver quem tentou entrar nos canais bloqueados![/color]\n"
-        "[b][color=#DC143C]═══════════════════════════════════════════════[/color][/b]"
-    )
+    # Every command starts with "!" - plain chat skips the whole prefix chain below
+    if not msg.startswith("!"):
+        return unknown_command_response()
     
     try:
-        # Check for detailed help subcommands FIRST (before general !help)
-        if msg.startswith("!help warexp"):
-            return HELP_WAREXP
-        
-        if msg.startswith("!help logger"):
-            return HELP_LOGGER
-        
-        if msg.startswith("!help exp"):
-            return HELP_EXP
-        
-        if msg.startswith("!help channel"):
-            return (
-                "\n"
-                "[b][color=#20B2AA]═══════════════════════════════════════════════[/color][/b]\n"
-                "[b][color=#FF69B4]🎯 Ajuda Detalhada - Comandos de Canal[/color][/b]\n"
-                "[b][color=#20B2AA]═══════════════════════════════════════════════[/color][/b]\n\n"
-                "[b][color=#20B2AA]!channelids[/color][/b]\n"
-                "[color=#A0A0A0]Lista todos os canais do servidor com seus IDs.[/color]\n"
-                "[color=#A0A0A0]Útil para usar com o comando !pkc.[/color]\n"
-                "[color=#90EE90]Exemplo:[/color] !channelids\n\n"
-                "[b][color=#FFD700]!bdsm[/color][/b]\n"
-                "[color=#A0A0A0]Move você e o bot para o canal Djinns.[/color]\n"
-                "[color=#A0A0A0]Comando especial para acesso rápido.[/color]\n"
-                "[color=#90EE90]Exemplo:[/color] !bdsm\n\n"
-                "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !channelids para descobrir o ID do canal antes de usar !pkc![/color]\n"
-                "[b][color=#20B2AA]═══════════════════════════════════════════════[/color][/b]"
-            )
-        
-        if msg.startswith("!help pkc"):
-            return HELP_PKC
-        
-        if msg.startswith("!help users"):
-            return (
-                "\n"
-                "[b][color=#32CD32]═══════════════════════════════════════════════[/color][/b]\n"
-                "[b][color=#FF69B4]👥 Ajuda Detalhada - Comandos de Usuários[/color][/b]\n"
-                "[b][color=#32CD32]═══════════════════════════════════════════════[/color][/b]\n\n"
-                "[b][color=#32CD32]!users[/color][/b]\n"
-                "[color=#A0A0A0]Lista todos os UIDs únicos com seus nicknames associados.[/color]\n"
-                "[color=#A0A0A0]Mostra todo histórico de nomes usados por cada UID.[/color]\n"
-                "[color=#90EE90]Exemplo:[/color] !users\n\n"
-                "[b][color=#228B22]!users plus[/color][/b]\n"
-                "[color=#A0A0A0]Lista apenas usuários que usaram múltiplos nicknames.[/color]\n"
-                "[color=#A0A0A0]Útil para identificar alternativas e mudanças de nome.[/color]\n"
-                "[color=#90EE90]Exemplo:[/color] !users plus\n\n"
-                "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !users plus para detectar mudanças de nickname![/color]\n"
-                "[b][color=#32CD32]═══════════════════════════════════════════════[/color][/b]"
-            )
-        
-        if msg.startswith("!help mp"):
-            return (
-                "\n"
-                "[b][color=#FF8C00]═══════════════════════════════════════════════[/color][/b]\n"
-                "[b][color=#FF69B4]📢 Ajuda Detalhada - Mass Poke[/color][/b]\n"
-                "[b][color=#FF8C00]═══════════════════════════════════════════════[/color][/b]\n\n"
-                "[b][color=#FF8C00]!mp[/color][/b] [color=#A0A0A0]<mensagem>[/color]\n"
-                "[color=#A0A0A0]Envia um poke para todos online no servidor com sua mensagem.[/color]\n"
-                "[color=#A0A0A0]Útil quando o x3tbot está offline ou para avisos urgentes.[/color]\n"
-                "[color=#90EE90]Exemplos:[/color]\n"
-                "  !mp Guerra começou!!\n"
-                "  !mp Raid em 10 minutos\n"
-                "  !mp Alguém pode ajudar na quest?\n\n"
-                "[color=#FF6B6B]⚠️ Aviso:[/color] [color=#A0A0A0]Use com moderação! Todos online receberão o poke.[/color]\n"
-                "[b][color=#FF8C00]═══════════════════════════════════════════════[/color][/b]"
-            )
-        
-        if msg.startswith("!help uptime"):
-            return (
-                "\n"
-                "[b][color=#1E90FF]═══════════════════════════════════════════════[/color][/b]\n"
-                "[b][color=#FF69B4]⏱️ Ajuda Detalhada - Uptime[/color][/b]\n"
-                "[b][color=#1E90FF]═══════════════════════════════════════════════[/color][/b]\n\n"
-                "[b][color=#1E90FF]!uptime[/color][/b]\n"
-                "[color=#A0A0A0]Mostra há quanto tempo o bot está rodando sem reiniciar.[/color]\n"
-                "[color=#A0A0A0]Inclui data/hora de início e duração total.[/color]\n"
-                "[color=#90EE90]Exemplo:[/color] !uptime\n\n"
-                "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use para verificar se o bot reiniciou recentemente![/color]\n"
-                "[b][color=#1E90FF]═══════════════════════════════════════════════[/color][/b]"
-            )
-        
-        # General help command (checked AFTER all subcommands)
+        # Every help text shares the "!help" prefix - other commands skip this block
         if msg.startswith("!help"):
+            # Check for detailed help subcommands FIRST (before general !help)
+            if msg.startswith("!help warexp"):
+                return HELP_WAREXP
+            
+            if msg.startswith("!help logger"):
+                return HELP_LOGGER
+            
+            if msg.startswith("!help exp"):
+                return HELP_EXP
+            
+            if msg.startswith("!help channel"):
+                return (
+                    "\n"
+                    "[b][color=#20B2AA]═══════════════════════════════════════════════[/color][/b]\n"
+                    "[b][color=#FF69B4]🎯 Ajuda Detalhada - Comandos de Canal[/color][/b]\n"
+                    "[b][color=#20B2AA]═══════════════════════════════════════════════[/color][/b]\n\n"
+                    "[b][color=#20B2AA]!channelids[/color][/b]\n"
+                    "[color=#A0A0A0]Lista todos os canais do servidor com seus IDs.[/color]\n"
+                    "[color=#A0A0A0]Útil para usar com o comando !pkc.[/color]\n"
+                    "[color=#90EE90]Exemplo:[/color] !channelids\n\n"
+                    "[b][color=#FFD700]!bdsm[/color][/b]\n"
+                    "[color=#A0A0A0]Move você e o bot para o canal Djinns.[/color]\n"
+                    "[color=#A0A0A0]Comando especial para acesso rápido.[/color]\n"
+                    "[color=#90EE90]Exemplo:[/color] !bdsm\n\n"
+                    "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !channelids para descobrir o ID do canal antes de usar !pkc![/color]\n"
+                    "[b][color=#20B2AA]═══════════════════════════════════════════════[/color][/b]"
+                )
+            
+            if msg.startswith("!help pkc"):
+                return HELP_PKC
+            
+            if msg.startswith("!help users"):
+                return (
+                    "\n"
+                    "[b][color=#32CD32]═══════════════════════════════════════════════[/color][/b]\n"
+                    "[b][color=#FF69B4]👥 Ajuda Detalhada - Comandos de Usuários[/color][/b]\n"
+                    "[b][color=#32CD32]═══════════════════════════════════════════════[/color][/b]\n\n"
+                    "[b][color=#32CD32]!users[/color][/b]\n"
+                    "[color=#A0A0A0]Lista todos os UIDs únicos com seus nicknames associados.[/color]\n"
+                    "[color=#A0A0A0]Mostra todo histórico de nomes usados por cada UID.[/color]\n"
+                    "[color=#90EE90]Exemplo:[/color] !users\n\n"
+                    "[b][color=#228B22]!users plus[/color][/b]\n"
+                    "[color=#A0A0A0]Lista apenas usuários que usaram múltiplos nicknames.[/color]\n"
+                    "[color=#A0A0A0]Útil para identificar alternativas e mudanças de nome.[/color]\n"
+                    "[color=#90EE90]Exemplo:[/color] !users plus\n\n"
+                    "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use !users plus para detectar mudanças de nickname![/color]\n"
+                    "[b][color=#32CD32]═══════════════════════════════════════════════[/color][/b]"
+                )
+            
+            if msg.startswith("!help mp"):
+                return (
+                    "\n"
+                    "[b][color=#FF8C00]═══════════════════════════════════════════════[/color][/b]\n"
+                    "[b][color=#FF69B4]📢 Ajuda Detalhada - Mass Poke[/color][/b]\n"
+                    "[b][color=#FF8C00]═══════════════════════════════════════════════[/color][/b]\n\n"
+                    "[b][color=#FF8C00]!mp[/color][/b] [color=#A0A0A0]<mensagem>[/color]\n"
+                    "[color=#A0A0A0]Envia um poke para todos online no servidor com sua mensagem.[/color]\n"
+                    "[color=#A0A0A0]Útil quando o x3tbot está offline ou para avisos urgentes.[/color]\n"
+                    "[color=#90EE90]Exemplos:[/color]\n"
+                    "  !mp Guerra começou!!\n"
+                    "  !mp Raid em 10 minutos\n"
+                    "  !mp Alguém pode ajudar na quest?\n\n"
+                    "[color=#FF6B6B]⚠️ Aviso:[/color] [color=#A0A0A0]Use com moderação! Todos online receberão o poke.[/color]\n"
+                    "[b][color=#FF8C00]═══════════════════════════════════════════════[/color][/b]"
+                )
+            
+            if msg.startswith("!help uptime"):
+                return (
+                    "\n"
+                    "[b][color=#1E90FF]═══════════════════════════════════════════════[/color][/b]\n"
+                    "[b][color=#FF69B4]⏱️ Ajuda Detalhada - Uptime[/color][/b]\n"
+                    "[b][color=#1E90FF]═══════════════════════════════════════════════[/color][/b]\n\n"
+                    "[b][color=#1E90FF]!uptime[/color][/b]\n"
+                    "[color=#A0A0A0]Mostra há quanto tempo o bot está rodando sem reiniciar.[/color]\n"
+                    "[color=#A0A0A0]Inclui data/hora de início e duração total.[/color]\n"
+                    "[color=#90EE90]Exemplo:[/color] !uptime\n\n"
+                    "[color=#FFD700]💡 Dica:[/color] [color=#A0A0A0]Use para verificar se o bot reiniciou recentemente![/color]\n"
+                    "[b][color=#1E90FF]═══════════════════════════════════════════════[/color][/b]"
+                )
+            
+            # General help (no subcommand matched)
             return (
                 "\n"
                 "[b][color=#FF1493]═════════════════════════════════════════════════[/color][/b]\n"
@@ -1726,7 +1834,8 @@ def process_command(bot, msg, nickname, clid=None):
                 thread = threading.Thread(
                     target=periodic_kick_channel,
                     args=(bot, channel_id, duration_minutes, thread_id),
-                    daemon=True
+                    daemon=True,
+                    name=thread_id
                 )
                 
                 # Add to active channels (directly, will be accessed by worker thread only)
@@ -1822,18 +1931,18 @@ def process_command(bot, msg, nickname, clid=None):
                     except ValueError:
                         return HELP_EXP
                 
-                logger.debug(f"Processing registerexp for nickname: {nickname} with min_exp: {min_exp}")
+                logger.debug("Processing registerexp for nickname: %s with min_exp: %s", nickname, min_exp)
                 user_uid = None
                 
                 # Use reference manager's client_map if available
                 if hasattr(bot, 'client_map') and bot.client_map:
                     logger.debug("Looking up UID in bot's client_map")
                     for clid, client_info in bot.client_map.items():
-                        logger.debug(f"Checking client: {client_info.get('nickname', '')}")
-                        if client_info.get('nickname', '').lower() == nickname.lower():
-                            logger.debug(f"Found matching client: {client_info}")
-                            user_uid = client_info.get('uid', '')
-                            logger.debug(f"Extracted UID: {user_uid}")
+                        logger.debug("Checking client: %s", client_info.nickname)
+                        if client_info.nickname.lower() == nickname.lower():
+                            logger.debug("Found matching client: %s", client_info)
+                            user_uid = client_info.uid
+                            logger.debug("Extracted UID: %s", user_uid)
                             break
                 
                 # Fallback: Read from CSV if not in memory
@@ -1842,9 +1951,8 @@ def process_command(bot, msg, nickname, clid=None):
                 if not user_uid:
                     logger.debug("Looking up UID in clients_reference.csv")
                     try:
-                        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                        clients_ref_path = os.path.join(log_dir, 'clients_reference.csv')
-                        logger.debug(f"Checking for clients_reference.csv at: {clients_ref_path}")
+                        clients_ref_path = CLIENTS_REF_PATH
+                        logger.debug("Checking for clients_reference.csv at: %s", clients_ref_path)
                         if os.path.exists(clients_ref_path):
                             logger.debug("Found clients_reference.csv, reading file")
                             with open(clients_ref_path, 'r', newline='', encoding='utf-8') as f:
@@ -1854,10 +1962,10 @@ def process_command(bot, msg, nickname, clid=None):
                                         user_uid = row.get('uid', '')
                                         break
                     except Exception as ref_error:
-                        logger.debug(f"Could not read reference data: {ref_error}")
+                        logger.debug("Could not read reference data: %s", ref_error)
                 
                 if user_uid:
-                    logger.debug(f"Registering user UID: {user_uid} for exp notifications with min_exp: {min_exp}")
+                    logger.debug("Registering user UID: %s for exp notifications with min_exp: %s", user_uid, min_exp)
                     return "\n" + register_exp_user(user_uid, min_exp)
                 else:
                     return "\n[color=#FF6B6B]Não foi possível encontrar seu UID. Aguarde um minuto para os dados atualizarem e tente novamente.[/color]"
@@ -1874,15 +1982,14 @@ def process_command(bot, msg, nickname, clid=None):
                 # Use reference manager's client_map if available
                 if hasattr(bot, 'client_map') and bot.client_map:
                     for clid, client_info in bot.client_map.items():
-                        if client_info.get('nickname', '').lower() == nickname.lower():
-                            user_uid = client_info.get('uid', '')
+                        if client_info.nickname.lower() == nickname.lower():
+                            user_uid = client_info.uid
                             break
                 
                 # Fallback: Read from CSV if not in memory
                 if not user_uid:
                     try:
-                        log_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                        clients_ref_path = os.path.join(log_dir, 'clients_reference.csv')
+                        clients_ref_path = CLIENTS_REF_PATH
                         
                         if os.path.exists(clients_ref_path):
                             with open(clients_ref_path, 'r', newline='', encoding='utf-8') as f:
@@ -1892,7 +1999,7 @@ def process_command(bot, msg, nickname, clid=None):
                                         user_uid = row.get('uid', '')
                                         break
                     except Exception as ref_error:
-                        logger.debug(f"Could not read reference data: {ref_error}")
+                        logger.debug("Could not read reference data: %s", ref_error)
                 
                 if user_uid:
                     return "\n" + unregister_exp_user(user_uid)
@@ -2188,15 +2295,4 @@ def process_command(bot, msg, nickname, clid=None):
         return f"\n[color=#FF0000]QUEBREI: {e}.[/color]"
     
     # Unknown command
-
-
-
-
-    t=get_txt()
-    if isinstance(t, str) and t.strip():
-        t=f"\n[color=#FF6B6B]{t.strip()}[/color]"
-    else:
-        t=""
-    default_response = f"\n[color=#A0A0A0]Esse não é o x3tbot. Digite[/color] [b][color=#4ECDC4]!help[/color][/b] [color=#A0A0A0]para ver os comandos disponíveis[/color] {t}"
-    
-    return str(default_response)
+    return unknown_command_response()